@@ -0,0 +1,214 @@
+"""
+Author: Joel Yuhas
+Date: October 17th, 2026
+
+Batch version of the rise and fall transactions, for running the algorithm over a whole array of recorded prices at
+once with numpy instead of one update at a time.
+
+Going through StockBaseClass.update_stock_values and rise_and_fall_transactions one price at a time, with all money in
+the stock or all money in cash, the algorithm is a trailing stop:
+- Holding the stock since price b, new_high is the running max of the prices since b. Sell at the first later price
+  that is below new_high by more than loss_threshold percent of new_high
+- In cash since selling at price s, new_low is the running min of the prices since s. Buy at the first later price
+  that is above new_low by more than gain_threshold percent of new_low
+- The first price is the initial buy, the same as program_04 buying at start up
+
+Each stretch between two fills is found with a running max/min (np.maximum/minimum.accumulate) and the first price that
+passes the threshold. The comparisons are done with the same float operations as the transactions, so the fills, and
+the money and quantity after each fill, match the one at a time path exactly.
+
+"""
+import numpy as np
+
+# The starting amount in dollars, same as program_04
+STARTING_AMOUNT_DOLLARS = 10000
+
+# Number of prices searched at a time for the next fill. Fills are usually close together, so searching the whole rest
+# of the array for each one would mostly be wasted work. The window doubles every time a fill isn't found in it.
+SEARCH_WINDOW_SIZE = 1024
+
+BUY = 1
+SELL = -1
+
+
+class BacktestResult:
+    """
+    Results of one backtest run.
+
+        self.fill_indexes   : (np.ndarray)  Index into the prices of each fill
+        self.fill_sides     : (np.ndarray)  BUY (1) or SELL (-1) for each fill
+        self.fill_prices    : (np.ndarray)  The price of each fill
+        self.equity         : (np.ndarray)  The account value at every price
+        self.starting_value : (float)       The money the account started with
+
+    A run over no prices has no fills and no account values, and keeps the starting value.
+
+    """
+    def __init__(self, fill_indexes: np.ndarray, fill_sides: np.ndarray, fill_prices: np.ndarray, equity: np.ndarray,
+                 starting_value: float):
+        self.fill_indexes = fill_indexes
+        self.fill_sides = fill_sides
+        self.fill_prices = fill_prices
+        self.equity = equity
+        self.starting_value = starting_value
+
+    def get_final_value(self) -> float:
+        """
+        Get the account value at the end of the run.
+
+        :return: (float): The account value at the last price, the starting value if there were no prices
+
+        """
+        if len(self.equity) == 0:
+            return float(self.starting_value)
+        return float(self.equity[-1])
+
+    def get_total_return(self) -> float:
+        """
+        Get the return of the run in percent.
+
+        :return: (float): Percent return from the starting value to the final account value
+
+        """
+        return (self.get_final_value() / self.starting_value - 1) * 100
+
+    def get_max_drawdown(self) -> float:
+        """
+        Get the largest drop of the account value from a previous peak, in percent.
+
+        :return: (float): The max drawdown in percent, 0 if the account value never dropped
+
+        """
+        if len(self.equity) == 0:
+            return 0.0
+        peaks = np.maximum.accumulate(self.equity)
+        return float(np.max((peaks - self.equity) / peaks)) * 100
+
+    def get_stats(self) -> dict:
+        """
+        Get the summary stats of the run.
+
+        :return: (dict): The final value, total return, max drawdown, and number of buys and sells
+
+        """
+        return {
+            'final_value': self.get_final_value(),
+            'total_return': self.get_total_return(),
+            'max_drawdown': self.get_max_drawdown(),
+            'buy_count': int(np.count_nonzero(self.fill_sides == BUY)),
+            'sell_count': int(np.count_nonzero(self.fill_sides == SELL)),
+        }
+
+
+def find_next_sell(prices: np.ndarray, buy_index: int, loss_threshold: float) -> int:
+    """
+    Find the next sell after buying, the same as sell_if_fall with new_high tracking the peak since the buy.
+
+    :param prices: (np.ndarray): The prices being ran against
+    :param buy_index: (int): Index of the buy
+    :param loss_threshold: (float): The percent threshold for when to sell the stock
+    :return: (int): Index of the sell, -1 if the stock is never sold
+
+    """
+    window_size = SEARCH_WINDOW_SIZE
+    peak = prices[buy_index]
+    start_index = buy_index + 1
+    while start_index < len(prices):
+        window = prices[start_index:start_index + window_size]
+        new_high = np.maximum.accumulate(np.concatenate(([peak], window)))[1:]
+        sells = (window < new_high) & ((new_high - window) > new_high * (loss_threshold / 100))
+        if sells.any():
+            return start_index + int(np.argmax(sells))
+
+        peak = new_high[-1]
+        start_index += len(window)
+        window_size *= 2
+
+    return -1
+
+
+def find_next_buy(prices: np.ndarray, sell_index: int, gain_threshold: float) -> int:
+    """
+    Find the next buy after selling, the same as buy_if_rise with new_low tracking the valley since the sell.
+
+    :param prices: (np.ndarray): The prices being ran against
+    :param sell_index: (int): Index of the sell
+    :param gain_threshold: (float): The percent threshold for when to buy the stock
+    :return: (int): Index of the buy, -1 if the stock is never bought back
+
+    """
+    window_size = SEARCH_WINDOW_SIZE
+    valley = prices[sell_index]
+    start_index = sell_index + 1
+    while start_index < len(prices):
+        window = prices[start_index:start_index + window_size]
+        new_low = np.minimum.accumulate(np.concatenate(([valley], window)))[1:]
+        buys = (window > new_low) & ((window - new_low) > new_low * (gain_threshold / 100))
+        if buys.any():
+            return start_index + int(np.argmax(buys))
+
+        valley = new_low[-1]
+        start_index += len(window)
+        window_size *= 2
+
+    return -1
+
+
+def run_backtest(prices: np.ndarray, loss_threshold: float, gain_threshold: float,
+                 starting_amount: float = STARTING_AMOUNT_DOLLARS) -> BacktestResult:
+    """
+    Run the rise and fall algorithm over the prices, starting with all the money bought into the stock at the first
+    price.
+
+    :param prices: (np.ndarray): The prices to run against, oldest first
+    :param loss_threshold: (float): The percent threshold for when to sell the stock
+    :param gain_threshold: (float): The percent threshold for when to buy the stock
+    :param starting_amount: (float): The money the account starts with
+    :return: (BacktestResult): The fills, account value at every price, and starting value. Empty if there are no
+                               prices
+
+    """
+    prices = np.asarray(prices, dtype=np.float64)
+    if len(prices) == 0:
+        return BacktestResult(fill_indexes=np.array([], dtype=np.int64),
+                              fill_sides=np.array([], dtype=np.int8),
+                              fill_prices=np.array([], dtype=np.float64),
+                              equity=np.array([], dtype=np.float64),
+                              starting_value=starting_amount)
+
+    fill_indexes = [0]
+    fill_sides = [BUY]
+    fill_prices = [float(prices[0])]
+    # Same operations as the transactions: all money into the stock on a buy, all stock into money on a sell
+    quantities = [0.0 + (starting_amount / float(prices[0]))]
+    moneys = [0.0]
+
+    while True:
+        if fill_sides[-1] == BUY:
+            next_index = find_next_sell(prices, fill_indexes[-1], loss_threshold)
+        else:
+            next_index = find_next_buy(prices, fill_indexes[-1], gain_threshold)
+        if next_index < 0:
+            break
+
+        price = float(prices[next_index])
+        fill_indexes.append(next_index)
+        fill_prices.append(price)
+        if fill_sides[-1] == BUY:
+            fill_sides.append(SELL)
+            moneys.append(moneys[-1] + (quantities[-1] * price))
+            quantities.append(0.0)
+        else:
+            fill_sides.append(BUY)
+            quantities.append(quantities[-1] + (moneys[-1] / price))
+            moneys.append(0.0)
+
+    # Every price after a fill, up to the next fill, has the quantity and money left by that fill
+    segment_lengths = np.diff(np.append(fill_indexes, len(prices)))
+    equity = np.repeat(moneys, segment_lengths) + (np.repeat(quantities, segment_lengths) * prices)
+
+    return BacktestResult(fill_indexes=np.array(fill_indexes, dtype=np.int64),
+                          fill_sides=np.array(fill_sides, dtype=np.int8),
+                          fill_prices=np.array(fill_prices, dtype=np.float64),
+                          equity=equity,
+                          starting_value=starting_amount)
@@ -10,7 +10,8 @@ the highs and lows of one specific stock and sell/buy at specific times.
 from libraries import AccountLibrary, StockFactory
 
 
-def buy_if_rise(account: AccountLibrary, stock: StockFactory, rise_percent_threshold: int, last_low_valley: float):
+def buy_if_rise(account: AccountLibrary, stock: StockFactory, rise_percent_threshold: int, last_low_valley: float,
+                save: bool = True) -> bool:
     """
     Method to buy the specified stock if it rises past a certain threshold from last_low_valley stock value.
 
@@ -18,6 +19,8 @@ def buy_if_rise(account: AccountLibrary, stock: StockFactory, rise_percent_thres
     :param stock: (StockFactory): The stock that is being traded
     :param rise_percent_threshold: (int): The percent threshold for when to buy the stock
     :param last_low_valley: (float): The last reported stock low price
+    :param save: (bool): Save the account after buying, False if the caller saves its accounts together
+    :return: (bool): True if the stock was bought
 
     """
     # Check if need to buy by checking accounts cash. If 0 then no need to buy, skip
@@ -33,11 +36,15 @@ def buy_if_rise(account: AccountLibrary, stock: StockFactory, rise_percent_thres
             if diff > buy_threshold:
                 print('\033[95m' + "BUYING")
                 account.buy(ticker=stock.name, dollar_amount=account.money)
-                account.write_account_to_file()
+                if save:
+                    account.write_account_to_file()
                 account.print_account()
+                return True
+    return False
 
 
-def sell_if_fall(account: AccountLibrary, stock: StockFactory, loss_percent_threshold: int, last_high_peak: float):
+def sell_if_fall(account: AccountLibrary, stock: StockFactory, loss_percent_threshold: int, last_high_peak: float,
+                 save: bool = True) -> bool:
     """
     Method to sell the specified stock if it falls past a certain threshold from last_high_peak stock value.
 
@@ -45,6 +52,8 @@ def sell_if_fall(account: AccountLibrary, stock: StockFactory, loss_percent_thre
     :param stock: (StockFactory): The stock that's being traded
     :param loss_percent_threshold: (int): The percent threshold for when to sell the stock
     :param last_high_peak: (float):
+    :param save: (bool): Save the account after selling, False if the caller saves its accounts together
+    :return: (bool): True if the stock was sold
 
     """
     # If no money in account, all of it should have been bought into stocks NOTE: UPDATE TO STOCKS INSTEAD
@@ -59,5 +68,28 @@ def sell_if_fall(account: AccountLibrary, stock: StockFactory, loss_percent_thre
             if diff > sell_threshold_amount:
                 print('\033[95m' + "SELLING")
                 account.sell(ticker=stock.name, stock_amount=stock.quantity)
-                account.write_account_to_file()
+                if save:
+                    account.write_account_to_file()
                 account.print_account()
+                return True
+    return False
+
+
+def rise_and_fall_strategy(loss_percent_threshold: float, gain_percent_threshold: float):
+    """
+    Make the rise and fall strategy of program_04 for one account, to run in the trading engine. Sells the stock if it
+    falls past the loss threshold while it is held, buys it if it rises past the gain threshold while it isn't.
+
+    The account isn't saved after a trade, the engine saves the accounts that traded together at the end of its cycle.
+
+    :param loss_percent_threshold: (float): The percent threshold for when to sell the stock
+    :param gain_percent_threshold: (float): The percent threshold for when to buy the stock
+    :return: (Callable): The strategy, called with the account and its updated stock, returns True if it traded
+
+    """
+    def strategy(account: AccountLibrary, stock: StockFactory) -> bool:
+        if stock.quantity > 0:
+            return sell_if_fall(account, stock, loss_percent_threshold, stock.new_high, save=False)
+        return buy_if_rise(account, stock, gain_percent_threshold, stock.new_low, save=False)
+
+    return strategy
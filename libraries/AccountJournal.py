@@ -0,0 +1,251 @@
+"""
+Author: Joel Yuhas
+Date: October 17th, 2026
+
+AccountJournal
+
+Saves an account as an append-only journal of what changed since the last save, account_{N}.journal, plus a snapshot
+of the whole account, account_{N}.snapshot, that the journal is folded into every so often. A save only appends the
+money and stock values that changed, usually a few dozen bytes, instead of the whole account dictionary.
+
+Each journal record is the length and crc32 of the record followed by the pickled changes. A record that was only
+partly written, from a crash in the middle of a save, fails its length or crc check and is dropped along with anything
+after it, so a crash loses at most the save it happened in.
+
+Every record sets values instead of adding to them, so replaying a record more than once gives the same account. This
+is what makes the checkpoint safe: the snapshot is written to a temp file and renamed over the old one, and only then
+is the journal cleared. A crash between the two replays the old journal over the new snapshot, which ends on the same
+values.
+
+Recovery loads the snapshot and replays the journal records after it. It only reads the files, so an account can be
+loaded by another process, like the email report, while the trading process is writing to it. A partly written record
+is skipped in memory, and only cut off the journal by the first save that appends after it.
+
+"""
+import os
+import pickle
+import struct
+import zlib
+from pathlib import Path
+from typing import Optional
+
+# Length and crc32 of the pickled record that follows
+JOURNAL_RECORD_HEADER = struct.Struct("<II")
+
+# Number of journal records after which the journal is folded into a new snapshot
+SNAPSHOT_RECORD_INTERVAL = 500
+
+# Record key for a record with the whole account, written when there is nothing in the journal to build on
+FULL_RECORD_KEY = 'full'
+
+
+class AccountJournal:
+    def __init__(self, account_path: Path, account_number: int):
+        self.journal_file = account_path / f"account_{account_number}.journal"
+        self.snapshot_file = account_path / f"account_{account_number}.snapshot"
+        # The account as the journal and snapshot have it, with the stocks by name. None until the first save or load
+        self.journaled_state: Optional[dict] = None
+        self.journal_handle = None
+        self.record_count = 0
+
+    @staticmethod
+    def account_dict_to_state(account_dict: dict) -> dict:
+        """
+        Turn an account dictionary into the journal state, the same with the stocks by name instead of a list.
+
+        :param account_dict: (dict): The account dictionary from AccountLibrary.account_to_dict
+        :return: (dict): The journal state
+
+        """
+        state = dict(account_dict)
+        state['stocks'] = {stock_dict['name']: dict(stock_dict) for stock_dict in account_dict['stocks']}
+        return state
+
+    @staticmethod
+    def state_to_account_dict(state: dict) -> dict:
+        """
+        Turn the journal state back into an account dictionary that AccountLibrary.account_from_dict can load.
+
+        :param state: (dict): The journal state
+        :return: (dict): The account dictionary
+
+        """
+        account_dict = dict(state)
+        account_dict['stocks'] = [dict(stock_dict) for stock_dict in state['stocks'].values()]
+        return account_dict
+
+    @staticmethod
+    def apply_record(state: Optional[dict], record: dict) -> dict:
+        """
+        Apply a journal record to the journal state.
+
+        :param state: (dict): The journal state before the record, None if there is none yet
+        :param record: (dict): The journal record
+        :return: (dict): The journal state after the record
+
+        """
+        if FULL_RECORD_KEY in record:
+            return AccountJournal.account_dict_to_state(record[FULL_RECORD_KEY])
+        if state is None:
+            print("Journal record of changes with no account to apply them to")
+            raise AssertionError
+
+        if 'money' in record:
+            state['money'] = record['money']
+        for name, stock_changes in record.get('stocks', {}).items():
+            state['stocks'].setdefault(name, {}).update(stock_changes)
+        return state
+
+    @staticmethod
+    def get_changes(old_state: dict, new_state: dict) -> dict:
+        """
+        Get the journal record of the changes from one journal state to the next.
+
+        :param old_state: (dict): The journal state that was last saved
+        :param new_state: (dict): The journal state to save
+        :return: (dict): The record of the changes, empty if nothing changed
+
+        """
+        record = {}
+        if new_state['money'] != old_state['money']:
+            record['money'] = new_state['money']
+
+        stock_changes = {}
+        for name, stock_dict in new_state['stocks'].items():
+            old_stock_dict = old_state['stocks'].get(name, {})
+            changes = {field: value for field, value in stock_dict.items()
+                       if field not in old_stock_dict or old_stock_dict[field] != value}
+            if changes:
+                stock_changes[name] = changes
+        if stock_changes:
+            record['stocks'] = stock_changes
+
+        # Anything else that changed, like a removed stock or a new path, is saved as the whole account
+        other_fields = set(new_state) | set(old_state)
+        other_fields.difference_update(('money', 'stocks'))
+        if any(new_state.get(field) != old_state.get(field) for field in other_fields) or \
+                not set(old_state['stocks']).issubset(new_state['stocks']):
+            record = {FULL_RECORD_KEY: AccountJournal.state_to_account_dict(new_state)}
+        return record
+
+    def read_records(self) -> tuple[list[dict], int]:
+        """
+        Read the complete records of the journal, stopping at the first one that was only partly written.
+
+        :return: (tuple[list[dict], int]): The records and the byte offset in the journal where they end
+
+        """
+        if not self.journal_file.is_file():
+            return [], 0
+
+        with open(self.journal_file, "rb") as file:
+            data = file.read()
+        records = []
+        offset = 0
+        while offset + JOURNAL_RECORD_HEADER.size <= len(data):
+            length, checksum = JOURNAL_RECORD_HEADER.unpack_from(data, offset)
+            start = offset + JOURNAL_RECORD_HEADER.size
+            payload = data[start:start + length]
+            if len(payload) != length or zlib.crc32(payload) != checksum:
+                break
+            records.append(pickle.loads(payload))
+            offset = start + length
+        return records, offset
+
+    def open_journal(self) -> list[dict]:
+        """
+        Open the journal for appending, first cutting off any partly written record at the end so new records aren't
+        written after it. Only done by the first save, loading the account never changes the journal.
+
+        :return: (list[dict]): The complete records already in the journal
+
+        """
+        records, valid_end = self.read_records()
+        if self.journal_file.is_file() and self.journal_file.stat().st_size > valid_end:
+            print(f"Dropping partly written record at the end of {self.journal_file}")
+            with open(self.journal_file, "r+b") as file:
+                file.truncate(valid_end)
+
+        if self.journal_handle is None:
+            self.journal_handle = open(self.journal_file, "ab")
+        self.record_count = len(records)
+        return records
+
+    def close(self):
+        """
+        Close the journal, if it was opened.
+
+        """
+        if self.journal_handle is not None:
+            self.journal_handle.close()
+            self.journal_handle = None
+
+    def recover(self) -> Optional[dict]:
+        """
+        Load the account from the snapshot and the journal records after it.
+
+        :return: (dict): The account dictionary, None if the account has no snapshot or journal
+
+        """
+        state = None
+        if self.snapshot_file.is_file():
+            with open(self.snapshot_file, "rb") as file:
+                state = self.account_dict_to_state(pickle.load(file))
+
+        records, _ = self.read_records()
+        for record in records:
+            state = self.apply_record(state, record)
+
+        self.journaled_state = state
+        self.record_count = len(records)
+        return None if state is None else self.state_to_account_dict(state)
+
+    def append(self, account_dict: dict):
+        """
+        Save the account by appending the changes since the last save to the journal. The journal is folded into a new
+        snapshot once it has SNAPSHOT_RECORD_INTERVAL records.
+
+        :param account_dict: (dict): The account dictionary from AccountLibrary.account_to_dict
+
+        """
+        if self.journal_handle is None:
+            self.open_journal()
+
+        new_state = self.account_dict_to_state(account_dict)
+        if self.journaled_state is None:
+            record = {FULL_RECORD_KEY: account_dict}
+        else:
+            record = self.get_changes(self.journaled_state, new_state)
+        self.journaled_state = new_state
+        if not record:
+            return
+
+        payload = pickle.dumps(record, protocol=pickle.HIGHEST_PROTOCOL)
+        # One write, so a crash leaves at most one partly written record at the end
+        self.journal_handle.write(JOURNAL_RECORD_HEADER.pack(len(payload), zlib.crc32(payload)) + payload)
+        self.journal_handle.flush()
+        self.record_count = self.record_count + 1
+
+        if self.record_count >= SNAPSHOT_RECORD_INTERVAL:
+            self.checkpoint()
+
+    def checkpoint(self):
+        """
+        Fold the journal into a new snapshot. The snapshot is written to a temp file and renamed over the old one, then
+        the journal is cleared.
+
+        """
+        if self.journaled_state is None:
+            return
+
+        temp_file = self.snapshot_file.with_name(self.snapshot_file.name + ".tmp")
+        with open(temp_file, "wb") as file:
+            pickle.dump(self.state_to_account_dict(self.journaled_state), file, protocol=pickle.HIGHEST_PROTOCOL)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp_file, self.snapshot_file)
+
+        if self.journal_handle is None:
+            self.journal_handle = open(self.journal_file, "ab")
+        self.journal_handle.truncate(0)
+        self.record_count = 0
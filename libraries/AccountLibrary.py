@@ -15,19 +15,27 @@ NOTE: Transaction and account file are used to save transaction and account data
 import os.path
 import json
 import csv
+import io
 import time
 import pandas as pd
 
 from datetime import datetime
-from typing import Optional, Dict
+from typing import Optional, Dict, Union
 from pathlib import Path
+from libraries.AccountJournal import AccountJournal
+from libraries.EndOfDayIndex import EndOfDayIndex
+from libraries.Quote import Quote, DEFAULT_MAX_QUOTE_AGE_SECONDS
 from libraries.StockBaseClass import StockBaseClass
 from libraries.StockFactory import StockFactory
 from libraries.Transaction import Transaction
+from libraries.TransactionHistory import TransactionHistory
 
 # Constant to show account fields and their names
 ACCOUNT_FIELDNAMES = ["date", "account_dict", "total_value", "end_of_day_save"]
 
+# Bytes read at a time from the end of the account file when looking for the last save, doubled until a save fits
+TAIL_READ_BLOCK_SIZE = 64 * 1024
+
 
 class AccountLibrary:
     def __init__(self, account_number: int, stock_factory: StockFactory, account_path: Path, money: float = None,
@@ -35,18 +43,27 @@ class AccountLibrary:
         self.account_number = account_number
         self.money = money if money is not None else 0.0
         self.stocks = stocks if stocks is not None else {}
-        self.transactions = transactions if transactions is not None else []
         self.account_parent_path = account_path
         self.stock_factory = stock_factory
-        self.transaction_file = self.account_parent_path / f"transaction_{account_number}.txt"
+        self.transaction_file = self.account_parent_path / f"transaction_{account_number}.ledger"
         self.account_file = self.account_parent_path / f"account_{account_number}.csv"
+        # Oldest a stock's last quote can be for orders to fill at it instead of getting the price again
+        self.max_quote_age = DEFAULT_MAX_QUOTE_AGE_SECONDS
+        # Recent transactions are kept in memory, older ones are read back from the transaction ledger when needed
+        self.transactions = TransactionHistory(self.transaction_file, self.account_file)
+        for transaction in transactions if transactions is not None else []:
+            self.transactions.append(transaction)
+        # Index of the end of day values in the account file, so they can be looked up without reading the whole file
+        self.end_of_day_index = EndOfDayIndex(self.account_file)
+        # Journal of the account changes between end of day saves, with a snapshot of the account it is folded into
+        self.account_journal = AccountJournal(self.account_parent_path, account_number)
 
         # Generate the account on instantiation of the class
         self.create_new_account()
 
     def create_new_account(self) -> bool:
         """
-        Create a new account with new directory, account file, and transaction file
+        Create a new account with new directory and account file. The transaction file is made by its first transaction
 
         :return: (bool): Return True if new account was created, false if it already existed.
 
@@ -58,10 +75,7 @@ class AccountLibrary:
         else:
             print("Provided with already existing account path")
 
-        # if the files do not exist, in the directory, or on their own then create them
-        if not self.transaction_file.is_file():
-            print("Creating transaction file")
-            self.transaction_file.touch()
+        # if the account file does not exist, create it. The ledger makes its file on the first transaction
         if not self.account_file.is_file():
             print("Writing new account data")
             self.write_account_to_file()
@@ -88,23 +102,14 @@ class AccountLibrary:
             total_value += float(stock.total_value())
         return total_value
 
-    def get_account_file_info(self) -> list:
-        """
-        Return the account_file information in full.
-
-        :return: (list): List of DictReader of the account file info
-        """
-        with open(self.account_file, 'r') as file:
-            reader = csv.DictReader(file)
-            data = list(reader)
-        return data
-
     def get_previous_end_of_day_total_value(self, days_back: int = 1, try_multiple_attempts: bool = False) -> (
             tuple)[float, datetime]:
         """
-        Get the previous account total value from however many days back from before. Ensures it is actually grabbing
-        previouse day values as well, as there can be multiple csv rows per day. Added in logic to ensure it will
-        gather latest info from a previous day and not just the last save
+        Get the previous account total value from however many trading days back from before. Ensures it is actually
+        grabbing previouse day values as well, as there can be multiple csv rows per day. Added in logic to ensure it
+        will gather latest info from a previous day and not just the last save
+
+        Trading days are the days the account has an end of day save, so weekends and holidays are skipped over.
 
         NOTE: currently working in progress on this, debate between if we want it to always get the last value in the
         account csv as the "current value" or if the time this is being ran really is the total value.
@@ -112,41 +117,27 @@ class AccountLibrary:
         Been having issues with going off of the last save since sometimes a save hasn't been done yet, so it reports
         yesterday's values.
 
-        :param days_back: (int): How many days back should the last end of day value be gathered
+        :param days_back: (int): How many trading days back should the last end of day value be gathered, 0 for the
+                                 latest end of day save
         :param try_multiple_attempts: (bool): If the method runs into an error trying to get last value, skip that value
                                                 and try again
         :return: tuple(float,datetime) The float of the total value from the day before as well as the datetime from
                                         where it got it
 
         """
-        # Read the CVS file with account info
-        data = self.get_account_file_info()
-
-        # Attempt to get the previous days back values.
+        # Attempt to get the previous days back values from the end of day index, which catches up with any new saves
+        # in the account file first
         try:
-            # Get the current datetime
-            current_datetime = datetime.now()
-            current_date = current_datetime.strftime("%Y-%m-%d %H:%M:%S.%f")
-            parsed_datetime = datetime.strptime(current_date, "%Y-%m-%d %H:%M:%S.%f")
+            # Ensure days back is satisfied and it is an end of day save
+            if days_back <= 0:
+                end_of_day_value = self.end_of_day_index.get_value_before(datetime.now())
+            else:
+                end_of_day_value = self.end_of_day_index.get_value_trading_days_back(days_back)
+            if end_of_day_value is None:
+                print("No end of day save far enough back")
+                raise AssertionError
 
-            # Loop through entries until one is found that has a time difference greater than specified amount
-            row_delta = 1
-            while True:
-                potential_date = datetime.strptime(data[-(days_back + row_delta)][ACCOUNT_FIELDNAMES[0]],
-                                                   "%Y-%m-%d %H:%M:%S.%f")
-                days_difference = abs(parsed_datetime - potential_date).total_seconds() / (24 * 3600)
-
-                # Ensure days back is satisfied and it is an end of day save
-                # Subtract just a bit since it might not be exactly 24 horus since the last save at 4pm
-                if days_difference > (days_back - 0.1) and potential_date.hour == 16:
-                    return round(float(data[-(days_back + row_delta)][ACCOUNT_FIELDNAMES[2]]), 2), potential_date
-                else:
-                    row_delta = row_delta + 1
-
-                # Safety break check to exit loop if needed
-                if row_delta > 1000:
-                    print("Looping way too long")
-                    raise AssertionError
+            return round(float(end_of_day_value[0]), 2), end_of_day_value[1]
 
         except KeyError:
             print("Total Value most likely not in this account file, adding")
@@ -154,7 +145,7 @@ class AccountLibrary:
             # Sleep 1 seconds for the file to update and then run again
             time.sleep(1)
             if not try_multiple_attempts:
-                self.get_previous_end_of_day_total_value(days_back=days_back, try_multiple_attempts=True)
+                return self.get_previous_end_of_day_total_value(days_back=days_back, try_multiple_attempts=True)
             else:
                 raise KeyError
 
@@ -213,7 +204,8 @@ class AccountLibrary:
         for stock in self.stocks.values():
             stock.print_stock()
 
-        for transaction in self.transactions:
+        # Only the recent transactions, the full history can be gone through a page at a time from the ledger
+        for transaction in self.transactions.recent:
             transaction.print_transaction()
 
         print("\n")
@@ -249,8 +241,14 @@ class AccountLibrary:
         print("LOADING FROM THE FILES!!")
         self.account_number = account_dict['account_number']
         self.money = account_dict['money']
-        self.transaction_file = Path(account_dict['transaction_file'])
+        # Accounts from before the transaction ledger have their text transaction file saved, use its ledger instead
+        self.transaction_file = Path(account_dict['transaction_file']).with_suffix(".ledger")
+        self.transactions.set_ledger_file(self.transaction_file, self.account_parent_path /
+                                          f"account_{self.account_number}.csv")
         self.account_file = self.account_parent_path / f"account_{self.account_number}.csv"
+        if self.end_of_day_index.account_file != self.account_file:
+            self.end_of_day_index.close()
+            self.end_of_day_index = EndOfDayIndex(self.account_file)
         self.account_parent_path = self.account_parent_path
         for stock_dict in account_dict['stocks']:
             stock_to_add = self.stock_factory.dict_to_stock(stock_dict)
@@ -294,6 +292,7 @@ class AccountLibrary:
 
                 # Save the entire DataFrame with correct columns, back to the CSV file
                 df.to_csv(self.account_file, index=False)
+                self.end_of_day_index.rebuild()
 
         # If the file doesn't exist, write the header
         else:
@@ -305,14 +304,21 @@ class AccountLibrary:
         """
         Write the desired Account to the given account file (different file for every account).
 
-        Specifically, save into a csv file, first column being the date, second column being the "account_dict" which
-        has all the pertinent account information.
+        Every save appends the changes since the last save to the account journal. End of day saves, and the first save
+        of a new account, are also saved into a csv file, first column being the date, second column being the
+        "account_dict" which has all the pertinent account information, and fold the journal into a new snapshot.
 
         :end_of_day_save: (bool): If this save is the final save of the day. Useful for retrieving retroactive data
 
         """
+        account_dict = self.account_to_dict()
+        self.account_journal.append(account_dict)
+        if not end_of_day_save and self.account_file.is_file():
+            return
+
         # Check the formatting of the account file is correct
         self.check_and_fix_account_file_formatting()
+        self.remove_partial_last_row()
 
         # Create data variable in correct format to save for later
         #   0 is date
@@ -320,29 +326,97 @@ class AccountLibrary:
         #   2 is total value
         data = {
             ACCOUNT_FIELDNAMES[0]: str(datetime.today()),
-            ACCOUNT_FIELDNAMES[1]: json.dumps(self.account_to_dict()),
+            ACCOUNT_FIELDNAMES[1]: json.dumps(account_dict),
             ACCOUNT_FIELDNAMES[2]: str(self.get_account_value()),
             ACCOUNT_FIELDNAMES[3]: str(end_of_day_save)
         }
 
-        # Open account and write to it
-        with open(self.account_file, "a", newline="") as csvfile:
-            writer = csv.DictWriter(csvfile, fieldnames=ACCOUNT_FIELDNAMES)
-            writer.writerow(data)
+        # Write the row in one write so a crash can't leave it half written in the middle of the file
+        row = io.StringIO()
+        csv.DictWriter(row, fieldnames=ACCOUNT_FIELDNAMES).writerow(data)
+        with open(self.account_file, "ab") as csvfile:
+            csvfile.write(row.getvalue().encode())
+
+        # Keep the end of day index up to date as the end of day saves are made
+        if end_of_day_save:
+            self.account_journal.checkpoint()
+            self.end_of_day_index.sync()
+
+    def remove_partial_last_row(self):
+        """
+        Remove the end of a save that was only partly written to the account file, like from a crash in the middle of a
+        save, so the next save starts on its own row.
 
-    def load_from_file(self):
         """
-        Reads from the specified account file and populates all required fields. Gets the account file by searching for
-        the account file name using the account number.
+        with open(self.account_file, "r+b") as file:
+            end = file.seek(0, os.SEEK_END)
+            if end == 0:
+                return
+            file.seek(end - 1)
+            if file.read(1) == b"\n":
+                return
+
+            # Look back for the end of the last complete row
+            start = end
+            while start > 0:
+                start = max(0, start - TAIL_READ_BLOCK_SIZE)
+                file.seek(start)
+                last_newline = file.read(end - start).rfind(b"\n")
+                if last_newline != -1:
+                    print(f"Removing partly written save from the end of {self.account_file}")
+                    file.truncate(start + last_newline + 1)
+                    return
+            print(f"No complete row in {self.account_file}")
+            raise AssertionError
 
+    def get_last_account_row(self) -> dict:
         """
-        with open(self.account_file, "r") as csvfile:
-            reader = csv.DictReader(csvfile)
+        Get the last complete save in the account file. Reads backwards from the end of the file instead of reading
+        every save, so it takes the same time however long the account history is. A last save that was only partly
+        written, like from a crash in the middle of a save, is skipped and the save before it is used.
 
-            # Convert the rows into a list and extract the last row
-            rows = list(reader)
-            last_row = rows[-1]
-            self.account_from_dict(json.loads(last_row["account_dict"]))
+        :return: (dict): The last complete row of the account file, by field name
+
+        """
+        with open(self.account_file, "rb") as file:
+            header = next(csv.reader([file.readline().decode()]), [])
+            header_end = file.tell()
+            end = file.seek(0, os.SEEK_END)
+
+            block_size = TAIL_READ_BLOCK_SIZE
+            while True:
+                start = max(header_end, end - block_size)
+                file.seek(start)
+                lines = file.read(end - start).split(b"\n")
+                # The part after the last newline is a save that was not finished, and unless the block starts right
+                # after the header, the first part is the end of a save that started before the block
+                lines = lines[:-1] if start == header_end else lines[1:-1]
+
+                for line in reversed(lines):
+                    row = dict(zip(header, next(csv.reader([line.decode(errors="replace")]), [])))
+                    try:
+                        json.loads(row["account_dict"])
+                    except (KeyError, ValueError):
+                        continue
+                    return row
+
+                if start == header_end:
+                    print(f"No complete account save in {self.account_file}")
+                    raise AssertionError
+                block_size = block_size * 2
+
+    def load_from_file(self):
+        """
+        Reads from the specified account journal and populates all required fields. Gets the account journal by
+        searching for the account file name using the account number. Accounts without a journal are read from the last
+        save of the account file.
+
+        """
+        # Recover from the account journal, account files from before the journal are loaded from their last save
+        account_dict = self.account_journal.recover()
+        if account_dict is None:
+            account_dict = json.loads(self.get_last_account_row()["account_dict"])
+        self.account_from_dict(account_dict)
 
     def deposit_money(self, deposit_amount: float):
         """
@@ -351,12 +425,12 @@ class AccountLibrary:
         :param deposit_amount: (float): The desired amount of money to be deposited
 
         """
-        desired_transaction = Transaction(account=self,
+        desired_transaction = Transaction(account_number=self.account_number,
                                           dollar_amount=deposit_amount,
                                           transaction_file=self.transaction_file,
                                           account_file=self.account_file)
         # Perform the deposit
-        desired_transaction.deposit()
+        desired_transaction.deposit(self)
 
     def withdraw_money(self, withdrawal_amount: float):
         """
@@ -365,14 +439,14 @@ class AccountLibrary:
         :param withdrawal_amount: (float): the amount to be withdrawn
 
         """
-        desired_transaction = Transaction(account=self,
+        desired_transaction = Transaction(account_number=self.account_number,
                                           dollar_amount=withdrawal_amount,
                                           transaction_file=self.transaction_file,
                                           account_file=self.account_file)
         # Perform the deposit
-        desired_transaction.withdraw()
+        desired_transaction.withdraw(self)
 
-    def buy(self, ticker: str, dollar_amount: float = 0.0, stock_amount: float = 0.0):
+    def buy(self, ticker: str, dollar_amount: float = 0.0, stock_amount: float = 0.0, quote: Quote = None):
         """
         Buy the desired stock.
 
@@ -382,20 +456,24 @@ class AccountLibrary:
         :param ticker: (str): Ticker of the stock.
         :param dollar_amount: (float): The to purchase in dollars.
         :param stock_amount: (float): The amount to purchase in number of respective stocks.
+        :param quote: (Quote): The quote to buy at, if None the stock's last quote is used unless it is too old
 
         """
         # Create transaction data structure
-        desired_transaction = Transaction(account=self,
+        stock = self.get_stock(ticker)
+        desired_transaction = Transaction(account_number=self.account_number,
                                           ticker=ticker,
-                                          stock=self.get_stock(ticker),
+                                          stock=stock,
                                           stock_amount=stock_amount,
                                           dollar_amount=dollar_amount,
                                           transaction_file=self.transaction_file,
-                                          account_file=self.account_file)
+                                          account_file=self.account_file,
+                                          quote=quote,
+                                          max_quote_age=self.max_quote_age)
         # perform the transaction
-        desired_transaction.buy()
+        desired_transaction.buy(self, stock)
 
-    def sell(self, ticker: str, dollar_amount: float = 0.0, stock_amount: float = 0.0):
+    def sell(self, ticker: str, dollar_amount: float = 0.0, stock_amount: float = 0.0, quote: Quote = None):
         """
         Sell stocks
 
@@ -405,18 +483,21 @@ class AccountLibrary:
         :param ticker: (str): The ticker of the stock
         :param dollar_amount: (float): The to purchase in dollars.
         :param stock_amount: (float): The amount to purchase in number of respective stocks.
+        :param quote: (Quote): The quote to sell at, if None the stock's last quote is used unless it is too old
 
         """
         # Create transaction data structure
-        desired_transaction = Transaction(account=self,
+        desired_transaction = Transaction(account_number=self.account_number,
                                           ticker=ticker,
                                           stock=self.get_stock(ticker),
                                           stock_amount=stock_amount,
                                           dollar_amount=dollar_amount,
                                           transaction_file=self.transaction_file,
-                                          account_file=self.account_file)
+                                          account_file=self.account_file,
+                                          quote=quote,
+                                          max_quote_age=self.max_quote_age)
         # perform the transaction
-        desired_transaction.sell()
+        desired_transaction.sell(self)
 
     def get_buy_price(self, ticker: str) -> float:
         """
@@ -441,10 +522,19 @@ class AccountLibrary:
 
         return self.stocks[ticker]
 
-    def update_stock_values_all(self):
+    def update_stock_values_all(self, prices: dict[str, Union[Quote, float]] = None):
         """
         Update all peaks, trends, and prices, and values using the specified stock's methods.
 
+        The prices of every stock are gotten together first, in one provider call or query for stock types that support
+        it, then each stock is updated with its price. The quotes keep the timestamp and sequence number of their
+        source, so an order right after the update fills at them the same as after a stock's own update.
+
+        :param prices: (dict[str, Quote|float]): Quotes or prices already gotten by ticker, like the trading engine's
+                                                 quotes shared by every account. Gotten here if None
+
         """
-        for stock in self.stocks:
-            self.stocks[stock].update_stock_values()
+        if prices is None:
+            prices = self.stock_factory.get_current_prices(list(self.stocks))
+        for ticker, stock in self.stocks.items():
+            stock.update_stock_values(prices.get(ticker))
@@ -10,11 +10,10 @@ help generalize the database collection code and methods.
 
 
 """
-import yfinance as yf
-import time
 from datetime import datetime
 
 from libraries import helper_functions
+from libraries.MarketDataProvider import get_market_data_provider
 
 
 # The default update time interval in seconds
@@ -31,14 +30,13 @@ class DatabaseLibrary:
     @staticmethod
     def get_raw_value(ticker: str):
         """
-        Get the raw value of the specified ticker.
+        Get the raw value of the specified ticker from the market data provider, yfinance by default.
 
         :param ticker: (str): Ticker of desired stock.
         :return: returns all yahoo finance data history
 
         """
-        ticker = yf.Ticker(ticker)
-        return ticker.history(period='1d')
+        return get_market_data_provider().get_daily_history(ticker)
 
     def write_to_database_iterator(self, ticker: str):
         """
@@ -132,6 +130,7 @@ class DatabaseLibrary:
         """
         # Flag used to see if script is activated during trading
         trading_flag = False
+        scheduler = helper_functions.IntervalScheduler(WAIT_TIME_INTERVAL_SECONDS, "database execution")
 
         # Main loop!
         while True:
@@ -145,7 +144,7 @@ class DatabaseLibrary:
                     # pass in iterator file path and stock name
                     helper_functions.write_to_log(helper_functions.LOGBASE_PATH / ('execution_' + str(stock) + '_debug_log.txt'), "In trade hours, performing iterations", False)
                     self.write_to_database_iterator(stock)
-                time.sleep(WAIT_TIME_INTERVAL_SECONDS)
+                scheduler.wait()
 
             # Out of trade hours
             else:
@@ -165,6 +164,7 @@ class DatabaseLibrary:
 
                 # Regardless of trading, pause until start of trading hours
                 helper_functions.pause_until_trade_hours_start()
+                scheduler.reset()
 
     def manual_dailies(self):
         """
@@ -53,7 +53,7 @@ class EmailSenderLibrary:
             # The next sections scan the path for files named "account" and then will automatically get the account
             # number from the file so it can be loaded into the account Class and then printed
             for file in account_path.iterdir():
-                if file.is_file() and file.name.startswith('account'):
+                if file.is_file() and file.name.startswith('account') and file.suffix == '.csv':
                     filename = file.stem
                     number = filename.split('_')[1]
                     tmp_account = AccountLibrary(stock_factory=self.stock_factory,
@@ -155,19 +155,19 @@ class EmailSenderLibrary:
         # Get the current value
         today_value = float(input_account.get_account_value())
 
-        # Get the value from yesterday
+        # Get the value from the last trading day
 
-        yesterday_value = float(input_account.get_previous_end_of_day_total_value(1)[0])
+        yesterday_value, yesterday_saved_at = input_account.get_previous_end_of_day_total_value(1)
 
-        # Get the value from last week (5 days)
-        last_week_value = float(input_account.get_previous_end_of_day_total_value(5)[0])
+        # Get the value from last week (5 trading days)
+        last_week_value, last_week_saved_at = input_account.get_previous_end_of_day_total_value(5)
 
         # return string with account value differences
         list_string = f"Account {input_account.account_number}: ${round(today_value,2)} "
-        list_string = self.print_difference_helper(list_string, today_value, yesterday_value, )
-        list_string = list_string + str(input_account.get_previous_end_of_day_total_value(1)[1])
-        list_string = self.print_difference_helper(list_string, today_value, last_week_value, )
-        list_string = list_string + str(input_account.get_previous_end_of_day_total_value(5)[1])
+        list_string = self.print_difference_helper(list_string, today_value, float(yesterday_value), )
+        list_string = list_string + str(yesterday_saved_at)
+        list_string = self.print_difference_helper(list_string, today_value, float(last_week_value), )
+        list_string = list_string + str(last_week_saved_at)
         list_string = list_string + "\n"
 
         return list_string
@@ -183,7 +183,7 @@ class EmailSenderLibrary:
         :param window_size: (int): Size of the window for the plot
 
         """
-        # fetch all the correct values from the previous days and compile into list
+        # fetch all the correct values from the previous trading days and compile into list
         total_values = []
         for i in range(0, window_size):
             total_values.insert(0, account.get_previous_end_of_day_total_value(int(i))[0])
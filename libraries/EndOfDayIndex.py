@@ -0,0 +1,193 @@
+"""
+Author: Joel Yuhas
+Date: October 17th, 2026
+
+EndOfDayIndex
+
+Small sqlite sidecar next to an account file, account_{N}_end_of_day.db, that keeps one (date, saved_at, total_value)
+row per day the account had an end of day save. Looking up an end of day value is then an indexed seek instead of
+reading the whole account csv, with the full account dictionary of every save, and walking back through it.
+
+A save counts as the end of day save if it was saved with end_of_day_save, or if it was made in the 4pm hour, the same
+check the account file lookups have always used. If a day has more than one, the last one is kept.
+
+The index remembers how many bytes of the account file it has read. Syncing only reads the rows appended since then,
+and if the account file was rewritten or the index doesn't exist yet, the index is rebuilt from the whole file, so
+existing account files get their index the first time it is used.
+
+"""
+import csv
+import io
+import os
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+# Hour of the day the end of day saves are made in
+END_OF_DAY_HOUR = 16
+
+# Format saved_at is kept in, it sorts in time order as text
+SAVED_AT_FORMAT = "%Y-%m-%d %H:%M:%S.%f"
+
+END_OF_DAY_SCHEMA_STATEMENTS = (
+    '''CREATE TABLE IF NOT EXISTS end_of_day (date text PRIMARY KEY, saved_at text NOT NULL, total_value real)''',
+    '''CREATE INDEX IF NOT EXISTS idx_end_of_day_saved_at ON end_of_day (saved_at)''',
+    '''CREATE TABLE IF NOT EXISTS index_state (id integer PRIMARY KEY CHECK (id = 0), account_file_size integer)''',
+)
+
+
+class EndOfDayIndex:
+    def __init__(self, account_file: Path):
+        self.account_file = account_file
+        self.index_file = account_file.with_name(f"{account_file.stem}_end_of_day.db")
+        self.conn: Optional[sqlite3.Connection] = None
+
+    def get_connection(self) -> sqlite3.Connection:
+        """
+        Get the connection to the index, opening it and creating the tables if there is not one yet.
+
+        :return: (sqlite3.Connection): The open connection
+
+        """
+        if self.conn is None:
+            self.conn = sqlite3.connect(self.index_file)
+            with self.conn:
+                for statement in END_OF_DAY_SCHEMA_STATEMENTS:
+                    self.conn.execute(statement)
+        return self.conn
+
+    def close(self):
+        """
+        Close the connection to the index, if it was opened.
+
+        """
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
+    @staticmethod
+    def is_end_of_day_save(saved_at: datetime, end_of_day_save: str) -> bool:
+        """
+        Check if an account file row is an end of day save.
+
+        :param saved_at: (datetime): When the row was saved
+        :param end_of_day_save: (str): The end_of_day_save column of the row
+        :return: (bool): True if the row was saved as the end of day save or in the 4pm hour
+
+        """
+        return str(end_of_day_save) == "True" or saved_at.hour == END_OF_DAY_HOUR
+
+    def get_indexed_size(self) -> Optional[int]:
+        """
+        Get how many bytes of the account file have been read into the index.
+
+        :return: (int): The number of bytes, None if the index has never been built
+
+        """
+        row = self.get_connection().execute("SELECT account_file_size FROM index_state WHERE id = 0").fetchone()
+        return None if row is None else row[0]
+
+    def rebuild(self):
+        """
+        Rebuild the index from the whole account file.
+
+        """
+        conn = self.get_connection()
+        with conn:
+            conn.execute("DELETE FROM end_of_day")
+            conn.execute("DELETE FROM index_state")
+        self.sync()
+
+    def sync(self):
+        """
+        Bring the index up to date with the account file, reading only the rows appended since the last sync. The index
+        is rebuilt if the account file was rewritten since the last sync.
+
+        If the account file is missing a column the index needs, a KeyError is raised, the same as the account file
+        lookups.
+
+        """
+        if not self.account_file.is_file():
+            return
+
+        indexed_size = self.get_indexed_size()
+        with open(self.account_file, "rb") as file:
+            header = next(csv.reader([file.readline().decode()]), [])
+            header_end = file.tell()
+            file_size = os.fstat(file.fileno()).st_size
+
+            # The last sync has to have ended on a row boundary of the same file, otherwise the file was rewritten
+            if indexed_size is not None and indexed_size != header_end:
+                if not header_end < indexed_size <= file_size:
+                    indexed_size = None
+                else:
+                    file.seek(indexed_size - 1)
+                    if file.read(1) != b"\n":
+                        indexed_size = None
+
+            start_offset = header_end if indexed_size is None else indexed_size
+            if indexed_size is not None and start_offset == file_size:
+                return
+            file.seek(start_offset)
+            tail = file.read(file_size - start_offset)
+
+        if "date" not in header or "total_value" not in header:
+            raise KeyError("total_value")
+        date_column = header.index("date")
+        total_value_column = header.index("total_value")
+        end_of_day_column = header.index("end_of_day_save") if "end_of_day_save" in header else None
+
+        # Only read complete rows, a row still being written is read on the next sync
+        tail = tail[:tail.rfind(b"\n") + 1]
+        end_of_day_rows = {}
+        for row in csv.reader(io.StringIO(tail.decode())):
+            try:
+                saved_at = datetime.fromisoformat(row[date_column])
+                total_value = float(row[total_value_column])
+            except (IndexError, ValueError):
+                continue
+            end_of_day_save = row[end_of_day_column] if end_of_day_column is not None and \
+                end_of_day_column < len(row) else ""
+            if self.is_end_of_day_save(saved_at, end_of_day_save):
+                end_of_day_rows[saved_at.strftime("%Y-%m-%d")] = (saved_at.strftime(SAVED_AT_FORMAT), total_value)
+
+        conn = self.get_connection()
+        with conn:
+            if indexed_size is None:
+                conn.execute("DELETE FROM end_of_day")
+            conn.executemany("INSERT OR REPLACE INTO end_of_day VALUES (?,?,?)",
+                             [(date, saved_at, total_value)
+                              for date, (saved_at, total_value) in end_of_day_rows.items()])
+            conn.execute("INSERT OR REPLACE INTO index_state VALUES (0, ?)", (start_offset + len(tail),))
+
+    def get_value_before(self, when: datetime) -> Optional[tuple[float, datetime]]:
+        """
+        Get the newest end of day value saved at or before the given time.
+
+        :param when: (datetime): The latest the save can be
+        :return: (tuple[float, datetime]): The total value and when it was saved, None if there is no save before then
+
+        """
+        self.sync()
+        row = self.get_connection().execute("SELECT total_value, saved_at FROM end_of_day WHERE saved_at <= ? "
+                                            "ORDER BY saved_at DESC LIMIT 1",
+                                            (when.strftime(SAVED_AT_FORMAT),)).fetchone()
+        return None if row is None else (row[0], datetime.strptime(row[1], SAVED_AT_FORMAT))
+
+    def get_value_trading_days_back(self, days_back: int,
+                                    when: datetime = None) -> Optional[tuple[float, datetime]]:
+        """
+        Get the end of day value from a number of trading days, days with an end of day save, before the given day.
+
+        :param days_back: (int): How many trading days back, 1 is the last trading day before the given day
+        :param when: (datetime): The day to count back from, defaults to now
+        :return: (tuple[float, datetime]): The total value and when it was saved, None if there aren't that many days
+
+        """
+        self.sync()
+        when = when or datetime.now()
+        row = self.get_connection().execute("SELECT total_value, saved_at FROM end_of_day WHERE date < ? "
+                                            "ORDER BY date DESC LIMIT 1 OFFSET ?",
+                                            (when.strftime("%Y-%m-%d"), days_back - 1)).fetchone()
+        return None if row is None else (row[0], datetime.strptime(row[1], SAVED_AT_FORMAT))
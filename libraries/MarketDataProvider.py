@@ -0,0 +1,404 @@
+"""
+Author: Joel Yuhas
+Date: October 17th, 2026
+
+MarketDataProvider
+
+Every place that gets stock values from the market goes through a market data provider instead of calling yfinance
+directly. This makes where the stock values come from pluggable:
+- YFinanceProvider, gets the stock values live from yfinance. This is the default
+- ReplayProvider, serves the stock values recorded in the developing database interval files and the observer
+  databases, at real or accelerated speed, or stepped by hand. Lets the whole observer -> program -> email flow be ran
+  and load tested with no network calls and no yfinance rate limits
+
+The provider used by default is picked with environment variables, so the background programs can be switched to
+replay without changing any code:
+    ASTRO_MARKET_DATA_PROVIDER  : "yfinance" (default) or "replay"
+    ASTRO_REPLAY_START          : Replay time to start at in Y-m-d H:M:S format, defaults to the first recorded value
+    ASTRO_REPLAY_SPEED          : How many replay seconds pass per real second, defaults to 1
+
+NOTE: Only the stock values are replayed. Trade hours checks still use the real time.
+
+"""
+import bisect
+import datetime
+import os
+import sqlite3
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Optional
+
+import pandas as pd
+import yfinance as yf
+
+from libraries.helper_functions import DATABASE_PATH, OBSERVER_DATABASE_PATH
+
+# The max number of tickers requested from yfinance in one batched download call
+BATCH_FETCH_CHUNK_SIZE = 50
+
+# Environment variables used to pick the default provider
+MARKET_DATA_PROVIDER_ENV = "ASTRO_MARKET_DATA_PROVIDER"
+REPLAY_START_ENV = "ASTRO_REPLAY_START"
+REPLAY_SPEED_ENV = "ASTRO_REPLAY_SPEED"
+
+# Timestamp formats of the recorded stock values
+INTERVAL_TIMESTAMP_FORMAT = "%Y-%m-%d-%H:%M:%S"
+OBSERVER_TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# Columns of the daily history, matching what yfinance returns
+DAILY_HISTORY_COLUMNS = ["Open", "High", "Low", "Close", "Volume"]
+
+
+class MarketDataError(Exception):
+    """
+    Raised when the price of a stock can't be gotten from the market data provider.
+
+    """
+    pass
+
+
+class MarketDataProvider(ABC):
+    """
+    Interface every market data provider implements.
+
+    """
+    @abstractmethod
+    def get_current_price(self, ticker: str) -> Optional[float]:
+        """
+        Get the current price of the stock.
+
+        :param ticker: (str): The ticker of the stock
+        :return: (float): The current price, None if there is no price for the stock
+
+        """
+        pass
+
+    @abstractmethod
+    def get_current_prices(self, tickers: list[str]) -> dict[str, float]:
+        """
+        Get the current price of every stock at once. Tickers without a price are left out of the dictionary.
+
+        :param tickers: (list[str]): The tickers of the stocks
+        :return: (dict[str, float]): Dictionary of ticker to current price
+
+        """
+        pass
+
+    @abstractmethod
+    def get_daily_history(self, ticker: str) -> pd.DataFrame:
+        """
+        Get today's values of the stock, in the same layout as yfinance's history(period='1d').
+
+        :param ticker: (str): The ticker of the stock
+        :return: (pd.DataFrame): Today's Open, High, Low, Close, and Volume. Empty if there are no values for today
+
+        """
+        pass
+
+
+class YFinanceProvider(MarketDataProvider):
+    """
+    Gets the stock values live from yfinance.
+
+    """
+    def __init__(self, chunk_size: int = BATCH_FETCH_CHUNK_SIZE):
+        self.chunk_size = chunk_size
+
+    def get_current_price(self, ticker: str) -> Optional[float]:
+        try:
+            todays_data = yf.Ticker(ticker).history(period='1d')
+        except RuntimeError:
+            print("RunTime Error encountered while getting current price for " + ticker)
+            return None
+
+        # yfinance returns an empty frame for tickers it doesn't know or has no values for today
+        if todays_data is None or 'Close' not in todays_data or len(todays_data['Close'].dropna()) == 0:
+            print("No price returned for " + ticker)
+            return None
+        return float(todays_data['Close'].dropna().iloc[0])
+
+    def get_current_prices(self, tickers: list[str]) -> dict[str, float]:
+        """
+        Uses batched yfinance downloads. The tickers are split into chunks of chunk_size so the number of requests
+        stays small and bounded as more tickers are added.
+
+        """
+        prices = {}
+        for start_index in range(0, len(tickers), self.chunk_size):
+            chunk = tickers[start_index:start_index + self.chunk_size]
+            try:
+                todays_data = yf.download(tickers=" ".join(chunk), period='1d', group_by='column', progress=False)
+            except RuntimeError:
+                print("issue fetching batched stock prices")
+                continue
+
+            closes = todays_data['Close']
+            for ticker in chunk:
+                # Multiple tickers come back as one column per ticker, a single ticker may come back as just a series
+                if hasattr(closes, 'columns'):
+                    if ticker not in closes.columns:
+                        continue
+                    ticker_closes = closes[ticker].dropna()
+                else:
+                    ticker_closes = closes.dropna()
+
+                if len(ticker_closes) > 0:
+                    prices[ticker] = float(ticker_closes.iloc[-1])
+
+        return prices
+
+    def get_daily_history(self, ticker: str) -> pd.DataFrame:
+        return yf.Ticker(ticker).history(period='1d')
+
+
+class ReplayClock:
+    """
+    Clock the replay runs on. Either runs on its own at speed times real time from the start time, or in manual mode
+    only moves when it is advanced.
+
+    """
+    def __init__(self, start_time: float = None, speed: float = 1.0, manual: bool = False):
+        self.speed = speed
+        self.manual = manual
+        self.start_time = None
+        self.current_time = None
+        self.real_start_time = None
+        if start_time is not None:
+            self.start(start_time)
+
+    def start(self, start_time: float):
+        """
+        Start the clock at the replay time.
+
+        :param start_time: (float): The replay time to start at in epoch seconds
+
+        """
+        self.start_time = start_time
+        self.current_time = start_time
+        self.real_start_time = time.monotonic()
+
+    def is_started(self) -> bool:
+        return self.start_time is not None
+
+    def now(self) -> float:
+        """
+        Get the current replay time.
+
+        :return: (float): The replay time in epoch seconds
+
+        """
+        if self.manual:
+            return self.current_time
+        return self.start_time + ((time.monotonic() - self.real_start_time) * self.speed)
+
+    def advance(self, seconds: float):
+        """
+        Move the manual clock forward.
+
+        :param seconds: (float): Number of replay seconds to move forward
+
+        """
+        if not self.manual:
+            raise ValueError("Only a manual replay clock can be advanced")
+        self.current_time += seconds
+
+
+class ReplayProvider(MarketDataProvider):
+    """
+    Serves the stock values recorded in the developing database interval files and the observer databases. The price
+    of a stock is the last recorded value at or before the replay clock's time.
+
+    The values of a ticker are loaded the first time the ticker is asked for. If the clock wasn't given a start time,
+    it starts at the first recorded value of that ticker.
+
+    """
+    def __init__(self, clock: ReplayClock = None, database_path: Path = DATABASE_PATH,
+                 observer_database_path: Path = OBSERVER_DATABASE_PATH):
+        self.clock = clock if clock is not None else ReplayClock()
+        self.database_path = database_path
+        self.observer_database_path = observer_database_path
+        # Recorded values of each ticker, as sorted epoch timestamps and the matching prices
+        self.timestamps: dict[str, list[float]] = {}
+        self.prices: dict[str, list[float]] = {}
+
+    def load_interval_files(self, ticker: str) -> dict[float, float]:
+        """
+        Load the recorded values of the ticker from the developing database interval files. Lines with errors instead
+        of a price are skipped.
+
+        :param ticker: (str): The ticker of the stock
+        :return: (dict[float, float]): Dictionary of epoch timestamp to price
+
+        """
+        values = {}
+        for interval_file in sorted(self.database_path.glob(f"{ticker}_*interval.txt")):
+            with open(interval_file, "r") as file:
+                for line in file:
+                    timestamp, _, price = line.strip().partition(",")
+                    try:
+                        epoch = datetime.datetime.strptime(timestamp, INTERVAL_TIMESTAMP_FORMAT).timestamp()
+                        values[epoch] = float(price)
+                    except ValueError:
+                        continue
+
+        return values
+
+    def load_observer_databases(self, ticker: str) -> dict[float, float]:
+        """
+        Load the recorded values of the ticker from the monthly observer databases.
+
+        :param ticker: (str): The ticker of the stock
+        :return: (dict[float, float]): Dictionary of epoch timestamp to price
+
+        """
+        values = {}
+        for observer_file in sorted(self.observer_database_path.glob(f"stocks_{ticker}_*.db")):
+            conn = sqlite3.connect(observer_file)
+            try:
+                rows = conn.execute("SELECT timestamp, price FROM stocks WHERE stock_ticker = ?", (ticker,)).fetchall()
+            except sqlite3.OperationalError:
+                rows = []
+            finally:
+                conn.close()
+
+            for timestamp, price in rows:
+                try:
+                    values[datetime.datetime.strptime(timestamp, OBSERVER_TIMESTAMP_FORMAT).timestamp()] = float(price)
+                except (TypeError, ValueError):
+                    continue
+
+        return values
+
+    def load_ticker(self, ticker: str):
+        """
+        Load and merge all the recorded values of the ticker. Where both sources have a value at the same time, the
+        observer database value is used.
+
+        :param ticker: (str): The ticker of the stock
+
+        """
+        if ticker in self.timestamps:
+            return
+
+        values = self.load_interval_files(ticker)
+        values.update(self.load_observer_databases(ticker))
+        self.timestamps[ticker] = sorted(values)
+        self.prices[ticker] = [values[timestamp] for timestamp in self.timestamps[ticker]]
+
+        if not self.clock.is_started() and self.timestamps[ticker]:
+            self.clock.start(self.timestamps[ticker][0])
+
+    def get_price_index(self, ticker: str) -> int:
+        """
+        Get the index of the last recorded value at or before the replay time.
+
+        :param ticker: (str): The ticker of the stock
+        :return: (int): The index into the ticker's values, -1 if there are none yet
+
+        """
+        self.load_ticker(ticker)
+        if not self.clock.is_started():
+            return -1
+        return bisect.bisect_right(self.timestamps[ticker], self.clock.now()) - 1
+
+    def get_current_price(self, ticker: str) -> Optional[float]:
+        index = self.get_price_index(ticker)
+        if index < 0:
+            return None
+        return self.prices[ticker][index]
+
+    def get_current_prices(self, tickers: list[str]) -> dict[str, float]:
+        prices = {}
+        for ticker in tickers:
+            price = self.get_current_price(ticker)
+            if price is not None:
+                prices[ticker] = price
+
+        return prices
+
+    def get_daily_history(self, ticker: str) -> pd.DataFrame:
+        """
+        Builds today's values from the values recorded so far on the replay day. No volume is recorded, so it is 0.
+
+        """
+        end_index = self.get_price_index(ticker) + 1
+        if end_index <= 0:
+            return pd.DataFrame(columns=DAILY_HISTORY_COLUMNS)
+
+        replay_day = datetime.datetime.fromtimestamp(self.timestamps[ticker][end_index - 1]).date()
+        day_start = datetime.datetime.combine(replay_day, datetime.time()).timestamp()
+        start_index = bisect.bisect_left(self.timestamps[ticker], day_start)
+        day_prices = self.prices[ticker][start_index:end_index]
+
+        return pd.DataFrame({"Open": [day_prices[0]], "High": [max(day_prices)], "Low": [min(day_prices)],
+                             "Close": [day_prices[-1]], "Volume": [0]},
+                            index=pd.DatetimeIndex([pd.Timestamp(replay_day)], name="Date"))
+
+    def advance_to_next_value(self) -> bool:
+        """
+        Move a manual clock forward to the next recorded value of any loaded ticker.
+
+        :return: (bool): True if the clock moved, False if there are no more recorded values
+
+        """
+        now = self.clock.now()
+        next_timestamps = []
+        for timestamps in self.timestamps.values():
+            index = bisect.bisect_right(timestamps, now)
+            if index < len(timestamps):
+                next_timestamps.append(timestamps[index])
+
+        if not next_timestamps:
+            return False
+        self.clock.advance(min(next_timestamps) - now)
+        return True
+
+
+_market_data_provider: Optional[MarketDataProvider] = None
+
+
+def create_market_data_provider_from_environment() -> MarketDataProvider:
+    """
+    Create the provider picked by the ASTRO_MARKET_DATA_PROVIDER, ASTRO_REPLAY_START, and ASTRO_REPLAY_SPEED
+    environment variables.
+
+    :return: (MarketDataProvider): The created provider
+
+    """
+    provider_name = os.environ.get(MARKET_DATA_PROVIDER_ENV, "yfinance").lower()
+    if provider_name == "yfinance":
+        return YFinanceProvider()
+    if provider_name == "replay":
+        start = os.environ.get(REPLAY_START_ENV)
+        start_time = None if not start else datetime.datetime.strptime(start, OBSERVER_TIMESTAMP_FORMAT).timestamp()
+        speed = float(os.environ.get(REPLAY_SPEED_ENV, 1.0))
+        print(f"Replaying recorded market data at {speed}x speed")
+        return ReplayProvider(ReplayClock(start_time=start_time, speed=speed))
+
+    raise ValueError(f"Unknown market data provider {provider_name}")
+
+
+def get_market_data_provider() -> MarketDataProvider:
+    """
+    Get the provider every stock value is fetched through, creating it from the environment on first use.
+
+    :return: (MarketDataProvider): The current provider
+
+    """
+    global _market_data_provider
+    if _market_data_provider is None:
+        _market_data_provider = create_market_data_provider_from_environment()
+
+    return _market_data_provider
+
+
+def set_market_data_provider(provider: MarketDataProvider):
+    """
+    Replace the provider every stock value is fetched through.
+
+    :param provider: (MarketDataProvider): The provider to use, None to go back to creating it from the environment
+
+    """
+    global _market_data_provider
+    _market_data_provider = provider
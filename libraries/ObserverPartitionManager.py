@@ -0,0 +1,151 @@
+"""
+Author: Joel Yuhas
+Date: October 17th, 2026
+
+ObserverPartitionManager
+
+The observer writes each stock to its own database per month, stocks_{ticker}_{YYYY_MM}.db. This class keeps track of
+which monthly partition is current so a long-running observer rolls over to the new month's databases at the boundary,
+and knows when to create next month's databases ahead of time so the rollover doesn't have to create anything.
+
+It also works out which partitions readers need to look at, either the current and previous month when looking for
+the latest price right after a rollover, or every month that overlaps a time range.
+
+"""
+import datetime
+from pathlib import Path
+from typing import Optional
+
+from libraries.helper_functions import OBSERVER_DATABASE_PATH
+
+# How many days before the end of the month the next month's databases are created
+PRECREATE_DAYS_BEFORE_ROLLOVER = 3
+
+
+class ObserverPartitionManager:
+    def __init__(self, database_path: Path = OBSERVER_DATABASE_PATH,
+                 precreate_days: int = PRECREATE_DAYS_BEFORE_ROLLOVER):
+        self.database_path = database_path
+        self.precreate_days = precreate_days
+        # The partition the writer is currently writing to, None until the first partition is set up
+        self.current_partition: Optional[str] = None
+
+    @staticmethod
+    def get_partition_key(when: datetime.datetime) -> str:
+        """
+        Get the partition key for the given time.
+
+        :param when: (datetime): The time to get the partition of
+        :return: (str): The partition key in YYYY_MM format
+
+        """
+        return when.strftime("%Y_%m")
+
+    @staticmethod
+    def get_partition_start(partition_key: str) -> datetime.datetime:
+        """
+        Get the first moment of the partition.
+
+        :param partition_key: (str): The partition key in YYYY_MM format
+        :return: (datetime): Midnight on the first day of the partition's month
+
+        """
+        return datetime.datetime.strptime(partition_key, "%Y_%m")
+
+    @staticmethod
+    def get_next_partition_key(partition_key: str) -> str:
+        """
+        Get the partition that comes after the given one.
+
+        :param partition_key: (str): The partition key in YYYY_MM format
+        :return: (str): The next month's partition key
+
+        """
+        year, month = (int(value) for value in partition_key.split("_"))
+        if month == 12:
+            return f"{year + 1}_01"
+        return f"{year}_{str(month + 1).zfill(2)}"
+
+    @staticmethod
+    def get_previous_partition_key(partition_key: str) -> str:
+        """
+        Get the partition that comes before the given one.
+
+        :param partition_key: (str): The partition key in YYYY_MM format
+        :return: (str): The previous month's partition key
+
+        """
+        year, month = (int(value) for value in partition_key.split("_"))
+        if month == 1:
+            return f"{year - 1}_12"
+        return f"{year}_{str(month - 1).zfill(2)}"
+
+    def get_partition_file(self, ticker: str, partition_key: str) -> Path:
+        """
+        Get the database file of the ticker for the partition.
+
+        :param ticker: (str): The ticker of the stock
+        :param partition_key: (str): The partition key in YYYY_MM format
+        :return: (Path): The path of the database file
+
+        """
+        return self.database_path / f"stocks_{ticker}_{partition_key}.db"
+
+    def needs_rollover(self, when: datetime.datetime) -> bool:
+        """
+        Check if the writer needs to move to a different partition.
+
+        :param when: (datetime): The time of the next write
+        :return: (bool): True if the time falls outside the current partition
+
+        """
+        return self.get_partition_key(when) != self.current_partition
+
+    def should_precreate(self, when: datetime.datetime) -> bool:
+        """
+        Check if the next month's partition should be created ahead of the rollover.
+
+        :param when: (datetime): The current time
+        :return: (bool): True if within precreate_days of the start of the next month
+
+        """
+        next_partition_start = self.get_partition_start(self.get_next_partition_key(self.get_partition_key(when)))
+        return next_partition_start - when <= datetime.timedelta(days=self.precreate_days)
+
+    def get_readable_partition_files(self, ticker: str, when: datetime.datetime = None) -> list[Path]:
+        """
+        Get the partitions a reader should look at for the latest price, newest first. Includes the previous month so
+        reads right after the rollover still find a price before the first write of the new month.
+
+        :param ticker: (str): The ticker of the stock
+        :param when: (datetime): The time of the read, defaults to now
+        :return: (list[Path]): The database files that exist, newest first
+
+        """
+        partition_key = self.get_partition_key(when or datetime.datetime.now())
+        partition_files = [self.get_partition_file(ticker, partition_key),
+                           self.get_partition_file(ticker, self.get_previous_partition_key(partition_key))]
+
+        return [file for file in partition_files if file.is_file()]
+
+    def get_partition_files_for_range(self, ticker: str, start: datetime.datetime,
+                                      end: datetime.datetime) -> list[Path]:
+        """
+        Get every partition of the ticker that overlaps the time range, oldest first.
+
+        :param ticker: (str): The ticker of the stock
+        :param start: (datetime): The start of the range
+        :param end: (datetime): The end of the range
+        :return: (list[Path]): The database files that exist, oldest first
+
+        """
+        partition_files = []
+        partition_key = self.get_partition_key(start)
+        end_partition_key = self.get_partition_key(end)
+        while partition_key <= end_partition_key:
+            partition_file = self.get_partition_file(ticker, partition_key)
+            if partition_file.is_file():
+                partition_files.append(partition_file)
+            partition_key = self.get_next_partition_key(partition_key)
+
+        return partition_files
@@ -17,18 +17,115 @@ This does twofold:
 
 """
 
-import yfinance as yf
 import sqlite3
 import datetime
 import os
+import time
 from pathlib import Path
+from typing import Callable
 
-from libraries.helper_functions import OBSERVER_DATABASE_PATH
+from libraries.helper_functions import SQLITE_JOURNAL_MODE, SQLITE_BUSY_TIMEOUT_SECONDS, open_database_connection
+from libraries.ObserverPartitionManager import ObserverPartitionManager
+from libraries.MarketDataProvider import get_market_data_provider
+from libraries.PriceBoard import PriceBoard
+from libraries.TickPublisher import TickPublisher
+from libraries.TickStore import TickStore
+
+# Default max time in seconds a tick can wait in the write buffer before it is committed. At 0, the ticks of every
+# observer pass are committed together at the end of that pass.
+DEFAULT_MAX_WRITE_LATENCY_SECONDS = 0.0
+
+# Schema statements that are safe to run against both new and existing observer databases. The timestamp index keeps
+# range and latest lookups from sorting the whole month, and the latest table holds one row per ticker that the writer
+# replaces on every tick so readers can get the current price with a single primary key lookup.
+OBSERVER_SCHEMA_STATEMENTS = (
+    '''CREATE TABLE IF NOT EXISTS stocks (timestamp text, stock_ticker text, price real)''',
+    '''CREATE INDEX IF NOT EXISTS idx_stocks_timestamp ON stocks (timestamp)''',
+    '''CREATE TABLE IF NOT EXISTS latest (stock_ticker text PRIMARY KEY, timestamp text, price real)''',
+)
+
+
+class TickWriteBuffer:
+    """
+    Buffer that collects observed ticks so they can be committed together in one transaction per database, instead of
+    one transaction per tick. Ticks are held until the oldest one has waited max_latency_seconds.
+
+    Each buffered tick is (file_name, stock_ticker, price, timestamp, epoch_timestamp).
+
+    """
+    def __init__(self, max_latency_seconds: float = DEFAULT_MAX_WRITE_LATENCY_SECONDS):
+        self.max_latency_seconds = max_latency_seconds
+        self.pending: list[tuple[Path, str, float, str, float]] = []
+        self.oldest_tick_time = None
+
+    def __len__(self) -> int:
+        return len(self.pending)
+
+    def add(self, file_name: Path, stock_ticker: str, price: float, timestamp: str, epoch_timestamp: float):
+        """
+        Add a tick to the buffer.
+
+        :param file_name: (Path): Filename and path of the database the tick belongs in
+        :param stock_ticker: (str): The ticker of the stock
+        :param price: (float): The price of the stock in float format
+        :param timestamp: (str): The timestamp of the tick in Y-m-d H:M:S format
+        :param epoch_timestamp: (float): The timestamp of the tick in epoch seconds
+
+        """
+        if not self.pending:
+            self.oldest_tick_time = time.monotonic()
+        self.pending.append((file_name, stock_ticker, price, timestamp, epoch_timestamp))
+
+    def is_due(self) -> bool:
+        """
+        Check if the buffered ticks should be committed.
+
+        :return: (bool): True if there are ticks and the oldest has waited at least max_latency_seconds
+
+        """
+        return bool(self.pending) and time.monotonic() - self.oldest_tick_time >= self.max_latency_seconds
+
+    def take(self) -> list[tuple[Path, str, float, str, float]]:
+        """
+        Remove and return all the buffered ticks.
+
+        :return: (list): The buffered ticks in the order they were added
+
+        """
+        pending = self.pending
+        self.pending = []
+        self.oldest_tick_time = None
+        return pending
 
 
 class ObserverPattern:
-    def __init__(self):
+    def __init__(self, batch_fetch: bool = True, price_fetcher: Callable[[list[str]], dict[str, float]] = None,
+                 price_board: PriceBoard = None, tick_publisher: TickPublisher = None, tick_store: TickStore = None,
+                 max_write_latency_seconds: float = DEFAULT_MAX_WRITE_LATENCY_SECONDS,
+                 partition_manager: ObserverPartitionManager = None):
         self.stock_dict = {}
+        self.batch_fetch = batch_fetch
+        # Optional shared memory board the latest prices are also published to, for programs that read from memory
+        self.price_board = price_board
+        # Optional channel every tick is pushed to once written, for programs that wait on new ticks
+        self.tick_publisher = tick_publisher
+        # Optional single multi-ticker store every tick is also written to
+        self.tick_store = tick_store
+        # Function used to get the prices of all observed stocks at once, can be swapped out with a local stand-in so
+        # the observer can be ran and tested without any network calls
+        self.price_fetcher = price_fetcher if price_fetcher is not None else self.fetch_stock_prices
+        # Long-lived database connections, keyed by database file
+        self.connections: dict[Path, sqlite3.Connection] = {}
+        # Ticks waiting to be committed together
+        self.write_buffer = TickWriteBuffer(max_write_latency_seconds)
+        # Tracks which monthly databases the stocks are written to, and rolls them over at the month boundary
+        self.partition_manager = partition_manager if partition_manager is not None else ObserverPartitionManager()
+
+    def __enter__(self) -> 'ObserverPattern':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close_all_connections()
 
     def add_stock(self, stock_ticker: str):
         """
@@ -39,25 +136,126 @@ class ObserverPattern:
         """
         # If the ticket is not already in the stock_dict, add it. If not, should be already added.
         if stock_ticker not in self.stock_dict:
-            database_file = self.setup_observe_stock(stock_ticker)
+            now = datetime.datetime.now()
+            database_file = self.setup_observe_stock(stock_ticker, now)
             self.stock_dict[stock_ticker] = database_file
+            if self.partition_manager.current_partition is None:
+                self.partition_manager.current_partition = self.partition_manager.get_partition_key(now)
 
     @staticmethod
     def fetch_stock_price(stock_ticker: str) -> float:
         """
-        Fetch the stock price for the desired stock ticker using yfinance
+        Fetch the stock price for the desired stock ticker from the market data provider, yfinance by default.
 
         :param stock_ticker: (str): The ticket of the stock to get the current price from.
-        :return: (float): The yfinance value of the stock in float format
+        :return: (float): The current value of the stock in float format, None if the provider has no price for it
+
+        """
+        return get_market_data_provider().get_current_price(stock_ticker)
+
+    @staticmethod
+    def fetch_stock_prices(stock_tickers: list[str]) -> dict[str, float]:
+        """
+        Fetch the stock prices for all the desired stock tickers at once from the market data provider, yfinance by
+        default.
+
+        Tickers that the provider could not find a price for are left out of the returned dictionary.
+
+        :param stock_tickers: (list[str]): The tickers of the stocks to get the current prices from.
+        :return: (dict[str, float]): Dictionary of ticker to the current value of the stock
+
+        """
+        return get_market_data_provider().get_current_prices(stock_tickers)
+
+    def get_connection(self, file_name: Path) -> sqlite3.Connection:
+        """
+        Get the long-lived connection for the database file, opening it if there is not one yet.
+
+        :param file_name: (Path): Filename and path of the database
+        :return: (sqlite3.Connection): The open connection for the database
+
+        """
+        if file_name not in self.connections:
+            self.connections[file_name] = open_database_connection(file_name)
+
+        return self.connections[file_name]
 
+    def close_connection(self, file_name: Path):
         """
+        Close the connection for the database file if one is open. The next get_connection call will reopen it.
+
+        :param file_name: (Path): Filename and path of the database
+
+        """
+        conn = self.connections.pop(file_name, None)
+        if conn is not None:
+            try:
+                conn.close()
+            except sqlite3.Error as e:
+                print(f"Issue closing connection to {file_name}: {e}")
+
+    def publish_tick(self, stock_ticker: str, price: float, epoch_timestamp: float):
+        """
+        Publish the latest price to the price board and push it to the tick subscribers, if the observer has them.
+        Should be called after the tick is written so anything reacting to it sees the same price in the database.
+        A tick the price board can't hold, like when the board is full, is still pushed to the tick subscribers.
+
+        :param stock_ticker: (str): The ticker of the stock
+        :param price: (float): The price of the stock in float format
+        :param epoch_timestamp: (float): The time of the price in epoch seconds
+
+        """
+        if self.price_board is not None:
+            try:
+                self.price_board.publish(stock_ticker, price, epoch_timestamp)
+            except ValueError as e:
+                print(f"Issue publishing {stock_ticker} to the price board: {e}")
+        if self.tick_publisher is not None:
+            self.tick_publisher.publish(stock_ticker, price, epoch_timestamp)
+
+    def close_all_connections(self):
+        """
+        Commit any buffered ticks and close every open database connection. Should be called when the observer is
+        shutting down.
+
+        """
+        self.flush_writes()
+        for file_name in list(self.connections):
+            self.close_connection(file_name)
+        if self.tick_store is not None:
+            self.tick_store.close_all_connections()
+
+    def write_to_tick_store(self, ticks: list[tuple[str, str, float]]):
+        """
+        Write the ticks to the tick store if the observer has one.
+
+        :param ticks: (list[tuple[str, str, float]]): The ticks as (stock_ticker, timestamp, price)
+
+        """
+        if self.tick_store is None:
+            return
         try:
-            ticker = yf.Ticker(stock_ticker)
-            todays_data = ticker.history(period='1d')
-        except RuntimeError:
-            print("issue fetching stock price")
+            self.tick_store.write_ticks(ticks)
+        except sqlite3.Error as e:
+            print(f"Issue writing to the tick store: {e}, reopening connections")
+            self.tick_store.close_all_connections()
+
+    @staticmethod
+    def create_schema(conn: sqlite3.Connection):
+        """
+        Create any missing tables and indexes on the connection's database. If the latest table is empty, seed it from
+        the newest row of each ticker in the stocks table so readers can use it right away.
 
-        return todays_data['Close'][0]
+        :param conn: (sqlite3.Connection): Connection to the database to create the schema in
+
+        """
+        with conn:
+            for statement in OBSERVER_SCHEMA_STATEMENTS:
+                conn.execute(statement)
+            if conn.execute("SELECT COUNT(*) FROM latest").fetchone()[0] == 0:
+                conn.execute('''INSERT INTO latest
+                                SELECT stock_ticker, MAX(timestamp), price FROM stocks
+                                WHERE stock_ticker IS NOT NULL GROUP BY stock_ticker''')
 
     @staticmethod
     def create_db(file_name: Path):
@@ -68,13 +266,54 @@ class ObserverPattern:
 
         """
         conn = sqlite3.connect(file_name)
-        c = conn.cursor()
-        c.execute('''CREATE TABLE stocks (timestamp text, stock_ticker text, price real)''')
-        conn.commit()
+        conn.execute(f"PRAGMA journal_mode={SQLITE_JOURNAL_MODE}")
+        ObserverPattern.create_schema(conn)
         conn.close()
 
     @staticmethod
-    def write_to_db(file_name: Path, stock_ticker: str, price: float, timestamp: str):
+    def migrate_db(file_name: Path):
+        """
+        Upgrade an existing observer database to the current schema, adding the timestamp index and latest table.
+        Running it against an already upgraded database does nothing.
+
+        :param file_name: (Path): Filename and path of the database to upgrade
+
+        """
+        conn = sqlite3.connect(file_name, timeout=SQLITE_BUSY_TIMEOUT_SECONDS)
+        ObserverPattern.create_schema(conn)
+        conn.close()
+
+    def write_ticks_to_db(self, file_name: Path, ticks: list[tuple[str, float, str]]):
+        """
+        Write the ticks to the specified database in a single transaction. Every tick is added to the stocks table, and
+        the newest tick of each ticker replaces its row in the latest table.
+
+        Uses the long-lived connection for the database. If the write fails, the connection is reopened and the write
+        is tried one more time.
+
+        :param file_name: (Path): Filename and path of the file of the database to write to
+        :param ticks: (list[tuple[str, float, str]]): The ticks as (stock_ticker, price, timestamp), oldest first
+
+        """
+        stock_rows = [(timestamp, stock_ticker, price) for stock_ticker, price, timestamp in ticks]
+        # Later ticks of the same ticker overwrite earlier ones, leaving only the newest
+        latest_rows = {stock_ticker: (stock_ticker, timestamp, price) for stock_ticker, price, timestamp in ticks}
+
+        for attempt in range(2):
+            try:
+                conn = self.get_connection(file_name)
+                with conn:
+                    conn.executemany("INSERT INTO stocks VALUES (?,?,?)", stock_rows)
+                    conn.executemany("INSERT OR REPLACE INTO latest VALUES (?,?,?)", list(latest_rows.values()))
+                return
+            except (sqlite3.OperationalError, sqlite3.ProgrammingError) as e:
+                print(f"Issue writing to {file_name}: {e}, reopening connection")
+                self.close_connection(file_name)
+                self.create_schema(self.get_connection(file_name))
+
+        print(f"Dropped {len(ticks)} ticks that could not be written to {file_name}")
+
+    def write_to_db(self, file_name: Path, stock_ticker: str, price: float, timestamp: str):
         """
         Write to the specified database with the stock ticker name, price of the stock, and timestamp values.
 
@@ -84,58 +323,147 @@ class ObserverPattern:
         :param timestamp: (str): The timestamp the write_to_db has taken place, typically in Y-m-d H:M:S format
 
         """
-        try:
-            conn = sqlite3.connect(file_name)
-            c = conn.cursor()
-            c.execute("INSERT INTO stocks VALUES (?,?,?)", (timestamp, stock_ticker, price))
-            conn.commit()
-        except sqlite3.OperationalError as e:
-            c.execute('''CREATE TABLE IF NOT EXISTS stocks
-                         (timestamp text, stock_ticker text, price real)''')
-            conn.commit()
-        finally:
-            conn.close()
-
-    def setup_observe_stock(self, stock_ticker: str) -> Path:
+        self.write_ticks_to_db(file_name, [(stock_ticker, price, timestamp)])
+
+    def flush_writes(self, force: bool = True):
+        """
+        Commit the buffered ticks, with one transaction per database, and then publish them.
+
+        :param force: (bool): If True, commit whatever is buffered. If False, only commit once the buffer's max latency
+                              has been reached.
+
+        """
+        if not self.write_buffer or (not force and not self.write_buffer.is_due()):
+            return
+
+        pending = self.write_buffer.take()
+        ticks_by_file = {}
+        for file_name, stock_ticker, price, timestamp, _ in pending:
+            ticks_by_file.setdefault(file_name, []).append((stock_ticker, price, timestamp))
+        for file_name, ticks in ticks_by_file.items():
+            self.write_ticks_to_db(file_name, ticks)
+
+        self.write_to_tick_store([(stock_ticker, timestamp, price) for _, stock_ticker, price, timestamp, _ in pending])
+
+        # Only publish once committed, so anything reacting to a tick finds it in the databases
+        for _, stock_ticker, price, _, epoch_timestamp in pending:
+            self.publish_tick(stock_ticker, price, epoch_timestamp)
+
+    def setup_observe_stock(self, stock_ticker: str, when: datetime.datetime = None) -> Path:
         """
         Set up an observer for the specific stock ticker provided. Return the path to the database.
 
         :param stock_ticker: (str): The ticket of the stock
+        :param when: (datetime): Time that picks which monthly database to set up, defaults to now
         :return: (Path): The path of the database file for the specific stock.
         """
-        current_month_year = datetime.datetime.now().strftime("%Y_%m")
-        file_name = f"stocks_{stock_ticker}_{current_month_year}.db"
-        full_file_name = OBSERVER_DATABASE_PATH / file_name
-        try:
-            # try to connect to the db file for the current month, if it doesn't exist then create it
-            if os.path.exists(full_file_name):
-                sqlite3.connect(full_file_name)
-            else:
-                self.create_db(full_file_name)
-        except:
+        partition_key = self.partition_manager.get_partition_key(when or datetime.datetime.now())
+        full_file_name = self.partition_manager.get_partition_file(stock_ticker, partition_key)
+        # If the db file for the current month doesn't exist then create it, otherwise make sure it has the latest schema
+        if not os.path.exists(full_file_name):
             self.create_db(full_file_name)
+        else:
+            self.migrate_db(full_file_name)
+
+        # Open the long-lived connection now so the first write doesn't pay for it
+        self.get_connection(full_file_name)
 
         return full_file_name
 
-    def observe_stock(self, stock_ticker: str, file_name: Path):
+    def roll_over_partitions(self, now: datetime.datetime):
+        """
+        Move every stock to the monthly database that now falls in. The ticks already buffered are committed to the
+        databases they were observed for, and the previous month's connections are closed.
+
+        Near the end of the month, next month's databases are created and opened ahead of time so the rollover itself
+        only has to swap paths.
+
+        Does nothing until a stock has been added with add_stock, since there is no partition to roll over from.
+
+        :param now: (datetime): The time of the ticks about to be written
+
+        """
+        if self.partition_manager.current_partition is None:
+            return
+
+        if self.partition_manager.needs_rollover(now):
+            partition_key = self.partition_manager.get_partition_key(now)
+            print(f"Rolling observer databases over from {self.partition_manager.current_partition} to {partition_key}")
+            self.flush_writes()
+            for stock in self.stock_dict:
+                previous_file = self.stock_dict[stock]
+                self.stock_dict[stock] = self.setup_observe_stock(stock, now)
+                if previous_file != self.stock_dict[stock]:
+                    self.close_connection(previous_file)
+            self.partition_manager.current_partition = partition_key
+
+        if self.partition_manager.should_precreate(now):
+            next_partition_key = self.partition_manager.get_next_partition_key(self.partition_manager.current_partition)
+            next_partition_start = self.partition_manager.get_partition_start(next_partition_key)
+            for stock in self.stock_dict:
+                if self.partition_manager.get_partition_file(stock, next_partition_key) not in self.connections:
+                    self.setup_observe_stock(stock, next_partition_start)
+
+    def observe_stock(self, stock_ticker: str, file_name: Path, flush: bool = True) -> float:
         """
         Begin observation of the stock and record the information, including price and timestamp of price, to the
         database file name.
 
         :param stock_ticker: (str): The ticker of the stock to observe
         :param file_name: (Path): The filename path where the corresponding stock database is located.
+        :param flush: (bool): If True, commit the write buffer if it is due after adding this tick
+        :return: (float): The price that was observed, None if no price was returned for the stock
 
         """
         price = self.fetch_stock_price(stock_ticker)
-        timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        self.write_to_db(file_name, stock_ticker, price, timestamp)
+        if price is None:
+            print(f"No price returned for {stock_ticker}, skipping this pass")
+            return None
+        now = time.time()
+        timestamp = datetime.datetime.fromtimestamp(now).strftime("%Y-%m-%d %H:%M:%S")
+        self.write_buffer.add(file_name, stock_ticker, price, timestamp, now)
+        if flush:
+            self.flush_writes(force=False)
 
-    def observer_all_stocks(self):
+        return price
+
+    def observer_all_stocks(self) -> dict[str, float]:
         """
         Basic helper function to observe all stocks in the stock dictionary.
 
+        When batch_fetch is set, all the prices are gathered with one call to the price_fetcher and every stock is
+        written with the same shared timestamp. Otherwise, each stock is fetched one at a time.
+
+        The ticks of the pass go through the write buffer, and are committed together once the buffer's max latency
+        is reached. Before the ticks are buffered, the stocks are rolled over to the new month's databases if the month
+        has changed.
+
+        :return: (dict[str, float]): The prices that were observed for each ticker this pass
+
         """
+        if not self.batch_fetch:
+            self.roll_over_partitions(datetime.datetime.now())
+            prices = {}
+            for stock in self.stock_dict:
+                print(stock)
+                price = self.observe_stock(stock, self.stock_dict[stock], flush=False)
+                if price is not None:
+                    prices[stock] = price
+            self.flush_writes(force=False)
+            return prices
+
+        prices = self.price_fetcher(list(self.stock_dict))
+        now = time.time()
+        now_datetime = datetime.datetime.fromtimestamp(now)
+        timestamp = now_datetime.strftime("%Y-%m-%d %H:%M:%S")
+        self.roll_over_partitions(now_datetime)
         for stock in self.stock_dict:
-            print(stock)
-            self.observe_stock(stock, self.stock_dict[stock])
+            if stock not in prices:
+                print(f"No price returned for {stock}, skipping this pass")
+                continue
+            print(f"{stock}: {prices[stock]}")
+            self.write_buffer.add(self.stock_dict[stock], stock, prices[stock], timestamp, now)
+
+        self.flush_writes(force=False)
 
+        return prices
@@ -0,0 +1,216 @@
+"""
+Author: Joel Yuhas
+Date: October 17th, 2026
+
+ObserverQueryLibrary
+
+Reads the recorded ticks of a stock over any time range without needing to know which monthly observer databases,
+stocks_{ticker}_{YYYY_MM}.db, the range falls in. The ObserverPartitionManager works out which monthly files overlap
+the range, and they are attached read only to one connection and queried together.
+
+The ranges are compared against the timestamp text directly (timestamp >= start AND timestamp < end), so sqlite can
+use the idx_stocks_timestamp index and only read the rows in the range. Databases recorded before the index was added
+fall back to scanning the month, run programs/utils/observer_database_migrator.py to add it.
+
+Ticks are returned as numpy arrays. The timestamps are datetime64[s] of the recorded wall time, .astype(np.int64) gives
+the same epoch seconds as the PriceArrayLibrary arrays.
+
+"""
+import datetime
+import sqlite3
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+from libraries.helper_functions import SQLITE_BUSY_TIMEOUT_SECONDS
+from libraries.ObserverPartitionManager import ObserverPartitionManager
+
+# Max number of databases attached at once. sqlite's default limit is 10
+MAX_ATTACHED_DATABASES = 10
+
+# Timestamp format of the observer databases, it sorts in time order as text
+OBSERVER_TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+TIMESTAMP_INDEX_NAME = "idx_stocks_timestamp"
+
+
+class ObserverQueryLibrary:
+    def __init__(self, partition_manager: ObserverPartitionManager = None):
+        self.partition_manager = partition_manager or ObserverPartitionManager()
+        # In memory connection the observer databases are attached to, opened on first use
+        self.conn: Optional[sqlite3.Connection] = None
+        # Databases already found to be missing the timestamp index, so each is only reported once
+        self.unindexed_files: set[Path] = set()
+
+    def __enter__(self) -> 'ObserverQueryLibrary':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """
+        Close the connection, if it was opened.
+
+        """
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
+    def get_connection(self) -> sqlite3.Connection:
+        """
+        Get the connection the observer databases are attached to, opening it if there is not one yet.
+
+        :return: (sqlite3.Connection): The connection
+
+        """
+        if self.conn is None:
+            self.conn = sqlite3.connect(":memory:", timeout=SQLITE_BUSY_TIMEOUT_SECONDS, uri=True)
+        return self.conn
+
+    def attach_databases(self, database_files: list[Path]) -> list[str]:
+        """
+        Attach the databases read only to the connection. Any database without the stocks table is skipped, and any
+        without the timestamp index is reported.
+
+        :param database_files: (list[Path]): The databases to attach, at most MAX_ATTACHED_DATABASES
+        :return: (list[str]): The schema names the databases with a stocks table were attached as
+
+        """
+        conn = self.get_connection()
+        schema_names = []
+        for number, database_file in enumerate(database_files):
+            schema_name = f"partition_{number}"
+            conn.execute("ATTACH DATABASE ? AS " + schema_name, (f"{database_file.resolve().as_uri()}?mode=ro",))
+            table_row = conn.execute(f"SELECT 1 FROM {schema_name}.sqlite_master WHERE type = 'table' "
+                                     f"AND name = 'stocks'").fetchone()
+            if table_row is None:
+                print(f"No stocks table in {database_file.name}, skipping")
+                conn.execute("DETACH DATABASE " + schema_name)
+                continue
+            schema_names.append(schema_name)
+
+            index_row = conn.execute(f"SELECT 1 FROM {schema_name}.sqlite_master WHERE type = 'index' AND name = ?",
+                                     (TIMESTAMP_INDEX_NAME,)).fetchone()
+            if index_row is None and database_file not in self.unindexed_files:
+                self.unindexed_files.add(database_file)
+                print(f"No timestamp index in {database_file.name}, range queries will scan the month. Run "
+                      f"observer_database_migrator.py to add it")
+
+        return schema_names
+
+    def detach_databases(self, schema_names: list[str]):
+        """
+        Detach the databases from the connection.
+
+        :param schema_names: (list[str]): The schema names the databases were attached as
+
+        """
+        for schema_name in schema_names:
+            self.conn.execute("DETACH DATABASE " + schema_name)
+
+    def get_tick_rows(self, ticker: str, start: datetime.datetime, end: datetime.datetime) -> list[tuple[str, float]]:
+        """
+        Get the rows of every tick of the stock from start up to but not including end.
+
+        :param ticker: (str): The ticker of the stock
+        :param start: (datetime): The start of the range
+        :param end: (datetime): The end of the range, not included
+        :return: (list[tuple[str, float]]): The timestamp and price of each tick in time order
+
+        """
+        database_files = self.partition_manager.get_partition_files_for_range(ticker, start, end)
+        start_text = start.strftime(OBSERVER_TIMESTAMP_FORMAT)
+        end_text = end.strftime(OBSERVER_TIMESTAMP_FORMAT)
+
+        rows = []
+        # The monthly files don't overlap and are oldest first, so each batch only needs its own rows sorted
+        for batch_start in range(0, len(database_files), MAX_ATTACHED_DATABASES):
+            schema_names = self.attach_databases(database_files[batch_start:batch_start + MAX_ATTACHED_DATABASES])
+            if not schema_names:
+                continue
+            try:
+                query = " UNION ALL ".join(
+                    f"SELECT timestamp, price FROM {schema_name}.stocks WHERE timestamp >= ? AND timestamp < ? "
+                    f"AND stock_ticker = ? AND price IS NOT NULL" for schema_name in schema_names)
+                rows.extend(self.conn.execute(query + " ORDER BY timestamp",
+                                              (start_text, end_text, ticker) * len(schema_names)).fetchall())
+            finally:
+                self.detach_databases(schema_names)
+
+        return rows
+
+    def get_ticks(self, ticker: str, start: datetime.datetime,
+                  end: datetime.datetime) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Get every tick of the stock from start up to but not including end, across all the monthly databases the range
+        overlaps.
+
+        :param ticker: (str): The ticker of the stock
+        :param start: (datetime): The start of the range
+        :param end: (datetime): The end of the range, not included
+        :return: (tuple[np.ndarray, np.ndarray]): The datetime64[s] timestamps and float64 prices in time order
+
+        """
+        rows = self.get_tick_rows(ticker, start, end)
+        timestamps = np.array([row[0] for row in rows], dtype="datetime64[s]")
+        prices = np.array([row[1] for row in rows], dtype=np.float64)
+
+        return timestamps, prices
+
+    def get_price_at(self, ticker: str, when: datetime.datetime) -> Optional[float]:
+        """
+        Get the price of the stock at the given time, which is the price of the newest tick at or before it. Looks in
+        the month of the time and the month before, so a time early in a month still gets a price.
+
+        :param ticker: (str): The ticker of the stock
+        :param when: (datetime): The time to get the price at
+        :return: (float): The price, None if there is no tick at or before the time in either month
+
+        """
+        when_text = when.strftime(OBSERVER_TIMESTAMP_FORMAT)
+        for database_file in self.partition_manager.get_readable_partition_files(ticker, when):
+            schema_names = self.attach_databases([database_file])
+            if not schema_names:
+                continue
+            try:
+                row = self.conn.execute(f"SELECT price FROM {schema_names[0]}.stocks WHERE timestamp <= ? "
+                                        f"AND stock_ticker = ? AND price IS NOT NULL ORDER BY timestamp DESC LIMIT 1",
+                                        (when_text, ticker)).fetchone()
+            finally:
+                self.detach_databases(schema_names)
+            if row is not None:
+                return float(row[0])
+
+        return None
+
+    def get_latest_prices(self, ticker: str, count: int, when: datetime.datetime = None) -> np.ndarray:
+        """
+        Get the most recent prices of the stock, looking in the month of the time and the month before.
+
+        :param ticker: (str): The ticker of the stock
+        :param count: (int): The max number of prices to get
+        :param when: (datetime): The time to get the prices up to, defaults to now
+        :return: (np.ndarray): Up to count float64 prices, oldest first
+
+        """
+        when = when or datetime.datetime.now()
+        when_text = when.strftime(OBSERVER_TIMESTAMP_FORMAT)
+        prices = []
+        # Files are newest first, so keep reading further back until there are enough prices
+        for database_file in self.partition_manager.get_readable_partition_files(ticker, when):
+            schema_names = self.attach_databases([database_file])
+            if not schema_names:
+                continue
+            try:
+                rows = self.conn.execute(f"SELECT price FROM {schema_names[0]}.stocks WHERE timestamp <= ? "
+                                         f"AND stock_ticker = ? AND price IS NOT NULL ORDER BY timestamp DESC LIMIT ?",
+                                         (when_text, ticker, count - len(prices))).fetchall()
+            finally:
+                self.detach_databases(schema_names)
+            prices.extend(row[0] for row in rows)
+            if len(prices) >= count:
+                break
+
+        return np.array(prices[::-1], dtype=np.float64)
@@ -0,0 +1,223 @@
+"""
+Author: Joel Yuhas
+Date: October 17th, 2026
+
+PortfolioArrays
+
+Struct of arrays version of many accounts and their stocks, for when one process simulates thousands of accounts at
+once. Instead of an AccountLibrary and a stock object per account, each numeric stock value is one numpy array with a
+row per account and a column per ticker id, and each account's money is one entry of the money array.
+
+update_stock_values_all does the same updates as StockBaseClass.update_stock_values for every owned stock of every
+account in one set of array operations, and get_account_values gives every account's value in one operation. buy and
+sell do the same changes to the stock values as the Transaction buy and sell, for a set of accounts at a time.
+
+Accounts can be brought in from AccountLibrary objects with from_accounts and the values written back to them with
+write_to_accounts. The price history, files, and transactions stay with the AccountLibrary objects.
+
+"""
+import numpy as np
+
+# Stock values kept as (account, ticker id) float arrays
+STOCK_VALUE_FIELDS = ('quantity', 'buy_price', 'sell_price', 'last_price', 'last_last_price', 'last_high', 'last_low',
+                      'daily_high', 'daily_low', 'new_high', 'new_low', 'all_time_peak')
+
+# Trend values, stored as int8 instead of the "UP" and "DOWN" strings the stocks use
+TREND_NONE = 0
+TREND_UP = 1
+TREND_DOWN = -1
+TREND_NAMES = {TREND_NONE: None, TREND_UP: "UP", TREND_DOWN: "DOWN"}
+
+
+class PortfolioArrays:
+    def __init__(self, tickers: list[str], account_count: int):
+        self.tickers = list(tickers)
+        self.ticker_ids = {ticker: ticker_id for ticker_id, ticker in enumerate(self.tickers)}
+        self.account_count = account_count
+        shape = (account_count, len(self.tickers))
+
+        self.money = np.zeros(account_count, dtype=np.float64)
+        # If the account has the stock, only owned stocks are updated the same as AccountLibrary only updates its stocks
+        self.owned = np.zeros(shape, dtype=bool)
+        self.trend = np.full(shape, TREND_NONE, dtype=np.int8)
+        for field in STOCK_VALUE_FIELDS:
+            setattr(self, field, np.zeros(shape, dtype=np.float64))
+        # Prices that were never set, like the buy price of a stock that was never bought, are NaN
+        self.buy_price.fill(np.nan)
+        self.sell_price.fill(np.nan)
+
+    def get_ticker_id(self, ticker: str) -> int:
+        """
+        Get the column of the ticker in the stock value arrays.
+
+        :param ticker: (str): The ticker of the stock
+        :return: (int): The ticker id
+
+        """
+        return self.ticker_ids[ticker]
+
+    def get_price_array(self, prices: dict[str, float]) -> np.ndarray:
+        """
+        Turn a dictionary of prices into an array in ticker id order. Tickers missing from the dictionary are NaN.
+
+        :param prices: (dict[str, float]): Dictionary of ticker to price
+        :return: (np.ndarray): The prices by ticker id
+
+        """
+        price_array = np.full(len(self.tickers), np.nan, dtype=np.float64)
+        for ticker, price in prices.items():
+            if ticker in self.ticker_ids:
+                price_array[self.ticker_ids[ticker]] = price
+        return price_array
+
+    @staticmethod
+    def from_accounts(accounts: list) -> 'PortfolioArrays':
+        """
+        Create the arrays from the current values of the accounts and their stocks.
+
+        :param accounts: (list[AccountLibrary]): The accounts, the account at index i is row i of the arrays
+        :return: (PortfolioArrays): The arrays with the values of every account
+
+        """
+        tickers = sorted({ticker for account in accounts for ticker in account.stocks})
+        portfolio = PortfolioArrays(tickers, len(accounts))
+        for account_id, account in enumerate(accounts):
+            portfolio.money[account_id] = account.money
+            for ticker, stock in account.stocks.items():
+                ticker_id = portfolio.ticker_ids[ticker]
+                portfolio.owned[account_id, ticker_id] = True
+                portfolio.trend[account_id, ticker_id] = TREND_UP if stock.trend == "UP" else \
+                    TREND_DOWN if stock.trend == "DOWN" else TREND_NONE
+                for field in STOCK_VALUE_FIELDS:
+                    value = getattr(stock, field)
+                    getattr(portfolio, field)[account_id, ticker_id] = np.nan if value is None else value
+
+        return portfolio
+
+    def write_to_accounts(self, accounts: list):
+        """
+        Write the values in the arrays back to the accounts and their stocks. Stocks bought through the arrays that the
+        account doesn't have yet are created with the account's stock factory.
+
+        :param accounts: (list[AccountLibrary]): The accounts, the same ones and order the arrays were created from
+
+        """
+        for account_id, account in enumerate(accounts):
+            account.money = float(self.money[account_id])
+            for ticker_id in np.flatnonzero(self.owned[account_id]).tolist():
+                ticker = self.tickers[ticker_id]
+                if ticker not in account.stocks:
+                    account.stocks[ticker] = account.stock_factory.create_stock(ticker)
+                stock = account.stocks[ticker]
+                stock.trend = TREND_NAMES[int(self.trend[account_id, ticker_id])]
+                for field in STOCK_VALUE_FIELDS:
+                    value = float(getattr(self, field)[account_id, ticker_id])
+                    setattr(stock, field, None if np.isnan(value) else value)
+
+    def update_stock_values_all(self, prices: np.ndarray):
+        """
+        Update the trends, highs, lows, and last prices of every owned stock of every account with the new prices,
+        the same as StockBaseClass.update_stock_values.
+
+        :param prices: (np.ndarray): The new price of each ticker, by ticker id
+
+        """
+        owned = self.owned
+        new_prices = np.broadcast_to(np.asarray(prices, dtype=np.float64), owned.shape)
+
+        np.copyto(self.last_last_price, self.last_price, where=owned)
+        np.copyto(self.last_price, new_prices, where=owned)
+        last_price = self.last_price
+
+        # Set trend
+        up = last_price >= self.last_last_price
+        np.copyto(self.trend, np.where(up, TREND_UP, TREND_DOWN).astype(np.int8), where=owned)
+
+        # Set last high/low, the same if/elif chain as the stocks
+        above_last_high = last_price > self.last_high
+        below_last_low = ~above_last_high & (last_price < self.last_low)
+        neither = ~above_last_high & ~below_last_low
+        np.copyto(self.last_high, last_price, where=owned & (above_last_high | (neither & up)))
+        np.copyto(self.last_low, last_price, where=owned & (below_last_low | (neither & ~up)))
+
+        # Daily peaks
+        above_daily_high = last_price > self.daily_high
+        np.copyto(self.daily_high, last_price, where=owned & above_daily_high)
+        np.copyto(self.daily_low, last_price, where=owned & ~above_daily_high & (self.daily_low > last_price))
+
+        # New peaks, track the high while holding and the low while not
+        holding = owned & (self.quantity > 0.0)
+        not_holding = owned & ~(self.quantity > 0.0)
+        np.copyto(self.new_high, last_price, where=holding & (last_price > self.new_high))
+        np.copyto(self.new_low, last_price, where=holding)
+        np.copyto(self.new_low, last_price, where=not_holding & (self.new_low > last_price))
+        np.copyto(self.new_high, last_price, where=not_holding)
+
+    def get_account_values(self) -> np.ndarray:
+        """
+        Get the total value of every account, the money plus the value of all its stocks at their last price.
+
+        :return: (np.ndarray): The value of each account, by account id
+
+        """
+        return self.money + np.sum(self.quantity * self.last_price, axis=1, where=self.owned)
+
+    def buy(self, account_ids: np.ndarray, ticker: str, dollar_amounts: np.ndarray, price: float):
+        """
+        Buy the stock in each of the accounts, the same as Transaction.buy with a dollar amount.
+
+        :param account_ids: (np.ndarray): The accounts to buy in
+        :param ticker: (str): The ticker of the stock
+        :param dollar_amounts: (np.ndarray): The dollar amount to buy in each account
+        :param price: (float): The price the stock is bought at
+
+        """
+        ticker_id = self.ticker_ids[ticker]
+        account_ids = np.asarray(account_ids)
+        dollar_amounts = np.broadcast_to(np.asarray(dollar_amounts, dtype=np.float64), account_ids.shape)
+        if np.any(dollar_amounts > self.money[account_ids]):
+            print(f"Error: Not enough money in some of the accounts to buy {ticker}")
+            raise AssertionError
+
+        stock_amounts = dollar_amounts / price
+        self.money[account_ids] -= dollar_amounts
+        owned = self.owned[account_ids, ticker_id]
+        new_ids = account_ids[~owned]
+        self.quantity[account_ids, ticker_id] = np.where(owned, self.quantity[account_ids, ticker_id] + stock_amounts,
+                                                         stock_amounts)
+        self.last_price[account_ids, ticker_id] = price
+        # A stock new to the account starts with the values of a newly created stock at the price, the same as
+        # Transaction.buy adding the new stock
+        for field in ('last_last_price', 'daily_high', 'daily_low', 'new_high', 'new_low', 'buy_price'):
+            getattr(self, field)[new_ids, ticker_id] = price
+        for field in ('last_high', 'last_low', 'all_time_peak'):
+            getattr(self, field)[new_ids, ticker_id] = 0.0
+        self.sell_price[new_ids, ticker_id] = np.nan
+        self.trend[new_ids, ticker_id] = TREND_NONE
+        self.owned[new_ids, ticker_id] = True
+
+    def sell(self, account_ids: np.ndarray, ticker: str, stock_amounts: np.ndarray, price: float):
+        """
+        Sell the stock in each of the accounts, the same as Transaction.sell with a stock amount.
+
+        :param account_ids: (np.ndarray): The accounts to sell in
+        :param ticker: (str): The ticker of the stock
+        :param stock_amounts: (np.ndarray): The number of stocks to sell in each account
+        :param price: (float): The price the stock is sold at
+
+        """
+        ticker_id = self.ticker_ids[ticker]
+        account_ids = np.asarray(account_ids)
+        stock_amounts = np.broadcast_to(np.asarray(stock_amounts, dtype=np.float64), account_ids.shape)
+        if not np.all(self.owned[account_ids, ticker_id]):
+            print(f"ERROR: Stock {ticker} is not owned in some of the accounts")
+            raise AssertionError
+        if np.any(self.quantity[account_ids, ticker_id] < stock_amounts):
+            print(f"ERROR: Not enough stock {ticker} to sell in some of the accounts")
+            raise AssertionError
+
+        self.money[account_ids] += stock_amounts * price
+        self.quantity[account_ids, ticker_id] -= stock_amounts
+        self.last_price[account_ids, ticker_id] = price
+        self.sell_price[account_ids, ticker_id] = price
+        self.new_low[account_ids, ticker_id] = price
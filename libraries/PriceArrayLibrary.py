@@ -0,0 +1,323 @@
+"""
+Author: Joel Yuhas
+Date: October 17th, 2026
+
+PriceArrayLibrary
+
+Converts the recorded stock values into plain numpy arrays so they can be ran against without re-parsing any text or
+querying any databases. Each ticker gets the following arrays saved next to each other:
+    {ticker}_timestamps.npy         : (int64)   Epoch seconds of each interval value, sorted oldest first
+    {ticker}_prices.npy             : (float64) The price at each timestamp
+    {ticker}_date_index.npy         : (int64)   One (day, offset) row per recorded day, the epoch seconds of the start
+                                                of the day and the offset of its first value in the arrays above
+    {ticker}_daily_timestamps.npy   : (int64)   Epoch seconds of the start of each recorded trading day
+    {ticker}_daily_ohlcv.npy        : (float64) One (open, high, low, close, volume) row per trading day
+
+The interval arrays are built from the developing database interval files and the monthly observer databases. The daily
+arrays are built from the developing database daily files and the downloaded {ticker}.us.txt history. Lines that can't
+be parsed, like the ERROR-1 lines, are reported once when the arrays are built and left out.
+
+Loading is done with a read only memory map, so only the parts that are used get read from disk and every process
+running against the same ticker shares the same pages.
+
+NOTE: The recorded timestamps have no timezone, they are the wall time of the machine that recorded them. The epoch
+      timestamps treat that wall time as if it were UTC, so converting back with UTC gives the recorded wall time.
+
+"""
+import datetime
+import sqlite3
+from pathlib import Path
+
+import numpy as np
+
+from libraries.helper_functions import DATABASE_PATH, OBSERVER_DATABASE_PATH, RETRO_DATABASE_PATH, \
+    DOWNLOADED_DATABASE_PATH
+
+# Timestamp formats of the recorded stock values
+INTERVAL_TIMESTAMP_FORMAT = "%Y-%m-%d-%H:%M:%S"
+OBSERVER_TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+DAILY_TIMESTAMP_FORMAT = "%Y-%m-%d"
+
+SECONDS_PER_DAY = 86400
+
+# Max number of example bad lines printed for each file when reporting them
+BAD_LINE_EXAMPLE_COUNT = 3
+
+
+def wall_time_to_epoch(timestamp: str, timestamp_format: str) -> int:
+    """
+    Convert a recorded wall time into epoch seconds, treating the wall time as UTC.
+
+    :param timestamp: (str): The recorded timestamp
+    :param timestamp_format: (str): The strptime format of the timestamp
+    :return: (int): The timestamp in epoch seconds
+
+    """
+    wall_time = datetime.datetime.strptime(timestamp, timestamp_format)
+    return int(wall_time.replace(tzinfo=datetime.timezone.utc).timestamp())
+
+
+def epoch_to_wall_time(epoch: int) -> datetime.datetime:
+    """
+    Convert epoch seconds from the price arrays back into the recorded wall time.
+
+    :param epoch: (int): The timestamp in epoch seconds
+    :return: (datetime): The recorded wall time, without a timezone
+
+    """
+    return datetime.datetime.fromtimestamp(int(epoch), datetime.timezone.utc).replace(tzinfo=None)
+
+
+def report_bad_lines(bad_lines: dict[Path, list[tuple[int, str]]]):
+    """
+    Print how many lines of each file couldn't be parsed, with a few examples.
+
+    :param bad_lines: (dict[Path, list[tuple[int, str]]]): The line number and text of each bad line, keyed by file
+
+    """
+    for file_name, lines in bad_lines.items():
+        examples = ", ".join(f"line {line_number}: {line!r}" for line_number, line in lines[:BAD_LINE_EXAMPLE_COUNT])
+        print(f"Skipped {len(lines)} bad lines in {file_name.name} ({examples})")
+
+
+class PriceArrayLibrary:
+    def __init__(self, array_path: Path = RETRO_DATABASE_PATH, database_path: Path = DATABASE_PATH,
+                 observer_database_path: Path = OBSERVER_DATABASE_PATH,
+                 downloaded_database_path: Path = DOWNLOADED_DATABASE_PATH):
+        self.array_path = array_path
+        self.database_path = database_path
+        self.observer_database_path = observer_database_path
+        self.downloaded_database_path = downloaded_database_path
+
+    def get_array_files(self, ticker: str) -> tuple[Path, Path]:
+        """
+        Get the timestamp and price array files of the ticker.
+
+        :param ticker: (str): The ticker of the stock
+        :return: (tuple[Path, Path]): The timestamp array file and price array file
+
+        """
+        return self.array_path / f"{ticker}_timestamps.npy", self.array_path / f"{ticker}_prices.npy"
+
+    def get_daily_array_files(self, ticker: str) -> tuple[Path, Path]:
+        """
+        Get the daily timestamp and daily open, high, low, close, volume array files of the ticker.
+
+        :param ticker: (str): The ticker of the stock
+        :return: (tuple[Path, Path]): The daily timestamp array file and daily ohlcv array file
+
+        """
+        return self.array_path / f"{ticker}_daily_timestamps.npy", self.array_path / f"{ticker}_daily_ohlcv.npy"
+
+    def get_date_index_file(self, ticker: str) -> Path:
+        """
+        Get the date to offset index file of the ticker.
+
+        :param ticker: (str): The ticker of the stock
+        :return: (Path): The date index array file
+
+        """
+        return self.array_path / f"{ticker}_date_index.npy"
+
+    def read_interval_files(self, ticker: str, bad_lines: dict = None) -> dict[int, float]:
+        """
+        Read the recorded values of the ticker from the developing database interval files. Lines with errors instead
+        of a price are skipped.
+
+        :param ticker: (str): The ticker of the stock
+        :param bad_lines: (dict): If given, the lines that couldn't be parsed are added to it, keyed by file
+        :return: (dict[int, float]): Dictionary of epoch timestamp to price
+
+        """
+        values = {}
+        for interval_file in sorted(self.database_path.glob(f"{ticker}_*interval.txt")):
+            with open(interval_file, "r") as file:
+                for line_number, line in enumerate(file, start=1):
+                    timestamp, _, price = line.strip().partition(",")
+                    try:
+                        values[wall_time_to_epoch(timestamp, INTERVAL_TIMESTAMP_FORMAT)] = float(price)
+                    except ValueError:
+                        if bad_lines is not None:
+                            bad_lines.setdefault(interval_file, []).append((line_number, line.strip()))
+
+        return values
+
+    def read_daily_files(self, ticker: str, bad_lines: dict = None) -> dict[int, tuple]:
+        """
+        Read the daily values of the ticker from the downloaded history and the developing database daily file. Where
+        both have the same day, the developing database value is used.
+
+        :param ticker: (str): The ticker of the stock
+        :param bad_lines: (dict): If given, the lines that couldn't be parsed are added to it, keyed by file
+        :return: (dict[int, tuple]): Dictionary of epoch timestamp of the day to (open, high, low, close, volume)
+
+        """
+        values = {}
+        daily_files = [self.downloaded_database_path / f"{ticker.lower()}.us.txt",
+                       self.database_path / f"{ticker}_daily.txt"]
+        for daily_file in daily_files:
+            if not daily_file.is_file():
+                continue
+            with open(daily_file, "r") as file:
+                for line_number, line in enumerate(file, start=1):
+                    # Downloaded files have a Date,Open,High,Low,Close,Volume,OpenInt header
+                    if line.startswith("Date"):
+                        continue
+                    fields = line.strip().split(",")
+                    try:
+                        if len(fields) < 6:
+                            raise ValueError
+                        day = wall_time_to_epoch(fields[0], DAILY_TIMESTAMP_FORMAT)
+                        values[day] = tuple(float(field) for field in fields[1:6])
+                    except ValueError:
+                        if bad_lines is not None:
+                            bad_lines.setdefault(daily_file, []).append((line_number, line.strip()))
+
+        return values
+
+    def read_observer_databases(self, ticker: str) -> dict[int, float]:
+        """
+        Read the recorded values of the ticker from the monthly observer databases.
+
+        :param ticker: (str): The ticker of the stock
+        :return: (dict[int, float]): Dictionary of epoch timestamp to price
+
+        """
+        values = {}
+        for observer_file in sorted(self.observer_database_path.glob(f"stocks_{ticker}_*.db")):
+            conn = sqlite3.connect(observer_file)
+            try:
+                rows = conn.execute("SELECT timestamp, price FROM stocks WHERE stock_ticker = ?", (ticker,)).fetchall()
+            except sqlite3.OperationalError:
+                rows = []
+            finally:
+                conn.close()
+
+            for timestamp, price in rows:
+                try:
+                    values[wall_time_to_epoch(timestamp, OBSERVER_TIMESTAMP_FORMAT)] = float(price)
+                except (TypeError, ValueError):
+                    continue
+
+        return values
+
+    def build_ticker(self, ticker: str) -> int:
+        """
+        Build all the arrays of the ticker from its recorded values. Where the interval files and observer databases
+        both have a value at the same time, the observer database value is used. Any lines that couldn't be parsed are
+        reported once here.
+
+        :param ticker: (str): The ticker of the stock
+        :return: (int): The number of interval values in the arrays
+
+        """
+        bad_lines = {}
+        values = self.read_interval_files(ticker, bad_lines)
+        values.update(self.read_observer_databases(ticker))
+        daily_values = self.read_daily_files(ticker, bad_lines)
+        report_bad_lines(bad_lines)
+
+        timestamps = np.array(sorted(values), dtype=np.int64)
+        prices = np.array([values[timestamp] for timestamp in timestamps.tolist()], dtype=np.float64)
+
+        # Values are sorted, so the first occurrence of each day is the offset the day starts at
+        days, day_offsets = np.unique(timestamps - (timestamps % SECONDS_PER_DAY), return_index=True)
+        date_index = np.stack((days, day_offsets.astype(np.int64)), axis=1) if len(days) else \
+            np.zeros((0, 2), dtype=np.int64)
+
+        daily_timestamps = np.array(sorted(daily_values), dtype=np.int64)
+        daily_ohlcv = np.array([daily_values[day] for day in daily_timestamps.tolist()], dtype=np.float64) \
+            .reshape(len(daily_timestamps), 5)
+
+        self.array_path.mkdir(parents=True, exist_ok=True)
+        timestamp_file, price_file = self.get_array_files(ticker)
+        daily_timestamp_file, daily_ohlcv_file = self.get_daily_array_files(ticker)
+        np.save(timestamp_file, timestamps)
+        np.save(price_file, prices)
+        np.save(self.get_date_index_file(ticker), date_index)
+        np.save(daily_timestamp_file, daily_timestamps)
+        np.save(daily_ohlcv_file, daily_ohlcv)
+        print(f"Built {len(timestamps)} {ticker} values over {len(days)} days and {len(daily_timestamps)} daily values "
+              f"into {self.array_path}")
+
+        return len(timestamps)
+
+    def is_built(self, ticker: str) -> bool:
+        """
+        Check if all the arrays of the ticker have been built.
+
+        :param ticker: (str): The ticker of the stock
+        :return: (bool): True if every array file exists
+
+        """
+        array_files = self.get_array_files(ticker) + self.get_daily_array_files(ticker) + \
+            (self.get_date_index_file(ticker),)
+        return all(array_file.is_file() for array_file in array_files)
+
+    def load_ticker(self, ticker: str, rebuild: bool = False) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Load the price arrays of the ticker as read only memory maps, building them first if they don't exist yet.
+
+        :param ticker: (str): The ticker of the stock
+        :param rebuild: (bool): If True, rebuild the arrays from the recorded values even if they already exist
+        :return: (tuple[np.ndarray, np.ndarray]): The int64 epoch timestamps and float64 prices
+
+        """
+        if rebuild or not self.is_built(ticker):
+            self.build_ticker(ticker)
+
+        timestamp_file, price_file = self.get_array_files(ticker)
+        return np.load(timestamp_file, mmap_mode='r'), np.load(price_file, mmap_mode='r')
+
+    def load_daily(self, ticker: str) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Load the daily arrays of the ticker as read only memory maps, building them first if they don't exist yet.
+
+        :param ticker: (str): The ticker of the stock
+        :return: (tuple[np.ndarray, np.ndarray]): The int64 epoch timestamps of each day and the float64 (open, high,
+                                                  low, close, volume) rows
+
+        """
+        if not self.is_built(ticker):
+            self.build_ticker(ticker)
+
+        daily_timestamp_file, daily_ohlcv_file = self.get_daily_array_files(ticker)
+        return np.load(daily_timestamp_file, mmap_mode='r'), np.load(daily_ohlcv_file, mmap_mode='r')
+
+    def load_date_index(self, ticker: str) -> np.ndarray:
+        """
+        Load the date to offset index of the ticker as a read only memory map, building it first if it doesn't exist.
+
+        :param ticker: (str): The ticker of the stock
+        :return: (np.ndarray): One (day, offset) row per recorded day
+
+        """
+        if not self.is_built(ticker):
+            self.build_ticker(ticker)
+
+        return np.load(self.get_date_index_file(ticker), mmap_mode='r')
+
+    def get_date_range_offsets(self, ticker: str, start_date: str = None, end_date: str = None) -> tuple[int, int]:
+        """
+        Get the offsets into the price arrays of the values from the start date up to but not including the end date,
+        using the date index.
+
+        :param ticker: (str): The ticker of the stock
+        :param start_date: (str): The first day in YYYY-MM-DD format, None to start at the first value
+        :param end_date: (str): The day to stop before in YYYY-MM-DD format, None to end at the last value
+        :return: (tuple[int, int]): The start and end offsets, prices[start:end] are the values in the range
+
+        """
+        date_index = self.load_date_index(ticker)
+        value_count = len(self.load_ticker(ticker)[0])
+        days, day_offsets = date_index[:, 0], date_index[:, 1]
+
+        offsets = []
+        for date, default_offset in ((start_date, 0), (end_date, value_count)):
+            if date is None:
+                offsets.append(default_offset)
+                continue
+            day_position = int(np.searchsorted(days, wall_time_to_epoch(date, DAILY_TIMESTAMP_FORMAT)))
+            offsets.append(int(day_offsets[day_position]) if day_position < len(days) else value_count)
+
+        return offsets[0], offsets[1]
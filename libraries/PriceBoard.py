@@ -0,0 +1,224 @@
+"""
+Author: Joel Yuhas
+Date: October 17th, 2026
+
+PriceBoard
+
+Small fixed layout, memory mapped file that the observer publishes the latest price of every ticker to. Programs can
+read the latest price straight out of memory instead of opening the observer's sqlite database on every update.
+
+The board has one writer (the observer) and any number of readers. Each ticker gets its own slot, and every slot is
+guarded by a sequence number (seqlock):
+- The writer makes the sequence odd, writes the slot, and then makes the sequence even again
+- A reader reads the sequence, the slot, and the sequence again. If the sequence was odd or changed between the two
+  reads, the writer was mid-write and the reader tries again
+
+Layout of the file:
+    header : magic (8 bytes), slot count (uint32), slot size (uint32)
+    slots  : sequence (uint64), ticker (16 bytes), price (float64), timestamp (float64 epoch seconds)
+
+"""
+import mmap
+import os
+import struct
+import time
+from pathlib import Path
+from typing import Optional
+
+BOARD_MAGIC = b"ASTROPB1"
+HEADER_FORMAT = "<8sII"
+# Longest ticker a slot can hold, in bytes once encoded
+MAX_TICKER_BYTES = 16
+SLOT_FORMAT = f"<Q{MAX_TICKER_BYTES}sdd"
+HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+SLOT_SIZE = struct.calcsize(SLOT_FORMAT)
+SEQUENCE_FORMAT = "<Q"
+
+# The default number of tickers the board can hold
+DEFAULT_SLOT_COUNT = 64
+
+# Number of times a reader will retry a slot the writer is in the middle of updating before giving up
+READ_RETRY_LIMIT = 100
+
+
+class PriceBoard:
+    def __init__(self, board_file: Path, writer: bool = False, slot_count: int = DEFAULT_SLOT_COUNT):
+        self.board_file = board_file
+        self.writer = writer
+        self.slot_count = slot_count
+        self.board = None
+        # Cache of ticker to slot index. Slots are only ever claimed by the writer and never move, so once a ticker is
+        # found it will stay in the same slot.
+        self.slot_index = {}
+
+        if self.writer:
+            self._open_writer()
+
+    def __enter__(self) -> 'PriceBoard':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _open_writer(self):
+        """
+        Open the board file for writing, creating and initializing it if it doesn't exist or doesn't match the expected
+        layout. An existing board with a matching layout is reused in place so readers that already have it mapped
+        keep working.
+
+        """
+        board_size = HEADER_SIZE + (self.slot_count * SLOT_SIZE)
+        self.board_file.parent.mkdir(parents=True, exist_ok=True)
+
+        expected_header = struct.pack(HEADER_FORMAT, BOARD_MAGIC, self.slot_count, SLOT_SIZE)
+        self.board_file.touch(exist_ok=True)
+        with open(self.board_file, "r+b") as file:
+            header = file.read(HEADER_SIZE)
+            if header != expected_header or os.path.getsize(self.board_file) != board_size:
+                print("Initializing price board")
+                # Only shrink the file if the size is wrong, readers still mapping a board of the same size would fault
+                # if the file was truncated underneath them. Readers of a different sized board need a restart.
+                if os.path.getsize(self.board_file) != board_size:
+                    file.truncate(0)
+                file.seek(0)
+                file.write(expected_header)
+                file.write(bytes(self.slot_count * SLOT_SIZE))
+                file.flush()
+
+            self.board = mmap.mmap(file.fileno(), board_size)
+
+        # Pick up any tickers that already have slots from a previous run
+        for index in range(self.slot_count):
+            ticker = self._read_slot_ticker(index)
+            if ticker:
+                self.slot_index[ticker] = index
+
+    def _open_reader(self) -> bool:
+        """
+        Map the board file for reading, if the observer has created it.
+
+        :return: (bool): True if the board is mapped and ready to read from
+
+        """
+        if self.board is not None:
+            return True
+
+        try:
+            with open(self.board_file, "rb") as file:
+                header = file.read(HEADER_SIZE)
+                if len(header) < HEADER_SIZE:
+                    return False
+                magic, slot_count, slot_size = struct.unpack(HEADER_FORMAT, header)
+                if magic != BOARD_MAGIC or slot_size != SLOT_SIZE:
+                    print("Price board file has unexpected layout, ignoring it")
+                    return False
+                self.slot_count = slot_count
+                self.board = mmap.mmap(file.fileno(), HEADER_SIZE + (slot_count * SLOT_SIZE), access=mmap.ACCESS_READ)
+        except (FileNotFoundError, ValueError, OSError):
+            return False
+
+        return True
+
+    def close(self):
+        """
+        Unmap the board. The board file itself is left in place for any other readers.
+
+        """
+        if self.board is not None:
+            self.board.close()
+            self.board = None
+        self.slot_index = {}
+
+    @staticmethod
+    def _slot_offset(index: int) -> int:
+        return HEADER_SIZE + (index * SLOT_SIZE)
+
+    def _read_slot_ticker(self, index: int) -> str:
+        ticker_bytes = struct.unpack_from(SLOT_FORMAT, self.board, self._slot_offset(index))[1]
+        return ticker_bytes.rstrip(b"\0").decode()
+
+    def _find_slot(self, ticker: str) -> Optional[int]:
+        """
+        Find the slot of the ticker, scanning the board if it isn't cached yet.
+
+        :param ticker: (str): The ticker of the stock
+        :return: (int): The slot index, None if the ticker has no slot
+
+        """
+        if ticker in self.slot_index:
+            return self.slot_index[ticker]
+
+        for index in range(self.slot_count):
+            slot_ticker = self._read_slot_ticker(index)
+            if slot_ticker == ticker:
+                self.slot_index[ticker] = index
+                return index
+            # Slots are claimed in order, so the first empty one means the ticker isn't on the board
+            if not slot_ticker:
+                return None
+
+        return None
+
+    def publish(self, ticker: str, price: float, timestamp: float):
+        """
+        Publish the latest price of the ticker to the board. Only the writer can publish.
+
+        :param ticker: (str): The ticker of the stock
+        :param price: (float): The latest price of the stock
+        :param timestamp: (float): The time of the price in epoch seconds
+
+        """
+        if not self.writer:
+            raise ValueError("Price board was opened as a reader, cannot publish")
+        # struct cuts longer tickers down to fit the slot, which would publish them under a different ticker
+        if len(ticker.encode()) > MAX_TICKER_BYTES:
+            raise ValueError(f"Ticker {ticker} is longer than the {MAX_TICKER_BYTES} bytes a price board slot holds")
+
+        index = self._find_slot(ticker)
+        if index is None:
+            index = len(self.slot_index)
+            if index >= self.slot_count:
+                raise ValueError(f"Price board is full, no slot left for {ticker}")
+            self.slot_index[ticker] = index
+
+        offset = self._slot_offset(index)
+        sequence = struct.unpack_from(SEQUENCE_FORMAT, self.board, offset)[0]
+
+        # Odd sequence marks the slot as being written, even again once the write is done
+        struct.pack_into(SEQUENCE_FORMAT, self.board, offset, sequence + 1)
+        struct.pack_into(SLOT_FORMAT, self.board, offset, sequence + 1, ticker.encode(), price, timestamp)
+        struct.pack_into(SEQUENCE_FORMAT, self.board, offset, sequence + 2)
+
+    def read(self, ticker: str) -> Optional[tuple[float, float, int]]:
+        """
+        Read the latest price of the ticker from the board using the seqlock check.
+
+        :param ticker: (str): The ticker of the stock
+        :return: (tuple[float, float, int]): The price, epoch timestamp, and sequence number of the update. None if
+                                             the board or ticker isn't available.
+
+        """
+        if not self.writer and not self._open_reader():
+            return None
+
+        index = self._find_slot(ticker)
+        if index is None:
+            return None
+
+        offset = self._slot_offset(index)
+        for _ in range(READ_RETRY_LIMIT):
+            sequence_before = struct.unpack_from(SEQUENCE_FORMAT, self.board, offset)[0]
+            if sequence_before % 2 == 0:
+                _, _, price, timestamp = struct.unpack_from(SLOT_FORMAT, self.board, offset)
+                sequence_after = struct.unpack_from(SEQUENCE_FORMAT, self.board, offset)[0]
+                if sequence_before == sequence_after:
+                    # Never published to yet
+                    if sequence_before == 0:
+                        return None
+                    return price, timestamp, sequence_before // 2
+
+            # Writer is mid-update, give it a chance to finish before trying again
+            time.sleep(0)
+
+        print(f"Could not get a consistent read of {ticker} from the price board")
+        return None
@@ -0,0 +1,211 @@
+"""
+Author: Joel Yuhas
+Date: October 17th, 2026
+
+PriceHistory
+
+Bounded history of the most recent prices of a stock, kept in a fixed size numpy ring buffer, along with a set of
+rolling indicators over the same window that are updated as each price is added:
+- SMA and rolling standard deviation, from a running sum and sum of squares
+- EMA
+- Rolling min and max, from monotonic deques of (tick number, price)
+- VWAP, from a running sum of price * volume and volume, when the prices come with a volume
+
+Adding a price and reading any of the indicators are constant time no matter the window size, so a strategy can use
+them on every tick without going back to the database. The running sums are recomputed from the buffer once every
+window of prices so float error can't build up, which is still constant time per price on average.
+
+"""
+from collections import deque
+from typing import Optional
+
+import numpy as np
+
+# Default number of prices kept, about a trading day of observer ticks at one a minute
+DEFAULT_WINDOW_SIZE = 390
+
+# Default number of prices the EMA is smoothed over
+DEFAULT_EMA_SPAN = 20
+
+
+class PriceHistory:
+    def __init__(self, window_size: int = DEFAULT_WINDOW_SIZE, ema_span: int = DEFAULT_EMA_SPAN):
+        if window_size < 1:
+            raise ValueError("window_size must be at least 1")
+        self.window_size = window_size
+        self.ema_alpha = 2 / (ema_span + 1)
+
+        self.prices = np.zeros(window_size, dtype=np.float64)
+        self.volumes = np.zeros(window_size, dtype=np.float64)
+        # Total number of prices ever added, the next price goes at tick_count % window_size
+        self.tick_count = 0
+
+        self.price_sum = 0.0
+        self.price_square_sum = 0.0
+        self.price_volume_sum = 0.0
+        self.volume_sum = 0.0
+        self.ema: Optional[float] = None
+        # (tick number, price) pairs, prices only increasing for the min deque and decreasing for the max deque
+        self.min_deque: deque[tuple[int, float]] = deque()
+        self.max_deque: deque[tuple[int, float]] = deque()
+
+    def __len__(self) -> int:
+        return min(self.tick_count, self.window_size)
+
+    def append(self, price: float, volume: float = None):
+        """
+        Add the newest price and update the indicators.
+
+        :param price: (float): The price
+        :param volume: (float): The volume traded at the price, if known. VWAP only counts prices with a volume
+
+        """
+        price = float(price)
+        volume = 0.0 if volume is None else float(volume)
+        position = self.tick_count % self.window_size
+
+        # Take out the price falling out of the window
+        if self.tick_count >= self.window_size:
+            old_price = self.prices[position]
+            old_volume = self.volumes[position]
+            self.price_sum -= old_price
+            self.price_square_sum -= old_price * old_price
+            self.price_volume_sum -= old_price * old_volume
+            self.volume_sum -= old_volume
+
+        self.prices[position] = price
+        self.volumes[position] = volume
+        self.price_sum += price
+        self.price_square_sum += price * price
+        self.price_volume_sum += price * volume
+        self.volume_sum += volume
+        self.ema = price if self.ema is None else self.ema + self.ema_alpha * (price - self.ema)
+
+        oldest_tick = self.tick_count - self.window_size + 1
+        while self.min_deque and self.min_deque[-1][1] >= price:
+            self.min_deque.pop()
+        self.min_deque.append((self.tick_count, price))
+        if self.min_deque[0][0] < oldest_tick:
+            self.min_deque.popleft()
+        while self.max_deque and self.max_deque[-1][1] <= price:
+            self.max_deque.pop()
+        self.max_deque.append((self.tick_count, price))
+        if self.max_deque[0][0] < oldest_tick:
+            self.max_deque.popleft()
+
+        self.tick_count += 1
+        if self.tick_count % self.window_size == 0:
+            self.recompute_sums()
+
+    def extend(self, prices, volumes=None):
+        """
+        Add several prices, oldest first. Used to warm start the history from recorded prices.
+
+        :param prices: The prices, oldest first
+        :param volumes: The volume of each price, if known
+
+        """
+        if volumes is None:
+            for price in prices:
+                self.append(price)
+        else:
+            for price, volume in zip(prices, volumes):
+                self.append(price, volume)
+
+    def recompute_sums(self):
+        """
+        Recompute the running sums from the prices in the buffer, clearing any float error that built up.
+
+        """
+        prices = self.prices[:len(self)]
+        volumes = self.volumes[:len(self)]
+        self.price_sum = float(np.sum(prices))
+        self.price_square_sum = float(np.dot(prices, prices))
+        self.price_volume_sum = float(np.dot(prices, volumes))
+        self.volume_sum = float(np.sum(volumes))
+
+    def get_prices(self) -> np.ndarray:
+        """
+        Get a copy of the prices in the window, oldest first.
+
+        :return: (np.ndarray): The prices
+
+        """
+        if self.tick_count <= self.window_size:
+            return self.prices[:self.tick_count].copy()
+
+        position = self.tick_count % self.window_size
+        return np.concatenate((self.prices[position:], self.prices[:position]))
+
+    def get_last_price(self) -> Optional[float]:
+        """
+        Get the newest price.
+
+        :return: (float): The newest price, None if there are no prices yet
+
+        """
+        if self.tick_count == 0:
+            return None
+        return float(self.prices[(self.tick_count - 1) % self.window_size])
+
+    def get_sma(self) -> Optional[float]:
+        """
+        Get the simple moving average of the prices in the window.
+
+        :return: (float): The average, None if there are no prices yet
+
+        """
+        if self.tick_count == 0:
+            return None
+        return self.price_sum / len(self)
+
+    def get_ema(self) -> Optional[float]:
+        """
+        Get the exponential moving average of every price added.
+
+        :return: (float): The EMA, None if there are no prices yet
+
+        """
+        return self.ema
+
+    def get_stddev(self) -> Optional[float]:
+        """
+        Get the population standard deviation of the prices in the window.
+
+        :return: (float): The standard deviation, None if there are no prices yet
+
+        """
+        if self.tick_count == 0:
+            return None
+        mean = self.price_sum / len(self)
+        # Float error can leave the variance a hair below 0 when all the prices are the same
+        return max(self.price_square_sum / len(self) - mean * mean, 0.0) ** 0.5
+
+    def get_min(self) -> Optional[float]:
+        """
+        Get the lowest price in the window.
+
+        :return: (float): The lowest price, None if there are no prices yet
+
+        """
+        return self.min_deque[0][1] if self.min_deque else None
+
+    def get_max(self) -> Optional[float]:
+        """
+        Get the highest price in the window.
+
+        :return: (float): The highest price, None if there are no prices yet
+
+        """
+        return self.max_deque[0][1] if self.max_deque else None
+
+    def get_vwap(self) -> Optional[float]:
+        """
+        Get the volume weighted average price of the prices in the window.
+
+        :return: (float): The VWAP, None if none of the prices in the window have a volume
+
+        """
+        if self.volume_sum <= 0:
+            return None
+        return self.price_volume_sum / self.volume_sum
@@ -0,0 +1,74 @@
+"""
+Author: Joel Yuhas
+Date: October 17th, 2026
+
+Class Quote:
+
+A price of a stock along with where it came from, so an order can be filled at the same price the algorithm made its
+decision on instead of getting the price again.
+
+        self.ticker                 : (str)     Ticker of the stock
+        self.price                  : (float)   The price
+        self.timestamp              : (float)   Epoch timestamp of the price from its source, the time it was gotten if
+                                                the source doesn't have one
+        self.sequence               : (int)     Sequence number of the price from its source, like the price board
+                                                update or the retro cursor. None if the source doesn't have one
+        self.received_at            : (float)   time.monotonic() of when the quote was gotten, used to tell how stale
+                                                it is. Moved back to the source timestamp for live sources
+
+NOTE: How stale a quote is, is measured from when it was gotten and not from its source timestamp, so retro runs, where
+      the source timestamps are from the recording, reuse their quotes the same as live runs. Quotes of live sources,
+      like the price board and the observer databases, are made with from_live_source so a price the source last
+      updated a while ago is already that old
+
+"""
+import time
+
+# Quotes older than this are gotten again before filling an order. The stocks are updated every 60 seconds
+DEFAULT_MAX_QUOTE_AGE_SECONDS = 90.0
+
+
+class Quote:
+    __slots__ = ('ticker', 'price', 'timestamp', 'sequence', 'received_at')
+
+    def __init__(self, ticker: str, price: float, timestamp: float = None, sequence: int = None):
+        self.ticker = ticker
+        self.price = float(price)
+        self.timestamp = timestamp if timestamp is not None else time.time()
+        self.sequence = sequence
+        self.received_at = time.monotonic()
+
+    @classmethod
+    def from_live_source(cls, ticker: str, price: float, timestamp: float, sequence: int = None) -> 'Quote':
+        """
+        Make a quote of a live source's price, as old as the source timestamp instead of new when it is gotten.
+
+        :param ticker: (str): Ticker of the stock
+        :param price: (float): The price
+        :param timestamp: (float): Epoch timestamp of the price from its source
+        :param sequence: (int): Sequence number of the price from its source, None if the source doesn't have one
+        :return: (Quote): The quote
+
+        """
+        quote = cls(ticker, price, timestamp=timestamp, sequence=sequence)
+        quote.received_at = quote.received_at - max(0.0, time.time() - quote.timestamp)
+        return quote
+
+    def get_age(self) -> float:
+        """
+        Get how long ago the quote was gotten.
+
+        :return: (float): The age of the quote in seconds
+
+        """
+        return time.monotonic() - self.received_at
+
+    def is_stale(self, max_age_seconds: float = DEFAULT_MAX_QUOTE_AGE_SECONDS) -> bool:
+        """
+        Check if the quote is too old to fill an order at.
+
+        :param max_age_seconds: (float): The oldest a quote can be and still be used
+        :return: (bool): True if the quote is older than max_age_seconds
+
+        """
+        return self.get_age() > max_age_seconds
@@ -10,11 +10,21 @@ and what methods are needed.
 
 """
 from abc import ABC, abstractmethod
+from collections import deque
 from pathlib import Path
+from typing import Optional, Union
 from libraries.helper_functions import Colors
+from libraries.PriceHistory import PriceHistory, DEFAULT_WINDOW_SIZE
+from libraries.Quote import Quote
 
 
 class StockBaseClass(ABC):
+    # Fixed set of attributes, so each stock doesn't carry its own attribute dictionary. Subclasses add none of their
+    # own and set __slots__ = () to keep it that way
+    __slots__ = ('name', 'quantity', 'buy_price', 'sell_price', 'all_time_peak', 'last_high', 'last_low', 'trend',
+                 'last_price', 'transaction_file', 'account_file', 'new_high', 'new_low', 'stock_file_name',
+                 'daily_high', 'daily_low', 'last_last_price', 'warm_price_history', 'unwarmed_prices', 'last_quote')
+
     def __init__(self, name: str = None, quantity: float = 0.0, buy_price: float = None, sell_price: float = None,
                  last_high: float = 0.0, last_low: float = 0.0, all_time_peak: float = 0, trend: str = None,
                  last_price: str = None, transaction_file: Path = None, account_file: Path = None,
@@ -27,7 +37,10 @@ class StockBaseClass(ABC):
         self.last_high = last_high  # most recent high
         self.last_low = last_low  # most recent low
         self.trend = trend
-        self.last_price = last_price or self.get_current_price(self.name)
+        # Quote of the last price, so an order right after an update fills at it without getting the price again. A
+        # saved last price has no quote, it was gotten too long ago to fill at
+        self.last_quote = None if last_price else self.get_current_quote(self.name)
+        self.last_price = last_price or self.last_quote.price
         self.transaction_file = transaction_file
         self.account_file = account_file
         self.new_high = new_high or self.last_price  # new nigh after a buy, if no buy then last price
@@ -41,8 +54,31 @@ class StockBaseClass(ABC):
         self.daily_low = self.last_price  # lowest point of that day
 
         self.last_last_price = self.last_price  # last know price before the last price
-        # TODO: Potentially update the prices to just be a list so that multiple variables dont need to keep beign added and have
-        #  alot more informaiton
+
+        # Most recent prices and the rolling indicators over them. Only made the first time price_history is used,
+        # since warm starting it reads the recorded prices, so until then the updated prices are kept on their own
+        self.warm_price_history: Optional[PriceHistory] = None
+        self.unwarmed_prices = deque([self.last_price], maxlen=DEFAULT_WINDOW_SIZE)
+
+    @property
+    def price_history(self) -> PriceHistory:
+        """
+        Most recent prices of the stock and the rolling indicators over them. The first time it is used, it is warm
+        started from the recorded prices if the stock type has them, otherwise from the prices of the updates so far.
+
+        :return: (PriceHistory): The price history
+
+        """
+        if self.warm_price_history is None:
+            price_history = PriceHistory(DEFAULT_WINDOW_SIZE)
+            recorded_prices = self.get_recorded_prices(self.name, DEFAULT_WINDOW_SIZE)
+            # The recorded prices already have the prices the stock was updated with
+            price_history.extend(recorded_prices if len(recorded_prices) else list(self.unwarmed_prices))
+            if price_history.get_last_price() != self.last_price:
+                price_history.append(self.last_price)
+            self.warm_price_history = price_history
+            self.unwarmed_prices = None
+        return self.warm_price_history
 
     @staticmethod
     @abstractmethod
@@ -59,6 +95,44 @@ class StockBaseClass(ABC):
     def dict_to_stock(stock_dict: dict) -> 'StockBaseClass':
         pass
 
+    @classmethod
+    def get_current_prices(cls, tickers: list[str]) -> dict[str, Quote]:
+        """
+        Get the current price of every ticker at once, as quotes that keep the timestamp and sequence number of their
+        source. Stock types that can get them in one call or query override this, otherwise each quote is gotten on its
+        own.
+
+        :param tickers: (list[str]): The tickers of the stocks
+        :return: (dict[str, Quote]): Dictionary of ticker to quote of the current price
+
+        """
+        return {ticker: cls.get_current_quote(ticker) for ticker in tickers}
+
+    @classmethod
+    def get_current_quote(cls, ticker: str) -> Quote:
+        """
+        Get the current price as a quote. Stock types whose source has a timestamp and sequence number for its prices
+        override this to keep them, otherwise the quote is timestamped when it is gotten.
+
+        :param ticker: (str): The name of the stock ticker
+        :return: (Quote): The quote of the latest price
+
+        """
+        return Quote(ticker, cls.get_current_price(ticker))
+
+    @staticmethod
+    def get_recorded_prices(ticker: str, count: int) -> list[float]:
+        """
+        Get the most recent recorded prices of the stock, used to warm start the price history. Stock types without
+        recorded prices start with an empty history.
+
+        :param ticker: (str): The name of the stock ticker
+        :param count: (int): The max number of prices to get
+        :return: (list[float]): The prices, oldest first
+
+        """
+        return []
+
     @staticmethod
     def stock_to_dict(stock) -> dict:
         """
@@ -122,20 +196,37 @@ class StockBaseClass(ABC):
         """
         return self.quantity * self.last_price
 
-    def update_stock_values(self):
+    def update_stock_values(self, price: Union[Quote, float] = None):
         """
         Update all peaks, trends, valleys, and last price with only one API call.
 
+        The price can be given when it was already gotten along with the prices of other stocks, so the update doesn't
+        need a call of its own. A quote keeps the timestamp and sequence number of its source, a bare price is turned
+        into a quote timestamped now.
+
         NOTE: May want to break up into separate functions like before if we find we need the other functions separate.
               Kept it this way so that only 1 latest price call needs to be made**
 
         Method will most likely update as more information is added
 
+        :param price: (Quote|float): The current quote or price of the stock, if None it is gotten with
+                                     get_current_quote
+
         """
 
         # Note, may update this so that it is a list of all previous prices so we dont need creeping values like this
         self.last_last_price = self.last_price
-        self.last_price = self.get_current_price(self.name)
+        if price is None:
+            self.last_quote = self.get_current_quote(self.name)
+        elif isinstance(price, Quote):
+            self.last_quote = price
+        else:
+            self.last_quote = Quote(self.name, price)
+        self.last_price = self.last_quote.price
+        if self.warm_price_history is None:
+            self.unwarmed_prices.append(self.last_price)
+        else:
+            self.warm_price_history.append(self.last_price)
 
         # Set trend
         # ------------------
@@ -11,37 +11,66 @@ stock class can be dynamically made to one of the subclasses.
 """
 from typing import Union
 
-from libraries.StockSubClasses import StockObserver, StockDirect
+from libraries.Quote import Quote
+from libraries.StockSubClasses import StockObserver, StockDirect, StockBoard, StockRetro
 
 
 class StockFactory:
     def __init__(self, stock_type):
         self.stock_type = stock_type
 
-    def create_stock(self, ticker: str) -> Union[StockObserver, StockDirect]:
+    def create_stock(self, ticker: str) -> Union[StockObserver, StockDirect, StockBoard, StockRetro]:
         """
-        Create the stock class based on its ticker. Currently, it can either be the StockObserver or StockDirect type.
+        Create the stock class based on its ticker. Currently, it can either be the StockObserver, StockDirect,
+        StockBoard, or StockRetro type.
 
         Stock type is set as variable of the StockFactory class
 
         :param ticker: (str): Ticker of the stock class
-        :return:(StockObserver or StockDirect): Returns the desired stock class, currently just between Observer and
-                                                direct
+        :return:(StockObserver, StockDirect, StockBoard, or StockRetro): Returns the desired stock class
 
         """
         if self.stock_type == "direct":
             return StockDirect(name=ticker)
         if self.stock_type == "observer":
             return StockObserver(name=ticker)
+        if self.stock_type == "board":
+            return StockBoard(name=ticker)
+        if self.stock_type == "retro":
+            return StockRetro(name=ticker)
         else:
             raise ValueError("Invalid Stock Type")
 
-    def dict_to_stock(self, stock_dict: dict) -> Union[StockObserver, StockDirect]:
+    def get_stock_class(self) -> type:
+        """
+        Get the stock class the factory creates.
+
+        :return: (type): StockObserver, StockDirect, StockBoard, or StockRetro
+
+        """
+        stock_classes = {"direct": StockDirect, "observer": StockObserver, "board": StockBoard, "retro": StockRetro}
+        if self.stock_type not in stock_classes:
+            raise ValueError("Invalid Stock Type")
+
+        return stock_classes[self.stock_type]
+
+    def get_current_prices(self, tickers: list[str]) -> dict[str, Quote]:
+        """
+        Get the current price of every ticker at once, the way the factory's stock type gets them.
+
+        :param tickers: (list[str]): The tickers of the stocks
+        :return: (dict[str, Quote]): Dictionary of ticker to quote of the current price, from its source
+
+        """
+        return self.get_stock_class().get_current_prices(tickers)
+
+    def dict_to_stock(self, stock_dict: dict) -> Union[StockObserver, StockDirect, StockBoard, StockRetro]:
         """
         Turn the dictionary item that contains the stock information into a Stock object.
 
         :param stock_dict: (dict): The dictionary to be turned to stock object
-        :return:(StockObserver or StockDirect): Return the specified stock based on the provided values in the class
+        :return:(StockObserver, StockDirect, StockBoard, or StockRetro): Return the specified stock based on the
+                                                                          provided values in the class
 
         """
         name = stock_dict['name']
@@ -88,6 +117,36 @@ class StockFactory:
                                  new_high=new_high,
                                  new_low=new_low)
 
+        if self.stock_type == "board":
+            return StockBoard(name=name,
+                              quantity=quantity,
+                              buy_price=buy_price,
+                              sell_price=sell_price,
+                              all_time_peak=all_time_peak,
+                              last_high=last_high,
+                              last_low=last_low,
+                              trend=trend,
+                              last_price=last_price,
+                              transaction_file=transaction_file,
+                              account_file=account_file,
+                              new_high=new_high,
+                              new_low=new_low)
+
+        if self.stock_type == "retro":
+            return StockRetro(name=name,
+                              quantity=quantity,
+                              buy_price=buy_price,
+                              sell_price=sell_price,
+                              all_time_peak=all_time_peak,
+                              last_high=last_high,
+                              last_low=last_low,
+                              trend=trend,
+                              last_price=last_price,
+                              transaction_file=transaction_file,
+                              account_file=account_file,
+                              new_high=new_high,
+                              new_low=new_low)
+
         else:
             raise ValueError("Invalid Stock Type")
 
@@ -9,7 +9,9 @@ stock.
 
 - Observer stocks, get their stock values from the observer patter class
 - Direct stocks, get their stock values directly from yfinance
-- Retro stocks (planned), get their stock values from already saved data so it can be ran against existing data sets
+- Board stocks, get their stock values from the observer's shared memory price board, falling back to the observer
+  database
+- Retro stocks, get their stock values from already saved data so it can be ran against existing data sets
 
 
 Specific information includes but not limited to:
@@ -27,24 +29,51 @@ NOTE: Transaction and account file are used ot save transaction and account data
 
 """
 
-import yfinance as yf
+import datetime
 import sqlite3
-import time
 from pathlib import Path
+from typing import Optional
 
-from libraries.helper_functions import OBSERVER_DATABASE_PATH
+import numpy as np
+
+from libraries.helper_functions import PRICE_BOARD_PATH
+from libraries.ObserverPartitionManager import ObserverPartitionManager
+from libraries.ObserverQueryLibrary import ObserverQueryLibrary
+from libraries.MarketDataProvider import MarketDataError, get_market_data_provider
 from libraries.StockBaseClass import StockBaseClass
+from libraries.PriceBoard import PriceBoard
+from libraries.Quote import Quote
+from libraries.TickStore import TickStore
+from libraries.PriceArrayLibrary import PriceArrayLibrary
 
 # The index where the price is listed in the database.
 PRICE_INDEX = 2
 
+# The index where the timestamp is listed in the database.
+TIMESTAMP_INDEX = 0
+
+# Time in seconds a reader will wait on the observer's write lock before giving up
+READER_BUSY_TIMEOUT_SECONDS = 5.0
+
+# Ticks older than this are checked against the latest row of the monthly database, in case the observer's writes to
+# the tick store stopped while it kept writing the monthly database
+MAX_TICK_AGE_SECONDS = 60
+
+# Format of the observer's timestamps
+OBSERVER_TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
 class StockObserver(StockBaseClass):
     """
     Stock observer
     This variation of the stock class is compatible with the observer class and gets its values from there
 
     """
+    # One reader of the tick store shared by all observer stocks in the process
+    tick_store = TickStore()
+    # Works out which monthly observer databases to read from
+    partition_manager = ObserverPartitionManager()
 
+    __slots__ = ()
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -58,38 +87,189 @@ class StockObserver(StockBaseClass):
         :return: (Path): The Path of the current filename for the stock.
 
         """
-        # Get the current year and month
-        current_time = time.localtime()
-        year = str(current_time.tm_year)
-        month = str(current_time.tm_mon).zfill(2)
-
-        return OBSERVER_DATABASE_PATH / f'stocks_{ticker}_{year}_{month}.db'
+        partition_manager = StockObserver.partition_manager
+        return partition_manager.get_partition_file(ticker, partition_manager.get_partition_key(datetime.datetime.now()))
 
     @staticmethod
     def get_current_price(ticker: str) -> float:
         """
         Get the current price from the database of the corresponding stock ticker.
 
+        The newest tick in the tick store is used when the observer is writing to one. Otherwise, reads the single row
+        the observer keeps for the ticker in the monthly database's latest table. Databases that have not been upgraded
+        yet fall back to the newest row of the stocks table.
+
+        A tick older than MAX_TICK_AGE_SECONDS is checked against the monthly database, and whichever is newer is used,
+        so a tick store the observer stopped writing to doesn't leave the price stuck.
+
+        Right after the month rolls over, the current month's database may not have a price yet, so the previous
+        month's database is read instead.
+
         :param ticker: (str): The name of the stock ticker
         :return: (float): The latest price as a float
 
         """
-        # Connect to the database file
+        return StockObserver.get_current_quote(ticker).price
+
+    @staticmethod
+    def get_current_quote(ticker: str) -> Quote:
+        """
+        Get the current price the same as get_current_price, as a quote with the timestamp the observer recorded it at.
+
+        :param ticker: (str): The name of the stock ticker
+        :return: (Quote): The quote of the latest price
+
+        """
         try:
-            conn = sqlite3.connect(StockObserver.get_current_file_name(ticker))
-            c = conn.cursor()
+            latest_tick = StockObserver.tick_store.get_latest_tick(ticker)
+        except sqlite3.Error as e:
+            print(f"Issue reading the tick store: {e}")
+            StockObserver.tick_store.close_all_connections()
+            latest_tick = None
 
-            # Get the latest stock information
-            c.execute("SELECT * FROM stocks ORDER BY timestamp DESC LIMIT 1")
-            latest_stock_info = c.fetchone()
-            conn.close()
+        return StockObserver.get_newest_quote(ticker, latest_tick)
+
+    @staticmethod
+    def get_current_prices(tickers: list[str]) -> dict[str, Quote]:
+        """
+        Get the current price of every ticker at once. The newest ticks in the tick store are read with a single query,
+        only the tickers the tick store doesn't have a recent tick for are read from their monthly databases.
+
+        :param tickers: (list[str]): The names of the stock tickers
+        :return: (dict[str, Quote]): Dictionary of ticker to quote of the latest price, with the observer's timestamp
+
+        """
+        try:
+            latest_ticks = StockObserver.tick_store.get_latest_ticks(tickers)
+        except sqlite3.Error as e:
+            print(f"Issue reading the tick store: {e}")
+            StockObserver.tick_store.close_all_connections()
+            latest_ticks = {}
+
+        return {ticker: StockObserver.get_newest_quote(ticker, latest_ticks.get(ticker)) for ticker in tickers}
+
+    @staticmethod
+    def get_timestamp_epoch(timestamp: str) -> Optional[float]:
+        """
+        Turn an observer timestamp, in local time, into epoch seconds.
+
+        :param timestamp: (str): The observer timestamp
+        :return: (float): The epoch seconds, None if the timestamp can't be read
+
+        """
+        try:
+            return datetime.datetime.strptime(timestamp, OBSERVER_TIMESTAMP_FORMAT).timestamp()
+        except (TypeError, ValueError):
+            return None
+
+    @staticmethod
+    def is_tick_recent(timestamp: str) -> bool:
+        """
+        Check if a tick is new enough to use without checking the monthly database.
+
+        :param timestamp: (str): The observer timestamp of the tick
+        :return: (bool): True if the tick is younger than MAX_TICK_AGE_SECONDS
+
+        """
+        tick_epoch = StockObserver.get_timestamp_epoch(timestamp)
+        return tick_epoch is not None and datetime.datetime.now().timestamp() - tick_epoch <= MAX_TICK_AGE_SECONDS
+
+    @staticmethod
+    def row_to_quote(ticker: str, row: tuple[str, float]) -> Quote:
+        """
+        Turn a timestamp and price read from the observer into a quote, as old as its timestamp.
+
+        :param ticker: (str): The name of the stock ticker
+        :param row: (tuple[str, float]): The observer timestamp and price
+        :return: (Quote): The quote, timestamped now if the observer timestamp can't be read
+
+        """
+        epoch = StockObserver.get_timestamp_epoch(row[0])
+        if epoch is None:
+            return Quote(ticker, row[1])
+        return Quote.from_live_source(ticker, row[1], epoch)
+
+    @staticmethod
+    def get_newest_quote(ticker: str, latest_tick: tuple[str, float] = None) -> Quote:
+        """
+        Get the quote of the newest of the tick store's tick and the monthly database's latest row. A recent tick is
+        used without reading the monthly database.
+
+        :param ticker: (str): The name of the stock ticker
+        :param latest_tick: (tuple[str, float]): The timestamp and price of the newest tick, None if there is none
+        :return: (Quote): The quote of the latest price
+
+        """
+        if latest_tick is not None and StockObserver.is_tick_recent(latest_tick[0]):
+            return StockObserver.row_to_quote(ticker, latest_tick)
+
+        latest_row = None
+        try:
+            for file_name in StockObserver.partition_manager.get_readable_partition_files(ticker):
+                latest_row = StockObserver.read_latest_row(file_name, ticker)
+                if latest_row is not None:
+                    break
         except:
+            latest_row = None
+
+        # The observer timestamps sort the same as the times they are for
+        if latest_tick is not None and (latest_row is None or str(latest_tick[0]) >= str(latest_row[0])):
+            return StockObserver.row_to_quote(ticker, latest_tick)
+
+        if latest_row is None:
             print("ISSUE GETTING STOCK INFO, file most likely does not exist, ensure observer is running")
             print("Stock name: %s", ticker)
             print("fetching value directly")
             raise AssertionError
 
-        return float(latest_stock_info[PRICE_INDEX])
+        return StockObserver.row_to_quote(ticker, latest_row)
+
+    @staticmethod
+    def read_latest_row(file_name: Path, ticker: str) -> Optional[tuple[str, float]]:
+        """
+        Read the latest price of the ticker, and when it was recorded, from one of the monthly observer databases.
+
+        :param file_name: (Path): Filename and path of the observer database
+        :param ticker: (str): The name of the stock ticker
+        :return: (tuple[str, float]): The timestamp and price, None if the database has no price for the ticker yet
+
+        """
+        conn = sqlite3.connect(file_name, timeout=READER_BUSY_TIMEOUT_SECONDS)
+        try:
+            c = conn.cursor()
+
+            # Get the latest stock information
+            try:
+                c.execute("SELECT timestamp, price FROM latest WHERE stock_ticker = ?", (ticker,))
+                latest_row = c.fetchone()
+            except sqlite3.OperationalError:
+                latest_row = None
+
+            if latest_row is None:
+                c.execute("SELECT * FROM stocks ORDER BY timestamp DESC LIMIT 1")
+                stocks_row = c.fetchone()
+                latest_row = None if stocks_row is None else (stocks_row[TIMESTAMP_INDEX], stocks_row[PRICE_INDEX])
+        finally:
+            conn.close()
+
+        return None if latest_row is None else (latest_row[0], float(latest_row[1]))
+
+    @staticmethod
+    def get_recorded_prices(ticker: str, count: int) -> np.ndarray:
+        """
+        Get the most recent prices the observer recorded for the ticker, used to warm start the price history.
+
+        :param ticker: (str): The name of the stock ticker
+        :param count: (int): The max number of prices to get
+        :return: (np.ndarray): The prices, oldest first, empty if they couldn't be read
+
+        """
+        try:
+            with ObserverQueryLibrary(StockObserver.partition_manager) as query_library:
+                return query_library.get_latest_prices(ticker, count)
+        except sqlite3.Error as e:
+            print(f"Issue reading the recorded prices of {ticker}: {e}")
+            return np.array([], dtype=np.float64)
 
     @staticmethod
     def dict_to_stock(stock_dict: dict) -> 'StockObserver':
@@ -133,7 +313,7 @@ class StockDirect(StockBaseClass):
     StockDirect
 
     This class is for direct stock connection, where it will get the values directly from yahoo finance with no
-    observer.
+    observer. The values are fetched through the market data provider, so they can be replayed instead.
 
     Pros:
         - No need for observer pattern
@@ -146,6 +326,8 @@ class StockDirect(StockBaseClass):
         - If multiple accounts are running, then alot of duplicate calls
 
     """
+    __slots__ = ()
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
@@ -166,12 +348,33 @@ class StockDirect(StockBaseClass):
         :return: (float): The latest price as a float
 
         """
-        try:
-            ticker = yf.Ticker(ticker)
-            todays_data = ticker.history(period='1d')
-            return float(todays_data['Close'][0])
-        except RuntimeError:
-            print("RunTime Error encountered while getting current price for " + ticker)
+        price = get_market_data_provider().get_current_price(ticker)
+        if price is None:
+            print(f"ISSUE GETTING STOCK INFO, no price returned for {ticker}")
+            raise MarketDataError(f"No price returned for {ticker}")
+        return price
+
+    @staticmethod
+    def get_current_prices(tickers: list[str]) -> dict[str, Quote]:
+        """
+        Get the current price of every ticker with one batched provider call. Any ticker missing from the batch is
+        gotten on its own, and left out if it still can't be gotten. The provider has no timestamps for its prices, so
+        the quotes are timestamped when they are gotten.
+
+        :param tickers: (list[str]): The names of the stock tickers
+        :return: (dict[str, Quote]): Dictionary of ticker to quote of the latest price
+
+        """
+        prices = get_market_data_provider().get_current_prices(tickers)
+        quotes = {ticker: Quote(ticker, price) for ticker, price in prices.items()}
+        for ticker in tickers:
+            if ticker not in quotes:
+                try:
+                    quotes[ticker] = StockDirect.get_current_quote(ticker)
+                except MarketDataError:
+                    continue
+
+        return quotes
 
     @staticmethod
     def dict_to_stock(stock_dict: dict) -> 'StockDirect':
@@ -211,5 +414,315 @@ class StockDirect(StockBaseClass):
                            new_low=new_low)
 
 
+class StockBoard(StockBaseClass):
+    """
+    StockBoard
+
+    This variation of the stock class reads the latest price the observer published to the shared memory price board.
+    Reading from memory avoids opening and querying the observer database on every update, so many more programs can
+    run on the same machine.
+
+    If the board hasn't been created or doesn't have the ticker yet, the price is read from the observer database the
+    same way StockObserver does.
+
+    """
+    # One reader of the board shared by all board stocks in the process
+    price_board = PriceBoard(PRICE_BOARD_PATH)
+
+    __slots__ = ()
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+    @staticmethod
+    def get_current_file_name(ticker: str) -> Path:
+        """
+        Get the observer database file name, which is used when the price board can't be read.
+
+        :param ticker: (str): The name of the stock ticker
+        :return: (Path): The Path of the current observer database for the stock.
+
+        """
+        return StockObserver.get_current_file_name(ticker)
+
+    @staticmethod
+    def get_current_price(ticker: str) -> float:
+        """
+        Get the current price from the price board, or from the observer database if the board doesn't have it.
+
+        :param ticker: (str): The name of the stock ticker
+        :return: (float): The latest price as a float
+
+        """
+        board_value = StockBoard.price_board.read(ticker)
+        if board_value is None:
+            return StockObserver.get_current_price(ticker)
+
+        return board_value[0]
+
+    @staticmethod
+    def get_current_quote(ticker: str) -> Quote:
+        """
+        Get the current price from the price board as a quote with the board's timestamp and update sequence number, or
+        from the observer database if the board doesn't have it.
+
+        :param ticker: (str): The name of the stock ticker
+        :return: (Quote): The quote of the latest price
+
+        """
+        board_value = StockBoard.price_board.read(ticker)
+        if board_value is None:
+            return StockObserver.get_current_quote(ticker)
+
+        return Quote.from_live_source(ticker, board_value[0], board_value[1], sequence=board_value[2])
+
+    @staticmethod
+    def get_current_prices(tickers: list[str]) -> dict[str, Quote]:
+        """
+        Get the current price of every ticker from the price board, reading any the board doesn't have from the
+        observer databases together.
 
+        :param tickers: (list[str]): The names of the stock tickers
+        :return: (dict[str, Quote]): Dictionary of ticker to quote of the latest price, with the board's timestamp and
+                                     update sequence number
+
+        """
+        quotes = {}
+        for ticker in tickers:
+            board_value = StockBoard.price_board.read(ticker)
+            if board_value is not None:
+                quotes[ticker] = Quote.from_live_source(ticker, board_value[0], board_value[1], board_value[2])
+
+        missing_tickers = [ticker for ticker in tickers if ticker not in quotes]
+        if missing_tickers:
+            quotes.update(StockObserver.get_current_prices(missing_tickers))
+
+        return quotes
+
+    @staticmethod
+    def get_recorded_prices(ticker: str, count: int) -> np.ndarray:
+        """
+        Get the most recent prices the observer recorded for the ticker, used to warm start the price history.
+
+        :param ticker: (str): The name of the stock ticker
+        :param count: (int): The max number of prices to get
+        :return: (np.ndarray): The prices, oldest first
+
+        """
+        return StockObserver.get_recorded_prices(ticker, count)
+
+    @staticmethod
+    def dict_to_stock(stock_dict: dict) -> 'StockBoard':
+        """
+        Turn the dictionary item that contains the stock information into a StockBoard Object.
+
+        :param stock_dict: (dict): The dictionary to be turned into a stock
+        :return: (StockBoard): A stock board object with stock_dict info
+
+        """
+        name = stock_dict['name']
+        quantity = stock_dict['quantity']
+        buy_price = stock_dict['buy_price']
+        sell_price = stock_dict['sell_price']
+        all_time_peak = stock_dict['all_time_peak']
+        last_high = stock_dict['last_high']
+        last_low = stock_dict['last_low']
+        trend = stock_dict['trend']
+        last_price = stock_dict['last_price']
+        transaction_file = stock_dict['transaction_file']
+        account_file = stock_dict['account_file']
+        new_high = stock_dict['new_high']
+        new_low = stock_dict['new_low']
+
+        return StockBoard(name=name,
+                          quantity=quantity,
+                          buy_price=buy_price,
+                          sell_price=sell_price,
+                          all_time_peak=all_time_peak,
+                          last_high=last_high,
+                          last_low=last_low,
+                          trend=trend,
+                          last_price=last_price,
+                          transaction_file=transaction_file,
+                          account_file=account_file,
+                          new_high=new_high,
+                          new_low=new_low)
+
+
+class StockRetro(StockBaseClass):
+    """
+    StockRetro
+
+    This variation of the stock class gets its values from the already recorded values instead of the market, so an
+    algorithm can be ran against existing data sets as fast as the code runs.
+
+    The recorded values of each ticker are loaded as memory mapped arrays from the PriceArrayLibrary, and each ticker has
+    a cursor into its arrays. The run moves the cursor forward by one value with advance, once per update of all the
+    stocks, and get_current_price returns the value at the cursor. The cursors are shared by all the retro stocks in the
+    process, so every stock with the same ticker sees the same price, however many of them are updated.
+
+    """
+    price_array_library = PriceArrayLibrary()
+    # Loaded (timestamps, prices) arrays, keyed by ticker
+    price_arrays: dict[str, tuple[np.ndarray, np.ndarray]] = {}
+    # Index of the current value in each ticker's arrays
+    cursors: dict[str, int] = {}
+
+    __slots__ = ()
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+    @staticmethod
+    def load_price_arrays(ticker: str) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Get the price arrays of the ticker, loading them and starting the cursor at the first value on first use.
+
+        :param ticker: (str): The name of the stock ticker
+        :return: (tuple[np.ndarray, np.ndarray]): The epoch timestamps and prices of the ticker
+
+        """
+        if ticker not in StockRetro.price_arrays:
+            StockRetro.price_arrays[ticker] = StockRetro.price_array_library.load_ticker(ticker)
+            StockRetro.cursors.setdefault(ticker, 0)
+
+        return StockRetro.price_arrays[ticker]
+
+    @staticmethod
+    def seek(ticker: str, start_timestamp: int):
+        """
+        Move the cursor of the ticker to the first value at or after the timestamp.
+
+        :param ticker: (str): The name of the stock ticker
+        :param start_timestamp: (int): The timestamp to start at, in the PriceArrayLibrary's epoch seconds
+
+        """
+        timestamps, _ = StockRetro.load_price_arrays(ticker)
+        StockRetro.cursors[ticker] = int(np.searchsorted(timestamps, start_timestamp, side="left"))
+
+    @staticmethod
+    def advance(ticker: str):
+        """
+        Move the cursor of the ticker forward to the next recorded value, if there is one. Called once per update of
+        the run, before the stocks of the ticker are updated.
+
+        :param ticker: (str): The name of the stock ticker
+
+        """
+        if not StockRetro.is_finished(ticker):
+            StockRetro.cursors[ticker] += 1
+
+    @staticmethod
+    def is_finished(ticker: str) -> bool:
+        """
+        Check if the cursor of the ticker is at the last recorded value.
+
+        :param ticker: (str): The name of the stock ticker
+        :return: (bool): True if there are no more values to move to
+
+        """
+        timestamps, _ = StockRetro.load_price_arrays(ticker)
+        return StockRetro.cursors[ticker] >= len(timestamps) - 1
+
+    @staticmethod
+    def get_current_timestamp(ticker: str) -> int:
+        """
+        Get the timestamp of the value at the cursor.
+
+        :param ticker: (str): The name of the stock ticker
+        :return: (int): The timestamp in the PriceArrayLibrary's epoch seconds
+
+        """
+        timestamps, _ = StockRetro.load_price_arrays(ticker)
+        return int(timestamps[StockRetro.cursors[ticker]])
+
+    @staticmethod
+    def get_current_file_name(ticker: str) -> Path:
+        """
+        Get the price array file the stock values are read from.
+
+        :param ticker: (str): The name of the stock ticker
+        :return: (Path): The Path of the price array file
+
+        """
+        return StockRetro.price_array_library.get_array_files(ticker)[1]
+
+    @staticmethod
+    def get_current_price(ticker: str) -> float:
+        """
+        Get the recorded price at the ticker's cursor.
+
+        :param ticker: (str): The name of the stock ticker
+        :return: (float): The price at the cursor as a float
+
+        """
+        _, prices = StockRetro.load_price_arrays(ticker)
+        if len(prices) == 0:
+            print("No recorded values for stock: " + ticker)
+            raise AssertionError
+
+        return float(prices[StockRetro.cursors[ticker]])
+
+    @staticmethod
+    def get_current_quote(ticker: str) -> Quote:
+        """
+        Get the recorded price at the ticker's cursor as a quote with the recorded timestamp and the cursor as its
+        sequence number.
+
+        :param ticker: (str): The name of the stock ticker
+        :return: (Quote): The quote of the price at the cursor
+
+        """
+        return Quote(ticker, StockRetro.get_current_price(ticker), timestamp=StockRetro.get_current_timestamp(ticker),
+                     sequence=StockRetro.cursors[ticker])
+
+    @staticmethod
+    def get_recorded_prices(ticker: str, count: int) -> np.ndarray:
+        """
+        Get the recorded prices up to and including the cursor, used to warm start the price history.
+
+        :param ticker: (str): The name of the stock ticker
+        :param count: (int): The max number of prices to get
+        :return: (np.ndarray): The prices, oldest first
+
+        """
+        _, prices = StockRetro.load_price_arrays(ticker)
+        cursor = StockRetro.cursors[ticker]
+        return prices[max(cursor + 1 - count, 0):cursor + 1]
+
+    @staticmethod
+    def dict_to_stock(stock_dict: dict) -> 'StockRetro':
+        """
+        Turn the dictionary item that contains the stock information into a StockRetro Object.
+
+        :param stock_dict: (dict): The dictionary to be turned into a stock
+        :return: (StockRetro): A stock retro object with stock_dict info
+
+        """
+        name = stock_dict['name']
+        quantity = stock_dict['quantity']
+        buy_price = stock_dict['buy_price']
+        sell_price = stock_dict['sell_price']
+        all_time_peak = stock_dict['all_time_peak']
+        last_high = stock_dict['last_high']
+        last_low = stock_dict['last_low']
+        trend = stock_dict['trend']
+        last_price = stock_dict['last_price']
+        transaction_file = stock_dict['transaction_file']
+        account_file = stock_dict['account_file']
+        new_high = stock_dict['new_high']
+        new_low = stock_dict['new_low']
 
+        return StockRetro(name=name,
+                          quantity=quantity,
+                          buy_price=buy_price,
+                          sell_price=sell_price,
+                          all_time_peak=all_time_peak,
+                          last_high=last_high,
+                          last_low=last_low,
+                          trend=trend,
+                          last_price=last_price,
+                          transaction_file=transaction_file,
+                          account_file=account_file,
+                          new_high=new_high,
+                          new_low=new_low)
@@ -0,0 +1,248 @@
+"""
+Author: Joel Yuhas
+Date: October 17th, 2026
+
+TickPublisher
+
+Local publish/subscribe channel so the observer can push every tick to the trading programs the moment it is written,
+instead of the programs sleeping and polling for new prices.
+
+The observer owns a TickPublisher which listens on a Unix domain socket. Programs connect with a TickSubscriber and
+block on wait_for_tick until the observer publishes the next tick for their stock. Each tick is sent as one line of
+json with the ticker, price, epoch timestamp, and sequence number.
+
+If the platform doesn't support Unix domain sockets, or the observer isn't running, subscribers just wait out the
+timeout so the programs fall back to the old fixed interval behavior.
+
+"""
+import json
+import os
+import socket
+import time
+from pathlib import Path
+from typing import Optional
+
+# Max number of subscribers that can be waiting to be accepted by the publisher
+SUBSCRIBER_BACKLOG = 64
+
+# Number of bytes to read from the socket at a time
+RECEIVE_SIZE = 4096
+
+# Seconds to keep taking ticks after the first one when waiting on many tickers. The observer publishes every ticker of
+# an update together, so the rest of the update comes right behind the first tick
+TICK_SETTLE_SECONDS = 0.5
+
+
+class TickPublisher:
+    def __init__(self, socket_file: Path):
+        self.socket_file = socket_file
+        self.subscribers: list[socket.socket] = []
+        self.sequence = 0
+        self.server = None
+
+        if not hasattr(socket, "AF_UNIX"):
+            print("Unix domain sockets not supported, ticks will not be pushed to subscribers")
+            return
+
+        # Clean up a socket file left behind from a previous run before binding to it again
+        if os.path.exists(self.socket_file):
+            os.unlink(self.socket_file)
+
+        self.server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.server.bind(str(self.socket_file))
+        self.server.listen(SUBSCRIBER_BACKLOG)
+        self.server.setblocking(False)
+
+    def __enter__(self) -> 'TickPublisher':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _accept_subscribers(self):
+        """
+        Accept every subscriber that has connected since the last publish.
+
+        """
+        while True:
+            try:
+                subscriber, _ = self.server.accept()
+            except (BlockingIOError, InterruptedError):
+                return
+            subscriber.setblocking(False)
+            self.subscribers.append(subscriber)
+
+    def publish(self, ticker: str, price: float, timestamp: float):
+        """
+        Send the tick to every connected subscriber. Subscribers that have disconnected or stopped reading are dropped
+        so a stuck program can never hold up the observer.
+
+        :param ticker: (str): The ticker of the stock
+        :param price: (float): The latest price of the stock
+        :param timestamp: (float): The time of the price in epoch seconds
+
+        """
+        if self.server is None:
+            return
+
+        self._accept_subscribers()
+        self.sequence += 1
+        message = (json.dumps({"ticker": ticker, "price": price, "timestamp": timestamp,
+                               "sequence": self.sequence}) + "\n").encode()
+
+        for subscriber in list(self.subscribers):
+            try:
+                subscriber.sendall(message)
+            except (BlockingIOError, BrokenPipeError, ConnectionError, OSError):
+                print("Dropping tick subscriber")
+                subscriber.close()
+                self.subscribers.remove(subscriber)
+
+    def close(self):
+        """
+        Disconnect all subscribers and remove the socket file.
+
+        """
+        for subscriber in self.subscribers:
+            subscriber.close()
+        self.subscribers = []
+
+        if self.server is not None:
+            self.server.close()
+            self.server = None
+            if os.path.exists(self.socket_file):
+                os.unlink(self.socket_file)
+
+
+class TickSubscriber:
+    def __init__(self, socket_file: Path):
+        self.socket_file = socket_file
+        self.connection = None
+        self.buffer = b""
+
+    def close(self):
+        """
+        Disconnect from the publisher.
+
+        """
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+        self.buffer = b""
+
+    def connect(self) -> bool:
+        """
+        Connect to the publisher if not already connected.
+
+        :return: (bool): True if connected to the publisher
+
+        """
+        if self.connection is not None:
+            return True
+        if not hasattr(socket, "AF_UNIX"):
+            return False
+
+        connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            connection.connect(str(self.socket_file))
+        except (FileNotFoundError, ConnectionRefusedError, OSError):
+            connection.close()
+            return False
+
+        self.connection = connection
+        return True
+
+    def _take_latest_ticks(self, tickers: Optional[set[str]]) -> dict[str, dict]:
+        """
+        Parse all the complete ticks in the buffer and return the newest one of each of the tickers. Older ticks are
+        dropped since only the latest price matters.
+
+        :param tickers: (set[str]): The tickers to look for, None for any ticker
+        :return: (dict[str, dict]): Dictionary of ticker to its newest tick, tickers without a buffered tick are left out
+
+        """
+        latest_ticks = {}
+        *lines, self.buffer = self.buffer.split(b"\n")
+        for line in lines:
+            tick = json.loads(line)
+            if tickers is None or tick["ticker"] in tickers:
+                latest_ticks[tick["ticker"]] = tick
+
+        return latest_ticks
+
+    def wait_for_ticks(self, tickers: Optional[list[str]], timeout: float = None,
+                       settle_seconds: float = TICK_SETTLE_SECONDS) -> dict[str, dict]:
+        """
+        Block until the publisher sends a tick for any of the tickers, then keep taking the ticks that come right after
+        it, so one update of the observer wakes the caller once instead of once for each ticker. Returns once every
+        ticker has a tick, once settle_seconds pass after the first tick, or once the timeout passes.
+
+        If the publisher isn't reachable, this waits out the timeout and tries to connect again on the next call.
+
+        :param tickers: (list[str]): The tickers of the stocks to wait for, None to take the ticks of any ticker
+        :param timeout: (float): Max seconds to wait for the first tick, None to wait forever
+        :param settle_seconds: (float): Max seconds to keep taking ticks after the first one
+        :return: (dict[str, dict]): Dictionary of ticker to its newest tick, empty if the timeout passed
+
+        """
+        wanted_tickers = None if tickers is None else set(tickers)
+        latest_ticks = {}
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        while True:
+            remaining = None if deadline is None else max(deadline - time.monotonic(), 0.0)
+
+            if not self.connect():
+                if latest_ticks:
+                    return latest_ticks
+                # No publisher to wait on, keep the caller's pacing by waiting out the timeout
+                if remaining is None:
+                    raise ConnectionError("Tick publisher is not running and no timeout was given")
+                time.sleep(remaining)
+                return latest_ticks
+
+            new_ticks = self._take_latest_ticks(wanted_tickers)
+            if new_ticks:
+                if not latest_ticks:
+                    # Only wait a short while for the rest of the update
+                    settle_deadline = time.monotonic() + settle_seconds
+                    deadline = settle_deadline if deadline is None else min(deadline, settle_deadline)
+                latest_ticks.update(new_ticks)
+                if wanted_tickers is not None and wanted_tickers.issubset(latest_ticks):
+                    return latest_ticks
+                continue
+            if remaining is not None and remaining <= 0.0:
+                return latest_ticks
+
+            self.connection.settimeout(remaining)
+            try:
+                data = self.connection.recv(RECEIVE_SIZE)
+            except socket.timeout:
+                return latest_ticks
+            except OSError:
+                data = b""
+
+            # Publisher went away, drop the connection and reconnect on the next loop
+            if not data:
+                self.close()
+                continue
+
+            self.buffer += data
+
+    def wait_for_tick(self, ticker: str = None, timeout: float = None) -> Optional[dict]:
+        """
+        Block until the publisher sends a tick for the ticker, or until the timeout passes. The same as wait_for_ticks
+        with one ticker, without waiting for any ticks after it.
+
+        If the publisher isn't reachable, this waits out the timeout and tries to connect again on the next call.
+
+        :param ticker: (str): The ticker of the stock to wait for, None to return on any tick
+        :param timeout: (float): Max seconds to wait, None to wait forever
+        :return: (dict): The tick with ticker, price, timestamp, and sequence. None if the timeout passed
+
+        """
+        latest_ticks = self.wait_for_ticks(None if ticker is None else [ticker], timeout=timeout, settle_seconds=0)
+        if not latest_ticks:
+            return None
+        # The newest tick of any ticker is the one the publisher sent last
+        return max(latest_ticks.values(), key=lambda tick: tick["sequence"])
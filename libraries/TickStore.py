@@ -0,0 +1,217 @@
+"""
+Author: Joel Yuhas
+Date: October 17th, 2026
+
+TickStore
+
+Single store for the observed ticks of every stock. Instead of one database per ticker per month, all tickers share
+one database per year, with the ticks kept in a WITHOUT ROWID table clustered on (stock_ticker, timestamp). Looking
+up the latest tick of a stock, or all the ticks of a stock between two times, is then one indexed seek instead of
+opening and scanning several monthly files.
+
+The observer writes through write_ticks, StockObserver reads through get_latest_tick, and the existing monthly
+observer databases can be brought in with import_observer_database.
+
+Timestamps are stored as text in the same Y-m-d H:M:S format the observer uses, so they sort in time order.
+
+"""
+import sqlite3
+import time
+from pathlib import Path
+from typing import Optional
+
+from libraries.helper_functions import TICK_STORE_PATH, open_database_connection
+
+TICK_STORE_SCHEMA = \
+    '''CREATE TABLE IF NOT EXISTS ticks (stock_ticker text NOT NULL, timestamp text NOT NULL, price real,
+                                        PRIMARY KEY (stock_ticker, timestamp)) WITHOUT ROWID'''
+
+# Tickers that show up in old observer databases that were created without a real ticker
+INVALID_TICKERS = (None, "", "None")
+
+
+class TickStore:
+    def __init__(self, store_path: Path = TICK_STORE_PATH):
+        self.store_path = store_path
+        # Long-lived connections, keyed by year
+        self.connections: dict[str, sqlite3.Connection] = {}
+
+    def __enter__(self) -> 'TickStore':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close_all_connections()
+
+    def get_database_file(self, year: str) -> Path:
+        """
+        Get the database file that holds the ticks of the given year.
+
+        :param year: (str): The year in YYYY format
+        :return: (Path): The path of the tick database for that year
+
+        """
+        return self.store_path / f"ticks_{year}.db"
+
+    def get_connection(self, year: str, create: bool = True) -> Optional[sqlite3.Connection]:
+        """
+        Get the long-lived connection for the year's database, opening it if there is not one yet.
+
+        :param year: (str): The year in YYYY format
+        :param create: (bool): If the database doesn't exist yet, create it. Readers pass False so they never create
+                               empty databases.
+        :return: (sqlite3.Connection): The open connection, None if the database doesn't exist and create is False
+
+        """
+        if year not in self.connections:
+            database_file = self.get_database_file(year)
+            if not database_file.is_file():
+                if not create:
+                    return None
+                self.store_path.mkdir(parents=True, exist_ok=True)
+
+            conn = open_database_connection(database_file)
+            with conn:
+                conn.execute(TICK_STORE_SCHEMA)
+            self.connections[year] = conn
+
+        return self.connections[year]
+
+    def close_all_connections(self):
+        """
+        Close every open database connection.
+
+        """
+        for conn in self.connections.values():
+            conn.close()
+        self.connections = {}
+
+    def write_ticks(self, ticks: list[tuple[str, str, float]]):
+        """
+        Write the ticks to the store, using one transaction per year the ticks fall in. A tick for a ticker and
+        timestamp that is already stored replaces the old one.
+
+        :param ticks: (list[tuple[str, str, float]]): The ticks as (stock_ticker, timestamp, price)
+
+        """
+        ticks_by_year = {}
+        for tick in ticks:
+            ticks_by_year.setdefault(tick[1][:4], []).append(tick)
+
+        for year, year_ticks in ticks_by_year.items():
+            conn = self.get_connection(year)
+            with conn:
+                conn.executemany("INSERT OR REPLACE INTO ticks VALUES (?,?,?)", year_ticks)
+
+    def write_tick(self, stock_ticker: str, timestamp: str, price: float):
+        """
+        Write a single tick to the store.
+
+        :param stock_ticker: (str): The ticker of the stock
+        :param timestamp: (str): The time of the tick in Y-m-d H:M:S format
+        :param price: (float): The price of the stock
+
+        """
+        self.write_ticks([(stock_ticker, timestamp, price)])
+
+    def get_years(self) -> list[str]:
+        """
+        Get every year that has a tick database, oldest first.
+
+        :return: (list[str]): The years in YYYY format
+
+        """
+        return sorted(file.stem.split("_")[1] for file in self.store_path.glob("ticks_*.db"))
+
+    def get_latest_tick(self, stock_ticker: str) -> Optional[tuple[str, float]]:
+        """
+        Get the newest tick of the stock. Years are checked newest first, so a stock that hasn't ticked yet this year
+        still gets last year's final tick.
+
+        :param stock_ticker: (str): The ticker of the stock
+        :return: (tuple[str, float]): The timestamp and price of the newest tick, None if the stock has no ticks
+
+        """
+        # The current year almost always has the tick, only look through the other years if it doesn't
+        current_year = str(time.localtime().tm_year)
+        for year in [current_year] + [year for year in reversed(self.get_years()) if year != current_year]:
+            conn = self.get_connection(year, create=False)
+            if conn is None:
+                continue
+            latest_tick = conn.execute("SELECT timestamp, price FROM ticks WHERE stock_ticker = ? "
+                                       "ORDER BY timestamp DESC LIMIT 1", (stock_ticker,)).fetchone()
+            if latest_tick is not None:
+                return latest_tick[0], float(latest_tick[1])
+
+        return None
+
+    def get_latest_ticks(self, stock_tickers: list[str]) -> dict[str, tuple[str, float]]:
+        """
+        Get the newest tick of every stock with one query per year. Each ticker is its own seek on the primary key, so
+        the query doesn't read any of the older ticks. Years are checked newest first, only for the stocks that don't
+        have a tick yet.
+
+        :param stock_tickers: (list[str]): The tickers of the stocks
+        :return: (dict[str, tuple[str, float]]): Dictionary of ticker to the timestamp and price of its newest tick,
+                                                 stocks without ticks are left out
+
+        """
+        latest_ticks = {}
+        current_year = str(time.localtime().tm_year)
+        for year in [current_year] + [year for year in reversed(self.get_years()) if year != current_year]:
+            missing_tickers = [ticker for ticker in dict.fromkeys(stock_tickers) if ticker not in latest_ticks]
+            if not missing_tickers:
+                break
+            conn = self.get_connection(year, create=False)
+            if conn is None:
+                continue
+            query = " UNION ALL ".join(["SELECT * FROM (SELECT stock_ticker, timestamp, price FROM ticks "
+                                        "WHERE stock_ticker = ? ORDER BY timestamp DESC LIMIT 1)"] * len(missing_tickers))
+            for stock_ticker, timestamp, price in conn.execute(query, missing_tickers).fetchall():
+                latest_ticks[stock_ticker] = (timestamp, float(price))
+
+        return latest_ticks
+
+    def get_ticks(self, stock_ticker: str, start: str, end: str) -> list[tuple[str, float]]:
+        """
+        Get every tick of the stock from start up to but not including end.
+
+        :param stock_ticker: (str): The ticker of the stock
+        :param start: (str): The start time in Y-m-d H:M:S format, or any prefix of it like Y-m-d
+        :param end: (str): The end time in Y-m-d H:M:S format, or any prefix of it like Y-m-d
+        :return: (list[tuple[str, float]]): The timestamp and price of each tick in time order
+
+        """
+        ticks = []
+        for year in self.get_years():
+            if not (start[:4] <= year <= end[:4]):
+                continue
+            conn = self.get_connection(year, create=False)
+            if conn is None:
+                continue
+            ticks.extend(conn.execute("SELECT timestamp, price FROM ticks WHERE stock_ticker = ? "
+                                      "AND timestamp >= ? AND timestamp < ? ORDER BY timestamp",
+                                      (stock_ticker, start, end)).fetchall())
+
+        return ticks
+
+    def import_observer_database(self, file_name: Path) -> int:
+        """
+        Import all the ticks from one of the monthly observer databases. Rows without a real ticker are skipped.
+
+        :param file_name: (Path): Filename and path of the observer database
+        :return: (int): The number of ticks that were imported
+
+        """
+        conn = sqlite3.connect(file_name)
+        try:
+            rows = conn.execute("SELECT stock_ticker, timestamp, price FROM stocks").fetchall()
+        except sqlite3.OperationalError:
+            print(f"No stocks table in {file_name}, skipping")
+            rows = []
+        finally:
+            conn.close()
+
+        ticks = [row for row in rows if row[0] not in INVALID_TICKERS and row[1]]
+        self.write_ticks(ticks)
+
+        return len(ticks)
@@ -0,0 +1,140 @@
+"""
+Author: Joel Yuhas
+Date: October 17th, 2026
+
+TradingEngine
+
+Runs many accounts and their strategies in one process. Every account is subscribed to a ticker with a strategy, and each
+cycle of the engine:
+
+    - gets the price of every ticker once, in one call for all of them
+    - updates the stocks of every account with the same prices
+    - runs the strategy of every subscription with the account and its updated stock
+    - saves the accounts that traded together, then flushes the transaction ledgers once
+
+So the price calls of a cycle are the same however many accounts trade a ticker, where a process per account used to
+get the same price once for each account.
+
+An error in one account, like a transaction that fails its checks, is printed and the account is skipped for the rest
+of the cycle, so it doesn't stop the other accounts.
+
+The accounts can also be split into shards by ticker with split_tickers, to run an engine in each of a small number of
+processes. Every account of a ticker is in the same shard, so each ticker is still gotten once per cycle.
+
+NOTE: Retro stocks only move to their next recorded value with StockRetro.advance, which the engine doesn't call. The
+      engine is meant for the live stock types
+
+"""
+from typing import Callable
+
+from libraries.AccountLibrary import AccountLibrary
+from libraries.Quote import Quote
+from libraries.StockBaseClass import StockBaseClass
+from libraries.StockFactory import StockFactory
+from libraries.TransactionLedger import TransactionLedger
+
+
+class TradingEngine:
+    def __init__(self, stock_factory: StockFactory):
+        self.stock_factory = stock_factory
+        # Accounts in the order they were added, each one only once
+        self.accounts: list[AccountLibrary] = []
+        # Ticker to the list of (account, strategy) subscribed to it
+        self.subscriptions: dict[str, list[tuple[AccountLibrary, Callable]]] = {}
+        # Accounts that traded since they were last saved, by id so each is saved once
+        self.unsaved_accounts: dict[int, AccountLibrary] = {}
+        self.cycle_count = 0
+
+    def add_account(self, account: AccountLibrary, ticker: str,
+                    strategy: Callable[[AccountLibrary, StockBaseClass], bool]):
+        """
+        Subscribe an account to a ticker with a strategy. An account can be added with more than one ticker, its
+        stocks are still updated once per cycle.
+
+        :param account: (AccountLibrary): The account, already created or loaded. It has to hold the ticker's stock
+        :param ticker: (str): The ticker the strategy trades
+        :param strategy: (Callable): Called each cycle with the account and its updated stock of the ticker, returns
+                                     True if it traded
+
+        """
+        if account.get_stock(ticker) is None:
+            print(f"Account {account.account_number} does not have {ticker} to subscribe to")
+            raise AssertionError
+        if all(added is not account for added in self.accounts):
+            self.accounts.append(account)
+        self.subscriptions.setdefault(ticker, []).append((account, strategy))
+
+    def get_tickers(self) -> list[str]:
+        """
+        Get every ticker the engine gets the price of, the subscribed tickers and the other stocks the accounts hold.
+
+        :return: (list[str]): The tickers, each once
+
+        """
+        tickers = dict.fromkeys(self.subscriptions)
+        for account in self.accounts:
+            tickers.update(dict.fromkeys(account.stocks))
+        return list(tickers)
+
+    def run_cycle(self) -> dict[str, Quote]:
+        """
+        Run one cycle of the engine. Get the price of every ticker once, update every account's stocks with them, run
+        every strategy, then save the accounts that traded.
+
+        :return: (dict[str, Quote]): The quotes of the cycle by ticker
+
+        """
+        prices = self.stock_factory.get_current_prices(self.get_tickers())
+        failed_accounts = set()
+        for account in self.accounts:
+            try:
+                account.update_stock_values_all(prices)
+            except Exception as e:
+                print(f"Issue updating the stocks of account {account.account_number}: {e!r}, skipping it this cycle")
+                failed_accounts.add(id(account))
+
+        for ticker, subscribers in self.subscriptions.items():
+            for account, strategy in subscribers:
+                if id(account) in failed_accounts:
+                    continue
+                try:
+                    traded = strategy(account, account.get_stock(ticker))
+                except Exception as e:
+                    print(f"Issue running the strategy of account {account.account_number} on {ticker}: {e!r}")
+                    # Part of the trade may have gone through before the error, saving an unchanged account is free
+                    traded = True
+                if traded:
+                    self.unsaved_accounts[id(account)] = account
+
+        self.save_accounts()
+        self.cycle_count = self.cycle_count + 1
+        return prices
+
+    def save_accounts(self, end_of_day_save: bool = False):
+        """
+        Save the accounts that traded since they were last saved, then flush and sync every transaction ledger once.
+
+        :param end_of_day_save: (bool): Save every account as its end of day save instead
+
+        """
+        accounts = self.accounts if end_of_day_save else list(self.unsaved_accounts.values())
+        for account in accounts:
+            try:
+                account.write_account_to_file(end_of_day_save=end_of_day_save)
+            except Exception as e:
+                print(f"Issue saving account {account.account_number}: {e!r}")
+        self.unsaved_accounts.clear()
+        TransactionLedger.flush_all(sync=True)
+
+    @staticmethod
+    def split_tickers(tickers: list[str], shard_count: int) -> list[list[str]]:
+        """
+        Split the tickers into shards to run an engine in each, taking turns so the shards are about the same size.
+
+        :param tickers: (list[str]): The tickers to split
+        :param shard_count: (int): The number of shards, fewer are made if there aren't enough tickers
+        :return: (list[list[str]]): The tickers of each shard
+
+        """
+        shard_count = max(1, min(shard_count, len(tickers)))
+        return [tickers[shard::shard_count] for shard in range(shard_count)]
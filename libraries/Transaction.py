@@ -12,106 +12,160 @@ Having this information in a class makes storing and keeping the transaction dat
 for data analysis.
 
         self.transaction_number     : (int)     The number of the account int
-        self.account                : (int)     The account class along with all account information
+        self.account_number         : (int)     The number of the account the transaction was made in
         self.ticker                 : (st)      Ticker that is used to identify and retrieve the stock
         self.type                   : (str)     Type of transaction: DEPOSIT, WITHDRAW, BUY, SELL
         self.stock_amount           : (float)   The number of stocks that wish to be bought or sold
         self.dollar_amount          : (float)   The dollar value of stock that wishes to be bought or sold
         self.stock_price            : (float)   The updated price of the stock
-        self.transaction_file       : (str)     Directory to transaction file
+        self.transaction_file       : (str)     Directory to transaction ledger
         self.account_file           : (str)     Director to account file
 
 NOTE: Only one of the stock_amount or dollar_amount is needed as the class will calculate the whichever isnt given using
       the current stock price. This is done because to know both at the same time, the current stock price is needed
+NOTE: The current stock price is the quote the stock was last updated with, unless it is too old, so the transaction
+      fills at the price the algorithm saw without getting the price again
 NOTE: Transaction and account file are used ot save transaction and account data for later on
+NOTE: The transaction doesn't keep a reference to its account or stock, they are passed into the method that performs
+      the transaction, so a saved transaction only holds its own values
 
 """
 
 from datetime import datetime
 
+from libraries.Quote import Quote, DEFAULT_MAX_QUOTE_AGE_SECONDS
+from libraries.TransactionLedger import TransactionLedger, TRANSACTION_TYPE_NAMES
+
+# Error number saved for an error message without an ERROR#N
+ERROR_CODE_UNKNOWN = 255
+
 
 class Transaction:
-    def __init__(self, account=None, ticker=None, stock=None, stock_amount=0.0, dollar_amount=0.0, transaction_file=None,
-                 account_file=None, error=""):
+    # Fixed set of attributes, so each transaction doesn't carry its own attribute dictionary
+    __slots__ = ('transaction_number', 'account_number', 'ticker', 'type', 'stock_amount', 'dollar_amount',
+                 'stock_price', 'transaction_file', 'account_file', 'error')
+
+    def __init__(self, account_number=None, ticker=None, stock=None, stock_amount=0.0, dollar_amount=0.0,
+                 transaction_file=None, account_file=None, error="", quote=None,
+                 max_quote_age=DEFAULT_MAX_QUOTE_AGE_SECONDS):
         self.transaction_number = datetime.today().strftime('%Y-%m-%d-%H:%M:%S')
-        self.account = account
+        self.account_number = account_number
         self.ticker = ticker
         self.type = None
         self.stock_amount = stock_amount # only populate one of either stock amount or dollar amount
         self.dollar_amount = dollar_amount
-        self.stock = stock
+        self.stock_price = None
         if self.ticker is not None:
-            self.stock_price = float(stock.get_current_price(ticker))
+            self.stock_price = self.get_fill_quote(ticker, stock, quote, max_quote_age).price
         self.transaction_file = transaction_file
         self.account_file = account_file
         self.error = error
 
-    def write_transaction_to_file(self):
+    @staticmethod
+    def get_fill_quote(ticker: str, stock, quote=None, max_quote_age: float = DEFAULT_MAX_QUOTE_AGE_SECONDS) -> Quote:
         """
-        write the desired transaction to the given transaction file.
+        Get the quote to fill the transaction at. The given quote is used, or if there isn't one the quote from the
+        stock's last update, so the fill is at the price the decision was made on. The price is only gotten again if
+        there is no quote or it is older than max_quote_age.
+
+        :param ticker: (str): Ticker of the stock
+        :param stock: (StockBaseClass): The stock being bought or sold
+        :param quote: (Quote): The quote to fill at, the stock's last quote if None
+        :param max_quote_age: (float): The oldest in seconds a quote can be and still be filled at
+        :return: (Quote): The quote to fill at
 
         """
-        file = open(self.transaction_file, "a")
+        quote = quote if quote is not None else stock.last_quote
+        if quote is None or quote.ticker != ticker or quote.is_stale(max_quote_age):
+            quote = stock.get_current_quote(ticker)
+        return quote
 
-        # check if error message:
-        if self.error:
-            file.write(str(datetime.today().strftime('%Y-%m-%d-%H:%M:%S')) + " account: " +
-                       str(self.account.account_number) + " : " +
-                       str(self.error) + '\n')
-        else:
-            if self.type == "DEPOSIT":
-                file.write(str(datetime.today().strftime('%Y-%m-%d-%H:%M:%S')) + " account: " +
-                           str(self.account.account_number) + " : " +
-                           self.type + "  -> " +
-                           str(self.dollar_amount) + " total: " +
-                           str(self.account.money) + '\n')
-
-            elif self.type == "WITHDRAW":
-                file.write(str(datetime.today().strftime('%Y-%m-%d-%H:%M:%S'))  + " account: " +
-                           str(self.account.account_number) + " : " +
-                           self.type + " -> " +
-                           str(self.dollar_amount) + " total: " +
-                           str(self.account.money) + '\n')
-            else:
-                file.write(str(datetime.today().strftime('%Y-%m-%d-%H:%M:%S'))  + " account: " +
-                           str(self.account.account_number) + " : " +
-                           self.type + "      -> " +
-                           str(self.stock_amount) + " " +
-                           str(self.ticker) + " at $" +
-                           str(self.stock_price) + " total: $" +
-                           str(self.stock_amount * self.stock_price ) + ' balance: ' +
-                           str(self.account.money) + '\n')
-        file.close()
-
-    def deposit(self):
+    @classmethod
+    def from_ledger_record(cls, record, transaction_file=None, account_file=None) -> 'Transaction':
+        """
+        Create a transaction from its record in the transaction ledger, without getting the stock price again.
+
+        :param record: (np.void): The LEDGER_DTYPE record of the transaction
+        :param transaction_file: (Path): The transaction ledger the record is from
+        :param account_file: (Path): The account file of the account
+        :return: (Transaction): The transaction
+
+        """
+        transaction = cls(account_number=record['account'].decode(), transaction_file=transaction_file,
+                          account_file=account_file)
+        transaction.transaction_number = datetime.fromtimestamp(int(record['timestamp'])).strftime('%Y-%m-%d-%H:%M:%S')
+        transaction.ticker = record['ticker'].decode() or None
+        transaction.type = TRANSACTION_TYPE_NAMES.get(int(record['type']))
+        transaction.stock_amount = float(record['quantity'])
+        transaction.dollar_amount = float(record['dollar_amount'])
+        price = float(record['price'])
+        transaction.stock_price = None if price != price else price
+        transaction.error = f"ERROR#{int(record['error_code'])}" if record['error_code'] else ""
+        return transaction
+
+    def get_error_code(self) -> int:
+        """
+        Get the error number of the transaction, from the ERROR#N at the start of the error message.
+
+        :return: (int): The error number, 0 if the transaction has no error
+
+        """
+        if not self.error:
+            return 0
+        try:
+            return int(self.error.split(":")[0].split("#")[1])
+        except (IndexError, ValueError):
+            return ERROR_CODE_UNKNOWN
+
+    def write_transaction_to_file(self, balance: float):
+        """
+        write the desired transaction to the given transaction ledger.
+
+        :param balance: (float): The money in the account after the transaction
+
+        """
+        TransactionLedger.get_ledger(self.transaction_file).write(account=self.account_number,
+                                                                  transaction_type=self.type,
+                                                                  ticker=self.ticker,
+                                                                  quantity=self.stock_amount,
+                                                                  price=self.stock_price,
+                                                                  dollar_amount=self.dollar_amount,
+                                                                  cash_after=balance,
+                                                                  error_code=self.get_error_code())
+
+    def deposit(self, account):
         """
         Deposit money into the account. Record it in the transaction file and add it to the account class.
 
+        :param account: (AccountLibrary): The account to deposit into
+
         """
         self.type = "DEPOSIT"
-        self.account.money += self.dollar_amount
-        self.write_transaction_to_file()
-        self.account.transactions.append(self)
+        account.money += self.dollar_amount
+        self.write_transaction_to_file(account.money)
+        account.transactions.append(self)
 
-    def withdraw(self):
+    def withdraw(self, account):
         """
         Withdraw money from the account. Record it in the transaction file and add it to the account class.
 
+        :param account: (AccountLibrary): The account to withdraw from
+
         """
         self.type = "WITHDRAW"
-        if self.account.money > self.dollar_amount:
-            self.account.money -= self.dollar_amount
-            self.write_transaction_to_file()
-            self.account.transactions.append(self)
+        if account.money > self.dollar_amount:
+            account.money -= self.dollar_amount
+            self.write_transaction_to_file(account.money)
+            account.transactions.append(self)
         else:
             print("ERROR: Not enough money to withdraw! Attempted to withdraw [%s], only [%s] available",
-                  self.dollar_amount, self.account.money)
-            self.error = (f"ERROR#1: Not-enough-funds-to-withdraw: Funds {self.account.money} Request "
+                  self.dollar_amount, account.money)
+            self.error = (f"ERROR#1: Not-enough-funds-to-withdraw: Funds {account.money} Request "
                           f"{self.dollar_amount}")
-            self.write_transaction_to_file()
+            self.write_transaction_to_file(account.money)
             raise AssertionError
 
-    def buy(self):
+    def buy(self, account, stock):
         """
         Buy the desired stock.
             - Populate the stock_amount if the dollar_amount isnt given and vice versa
@@ -119,6 +173,9 @@ class Transaction:
             - Check if the stock ticker already exist inside the account, if not add it
             - Record and save transaction to file and into account object
 
+        :param account: (AccountLibrary): The account to buy the stock in
+        :param stock: (StockBaseClass): The stock to add to the account if it isn't owned yet
+
         """
         self.type = "BUY"
         # Calibrate stock and dollar amount
@@ -135,32 +192,32 @@ class Transaction:
             self.stock_amount = self.dollar_amount / self.stock_price
 
         # Check if transaction can be made/have enough money to buy required amount
-        if self.dollar_amount > self.account.money:
+        if self.dollar_amount > account.money:
             print("Error: Not enough money, attempted to buy [%s] amount of stock, only have [%s] funds available",
-                  self.dollar_amount, self.account.money)
-            self.error = f"ERROR#2: Not-enough-funds-to-buy {self.ticker}: Funds {self.account.money} " \
+                  self.dollar_amount, account.money)
+            self.error = f"ERROR#2: Not-enough-funds-to-buy {self.ticker}: Funds {account.money} " \
                          f"Request: {self.dollar_amount}"
-            self.write_transaction_to_file()
+            self.write_transaction_to_file(account.money)
             raise AssertionError
 
         else:
             # Transaction good to go!
-            self.account.money -= self.dollar_amount
+            account.money -= self.dollar_amount
             # check if stock is already owned
-            if self.ticker in self.account.stocks:
-                self.account.stocks[self.ticker].quantity += self.stock_amount
-                self.account.stocks[self.ticker].last_price = self.stock_price
+            if self.ticker in account.stocks:
+                account.stocks[self.ticker].quantity += self.stock_amount
+                account.stocks[self.ticker].last_price = self.stock_price
             else:
-                self.stock.quantity = self.stock_amount
-                self.stock.buy_price = self.stock_price
-                self.stock.new_high = self.stock_price
-                self.stock.last_price = self.stock_price
-                self.account.stocks[self.ticker] = self.stock
+                stock.quantity = self.stock_amount
+                stock.buy_price = self.stock_price
+                stock.new_high = self.stock_price
+                stock.last_price = self.stock_price
+                account.stocks[self.ticker] = stock
 
-            self.write_transaction_to_file()
-            self.account.transactions.append(self)
+            self.write_transaction_to_file(account.money)
+            account.transactions.append(self)
 
-    def sell(self):
+    def sell(self, account):
         """
         Sell the desired stock.
             - Populate the stock_amount if the dollar_amount isnt given and vice versa
@@ -169,6 +226,8 @@ class Transaction:
             - Check if the stock ticker already exist inside the account, if not raise an error
             - Record and save transaction to file and into account object
 
+        :param account: (AccountLibrary): The account to sell the stock from
+
         """
         self.type = "SELL"
         # Calibrate stock and dollar amount
@@ -182,30 +241,30 @@ class Transaction:
             self.stock_amount = self.dollar_amount / self.stock_price
 
         # check if have stock
-        if self.ticker not in self.account.stocks:
+        if self.ticker not in account.stocks:
             print("ERROR: Stock", self.ticker, " is not owned")
             self.error = f"ERROR#3: Stock {self.ticker} not-owned"
-            self.write_transaction_to_file()
+            self.write_transaction_to_file(account.money)
             raise AssertionError # Potentially remove errors later so program can keep running
         else:
             # Check if transaction can be made
-            if self.account.stocks[self.ticker].quantity < self.stock_amount:
+            if account.stocks[self.ticker].quantity < self.stock_amount:
                 print("ERROR: Not enough stock, [%s] stocks available, [%s] attempted to be removed",
-                      self.account.stocks[self.ticker].quantity, self.stock_amount)
-                self.error = f"ERROR#4: Not-enough-stock {self.ticker} to-sell, Have: {self.account.stocks[self.ticker].quantity}, " \
+                      account.stocks[self.ticker].quantity, self.stock_amount)
+                self.error = f"ERROR#4: Not-enough-stock {self.ticker} to-sell, Have: {account.stocks[self.ticker].quantity}, " \
                              f"Requested {self.stock_amount}"
-                self.write_transaction_to_file()
+                self.write_transaction_to_file(account.money)
                 raise AssertionError # Potentially remove errors later so program can keep running
 
             else:
                 # Transaction good to go!
-                self.account.money += self.dollar_amount
-                self.account.stocks[self.ticker].quantity -= self.stock_amount
-                self.account.stocks[self.ticker].last_price = self.stock_price
-                self.account.stocks[self.ticker].sell_price = self.stock_price
-                self.account.stocks[self.ticker].new_low = self.stock_price
-                self.write_transaction_to_file()
-                self.account.transactions.append(self)
+                account.money += self.dollar_amount
+                account.stocks[self.ticker].quantity -= self.stock_amount
+                account.stocks[self.ticker].last_price = self.stock_price
+                account.stocks[self.ticker].sell_price = self.stock_price
+                account.stocks[self.ticker].new_low = self.stock_price
+                self.write_transaction_to_file(account.money)
+                account.transactions.append(self)
 
     def print_transaction(self):
         """
@@ -216,7 +275,7 @@ class Transaction:
         if self.type == "DEPOSIT" or "WITHDRAW":
             print("TRANSACTION  PRINT**")
             print(f"   transaction_number   :  {self.transaction_number}")
-            print(f"   account_number       :  {self.account.account_number}")
+            print(f"   account_number       :  {self.account_number}")
             print(f"   type                 :  {self.type}")
             print(f"   dollar_amount        :  {self.dollar_amount}")
             print(f"   transaction_file     :  {self.transaction_file}")
@@ -225,7 +284,7 @@ class Transaction:
         else:
             print("TRANSACTION  PRINT**")
             print(f"   transaction_number   :  {self.transaction_number}")
-            print(f"   account_number       :  {self.account.account_number}")
+            print(f"   account_number       :  {self.account_number}")
             print(f"   ticker               :  {self.ticker}")
             print(f"   type                 :  {self.type}")
             print(f"   stock_amount         :  {self.stock_amount}")
@@ -0,0 +1,176 @@
+"""
+Author: Joel Yuhas
+Date: October 17th, 2026
+
+TransactionHistory
+
+History of an account's transactions that only keeps the most recent ones in memory. Every transaction is written to
+the account's transaction ledger when it is made, so once a transaction is pushed out of the ring of recent
+transactions it is still in the ledger, and is read back from there when it is asked for. The memory of a long running
+account stays the same however many transactions it has made.
+
+Like the list of transactions it replaces, the history only has the transactions that went through. Failed
+transactions are in the ledger with their error code but are left out of the history.
+
+    - len(history) is the number of transactions in the whole history
+    - history[i] gets a transaction by its place in the whole history, from memory if it is recent
+    - iterating the history goes through the whole history, a page of transactions from the ledger at a time
+    - history.recent is the ring of recent transactions that are in memory
+
+Ledger records are all the same size, so a transaction is read from the ledger by seeking straight to its record. The
+history keeps the places of the failed records in the ledger to know which record a transaction is, which is a short
+list since few transactions fail. The list is brought up to date with only the records written since it was last
+updated.
+
+"""
+from collections import deque
+from pathlib import Path
+from typing import Iterator
+
+import numpy as np
+
+from libraries.Transaction import Transaction
+from libraries.TransactionLedger import TransactionLedger
+
+# Number of recent transactions kept in memory
+DEFAULT_RECENT_TRANSACTIONS = 100
+
+# Number of transactions read from the ledger at a time
+DEFAULT_PAGE_SIZE = 1000
+
+# Number of ledger records read at a time when finding the failed records
+DEFAULT_INDEX_CHUNK = 65536
+
+
+class TransactionHistory:
+    def __init__(self, ledger_file: Path, account_file: Path = None,
+                 max_recent: int = DEFAULT_RECENT_TRANSACTIONS):
+        self.ledger_file = ledger_file
+        self.account_file = account_file
+        self.recent = deque(maxlen=max_recent)
+        # Number of ledger records gone through so far, and the places in the ledger of the failed ones among them
+        self.indexed_records = 0
+        self.failed_records = np.empty(0, dtype=np.int64)
+
+    def set_ledger_file(self, ledger_file: Path, account_file: Path = None):
+        """
+        Change the ledger the history is read from, like when an account is loaded from a file.
+
+        :param ledger_file: (Path): The transaction ledger of the account
+        :param account_file: (Path): The account file, saved in the transactions read from the ledger
+
+        """
+        if ledger_file != self.ledger_file:
+            self.recent.clear()
+            self.indexed_records = 0
+            self.failed_records = np.empty(0, dtype=np.int64)
+        self.ledger_file = ledger_file
+        self.account_file = account_file
+
+    def append(self, transaction: Transaction):
+        """
+        Add a transaction that went through to the history. It has to already be written to the ledger.
+
+        :param transaction: (Transaction): The transaction
+
+        """
+        self.recent.append(transaction)
+
+    def update_index(self):
+        """
+        Find the failed records among the ledger records written since the last update.
+
+        """
+        # Records still in the open ledger's buffer are written first so they can be counted
+        if Path(self.ledger_file) in TransactionLedger.open_ledgers:
+            TransactionLedger.open_ledgers[Path(self.ledger_file)].flush()
+        record_count = TransactionLedger.get_record_count(self.ledger_file)
+        if record_count < self.indexed_records:
+            # The ledger was written over, start over
+            self.indexed_records = 0
+            self.failed_records = np.empty(0, dtype=np.int64)
+
+        while self.indexed_records < record_count:
+            records = TransactionLedger.read_records(self.ledger_file, self.indexed_records,
+                                                     min(record_count - self.indexed_records, DEFAULT_INDEX_CHUNK))
+            if len(records) == 0:
+                break
+            failed = np.flatnonzero(records['error_code'] != 0)
+            if len(failed):
+                self.failed_records = np.concatenate((self.failed_records, failed + self.indexed_records))
+            self.indexed_records = self.indexed_records + len(records)
+
+    def get_record_index(self, index: int) -> int:
+        """
+        Get the place in the ledger of the record of a transaction in the history.
+
+        :param index: (int): Place of the transaction in the history
+        :return: (int): Place of its record in the ledger
+
+        """
+        # Number of transactions that went through before each failed record, which only goes up, so the failed records
+        # before the transaction are the ones with at most index transactions before them
+        successes_before_failed = self.failed_records - np.arange(len(self.failed_records))
+        return index + int(np.searchsorted(successes_before_failed, index, side="right"))
+
+    def __len__(self) -> int:
+        self.update_index()
+        # Transactions added before there was a ledger to count them in
+        return max(self.indexed_records - len(self.failed_records), len(self.recent))
+
+    def __getitem__(self, index: int) -> Transaction:
+        count = len(self)
+        if index < 0:
+            index = index + count
+        if not 0 <= index < count:
+            raise IndexError("transaction history index out of range")
+
+        # Recent transactions are the last ones of the history
+        recent_start = count - len(self.recent)
+        if index >= recent_start:
+            return self.recent[index - recent_start]
+        return self.get_page(index, 1)[0]
+
+    def __iter__(self) -> Iterator[Transaction]:
+        for page in self.iter_pages():
+            yield from page
+
+    def get_page(self, start: int, page_size: int = DEFAULT_PAGE_SIZE) -> list[Transaction]:
+        """
+        Get a page of the history from the ledger, reading from the record of its first transaction.
+
+        :param start: (int): Place in the history of the first transaction of the page
+        :param page_size: (int): Number of transactions in the page
+        :return: (list[Transaction]): The transactions, fewer than page_size at the end of the history
+
+        """
+        self.update_index()
+        page = []
+        record_index = self.get_record_index(max(start, 0))
+        while len(page) < page_size:
+            records = TransactionLedger.read_records(self.ledger_file, record_index, page_size - len(page))
+            if len(records) == 0:
+                break
+            for record in records[records['error_code'] == 0]:
+                page.append(Transaction.from_ledger_record(record, self.ledger_file, self.account_file))
+            record_index = record_index + len(records)
+        return page
+
+    def iter_pages(self, page_size: int = DEFAULT_PAGE_SIZE) -> Iterator[list[Transaction]]:
+        """
+        Go through the whole history a page at a time, reading the ledger as it goes so only one page of older
+        transactions is in memory at a time.
+
+        :param page_size: (int): Number of transactions in each page
+        :return: (Iterator[list[Transaction]]): The pages of transactions, oldest first
+
+        """
+        page = []
+        for records in TransactionLedger.iter_records(self.ledger_file, chunk_records=max(page_size, 1)):
+            for record in records[records['error_code'] == 0]:
+                page.append(Transaction.from_ledger_record(record, self.ledger_file, self.account_file))
+                if len(page) == page_size:
+                    yield page
+                    page = []
+        if page:
+            yield page
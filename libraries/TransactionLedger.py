@@ -0,0 +1,346 @@
+"""
+Author: Joel Yuhas
+Date: October 17th, 2026
+
+TransactionLedger
+
+Binary ledger of an account's transactions, transaction_{N}.ledger, with one fixed size record per transaction instead
+of a line of free text. Every record has the same fields, LEDGER_DTYPE, so the whole ledger can be read back as a numpy
+structured array for analysis, or streamed a chunk of records at a time for long ledgers.
+
+Records are written through a buffered writer. How often they are made durable is set by the durability level:
+    - DURABILITY_BUFFERED   : Records are written when the buffer fills and when the ledger is closed. Fastest, but a
+                              crash can lose the records still in the buffer
+    - DURABILITY_GROUP      : Records are written every transaction, and synced to disk once GROUP_COMMIT_SIZE records
+                              or GROUP_COMMIT_SECONDS have gone by since the last sync. A crash of the program loses
+                              nothing, a power loss at most the last group
+    - DURABILITY_SYNC       : Every record is synced to disk before the transaction returns
+
+Open ledgers are kept by file so every transaction of an account shares the same writer, and they are all closed, which
+syncs the last records, when the program exits.
+
+Text transaction files from before the ledger, transaction_{N}.txt, can be converted with convert_text_file.
+
+"""
+import atexit
+import os
+import re
+import struct
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Iterator, Optional
+
+import numpy as np
+
+# Start of every ledger file, with the version of the record layout
+LEDGER_MAGIC = b"ACLEDGR1"
+
+# Fields of a ledger record. Accounts and tickers are kept as text since account numbers like 0.5 are in use
+LEDGER_DTYPE = np.dtype([('transaction_id', '<i8'), ('timestamp', '<i8'), ('account', 'S16'), ('type', 'u1'),
+                         ('ticker', 'S16'), ('quantity', '<f8'), ('price', '<f8'), ('dollar_amount', '<f8'),
+                         ('cash_after', '<f8'), ('error_code', 'u1')])
+LEDGER_RECORD = struct.Struct("<qq16sB16sddddB")
+
+# Transaction types as stored in the ledger, 0 is not used
+TRANSACTION_TYPES = {"DEPOSIT": 1, "WITHDRAW": 2, "BUY": 3, "SELL": 4}
+TRANSACTION_TYPE_NAMES = {code: name for name, code in TRANSACTION_TYPES.items()}
+
+# Durability levels
+DURABILITY_BUFFERED = "buffered"
+DURABILITY_GROUP = "group"
+DURABILITY_SYNC = "sync"
+DEFAULT_DURABILITY = DURABILITY_GROUP
+
+# Records or seconds between syncs of DURABILITY_GROUP, and records buffered by DURABILITY_BUFFERED
+GROUP_COMMIT_SIZE = 64
+GROUP_COMMIT_SECONDS = 1.0
+
+# Records read at a time when streaming the ledger
+DEFAULT_CHUNK_RECORDS = 65536
+
+# Lines of the text transaction files, and the format of their dates
+TEXT_LINE_PATTERN = re.compile(r"^(\S+) account: (\S+) : (.*)$")
+TEXT_CASH_PATTERN = re.compile(r"^(DEPOSIT|WITHDRAW)\s+-> (\S+) total: (\S+)$")
+TEXT_STOCK_PATTERN = re.compile(r"^(BUY|SELL)\s+-> (\S+) (\S+) at \$(\S+) total: \$(\S+) balance: (\S+)$")
+TEXT_ERROR_PATTERN = re.compile(r"^ERROR#(\d+):")
+TEXT_FUNDS_PATTERN = re.compile(r"Funds (\S+)")
+TEXT_DATE_FORMAT = "%Y-%m-%d-%H:%M:%S"
+# Transaction type of each error number in the text files
+ERROR_TRANSACTION_TYPES = {1: "WITHDRAW", 2: "BUY", 3: "SELL", 4: "SELL"}
+
+
+class TransactionLedger:
+    # Open ledgers by file, so every transaction of an account writes through the same ledger
+    open_ledgers: dict = {}
+
+    def __init__(self, ledger_file: Path, durability: str = DEFAULT_DURABILITY):
+        if durability not in (DURABILITY_BUFFERED, DURABILITY_GROUP, DURABILITY_SYNC):
+            print(f"Unknown ledger durability {durability}")
+            raise AssertionError
+        self.ledger_file = Path(ledger_file)
+        self.durability = durability
+        self.file = None
+        self.buffer = bytearray()
+        self.buffered_records = 0
+        self.unsynced_records = 0
+        self.last_sync = time.monotonic()
+        self.next_transaction_id = 1
+
+    @classmethod
+    def get_ledger(cls, ledger_file: Path, durability: str = None) -> 'TransactionLedger':
+        """
+        Get the open ledger of the file, opening it if it isn't open yet.
+
+        :param ledger_file: (Path): The ledger file
+        :param durability: (str): The durability level to open the ledger with, keeps the current one if already open
+        :return: (TransactionLedger): The open ledger
+
+        """
+        ledger_file = Path(ledger_file)
+        if ledger_file not in cls.open_ledgers:
+            ledger = TransactionLedger(ledger_file, durability or DEFAULT_DURABILITY)
+            ledger.open()
+            cls.open_ledgers[ledger_file] = ledger
+        elif durability is not None:
+            cls.open_ledgers[ledger_file].durability = durability
+        return cls.open_ledgers[ledger_file]
+
+    @classmethod
+    def close_all(cls):
+        """
+        Close every open ledger, writing and syncing their last records.
+
+        """
+        for ledger in list(cls.open_ledgers.values()):
+            ledger.close()
+
+    @classmethod
+    def flush_all(cls, sync: bool = False):
+        """
+        Write the buffered records of every open ledger, like at the end of a trading engine cycle.
+
+        :param sync: (bool): Also sync every written record to disk
+
+        """
+        for ledger in list(cls.open_ledgers.values()):
+            ledger.flush(sync=sync)
+
+    @staticmethod
+    def get_record_count(ledger_file: Path) -> int:
+        """
+        Get the number of complete records in a ledger file.
+
+        :param ledger_file: (Path): The ledger file
+        :return: (int): The number of records, 0 if the file doesn't exist
+
+        """
+        if not Path(ledger_file).is_file():
+            return 0
+        return max(0, Path(ledger_file).stat().st_size - len(LEDGER_MAGIC)) // LEDGER_DTYPE.itemsize
+
+    def open(self):
+        """
+        Open the ledger file for writing, creating it if needed. A record that was only partly written at the end, like
+        from a crash in the middle of a write, is cut off.
+
+        """
+        if self.file is not None:
+            return
+
+        self.ledger_file.parent.mkdir(parents=True, exist_ok=True)
+        self.file = open(self.ledger_file, "a+b")
+        self.file.seek(0)
+        magic = self.file.read(len(LEDGER_MAGIC))
+        if not magic:
+            self.file.write(LEDGER_MAGIC)
+            self.file.flush()
+        elif magic != LEDGER_MAGIC:
+            print(f"{self.ledger_file} is not a transaction ledger")
+            self.file.close()
+            self.file = None
+            raise AssertionError
+
+        record_count = self.get_record_count(self.ledger_file)
+        complete_size = len(LEDGER_MAGIC) + record_count * LEDGER_DTYPE.itemsize
+        if self.ledger_file.stat().st_size > complete_size:
+            print(f"Dropping partly written record at the end of {self.ledger_file}")
+            self.file.truncate(complete_size)
+        self.next_transaction_id = record_count + 1
+
+    def write(self, account, transaction_type: str, ticker: Optional[str] = None, quantity: float = 0.0,
+              price: Optional[float] = None, dollar_amount: float = 0.0, cash_after: float = 0.0,
+              error_code: int = 0, timestamp: datetime = None) -> int:
+        """
+        Add a transaction to the ledger.
+
+        :param account: (int|str): The account number
+        :param transaction_type: (str): The type of transaction: DEPOSIT, WITHDRAW, BUY, SELL
+        :param ticker: (str): The ticker of the stock, None for deposits and withdraws
+        :param quantity: (float): The number of stocks bought or sold
+        :param price: (float): The price of the stock, None for deposits and withdraws
+        :param dollar_amount: (float): The dollar amount of the transaction
+        :param cash_after: (float): The money in the account after the transaction
+        :param error_code: (int): The error number of a transaction that failed, 0 if it didn't
+        :param timestamp: (datetime): When the transaction was made, defaults to now
+        :return: (int): The transaction id of the record
+
+        """
+        self.open()
+        transaction_id = self.next_transaction_id
+        self.next_transaction_id = transaction_id + 1
+        timestamp = timestamp or datetime.now()
+        self.buffer += LEDGER_RECORD.pack(transaction_id, int(timestamp.timestamp()), str(account).encode(),
+                                          TRANSACTION_TYPES.get(transaction_type, 0), (ticker or "").encode(),
+                                          float(quantity or 0.0), np.nan if price is None else float(price),
+                                          float(dollar_amount or 0.0), float(cash_after), int(error_code))
+        self.buffered_records = self.buffered_records + 1
+
+        if self.durability == DURABILITY_SYNC:
+            self.flush(sync=True)
+        elif self.durability == DURABILITY_GROUP:
+            self.flush(sync=self.unsynced_records + self.buffered_records >= GROUP_COMMIT_SIZE or
+                       time.monotonic() - self.last_sync >= GROUP_COMMIT_SECONDS)
+        elif self.buffered_records >= GROUP_COMMIT_SIZE:
+            self.flush()
+
+        return transaction_id
+
+    def flush(self, sync: bool = False):
+        """
+        Write the buffered records to the ledger file.
+
+        :param sync: (bool): Also sync every written record to disk
+
+        """
+        if self.file is None:
+            return
+        if self.buffer:
+            self.file.write(self.buffer)
+            self.file.flush()
+            self.unsynced_records = self.unsynced_records + self.buffered_records
+            self.buffer = bytearray()
+            self.buffered_records = 0
+        if sync and self.unsynced_records:
+            os.fsync(self.file.fileno())
+            self.unsynced_records = 0
+            self.last_sync = time.monotonic()
+
+    def close(self):
+        """
+        Write and sync the last records and close the ledger file.
+
+        """
+        if self.file is not None:
+            self.flush(sync=True)
+            self.file.close()
+            self.file = None
+        if TransactionLedger.open_ledgers.get(self.ledger_file) is self:
+            del TransactionLedger.open_ledgers[self.ledger_file]
+
+    @staticmethod
+    def read_records(ledger_file: Path, start: int = 0, count: Optional[int] = None) -> np.ndarray:
+        """
+        Read records of a ledger file. Records of an open ledger that are still in its buffer are written first.
+
+        :param ledger_file: (Path): The ledger file
+        :param start: (int): The first record to read, 0 is the first record of the ledger
+        :param count: (int): The number of records to read, all of the rest if not given
+        :return: (np.ndarray): The records, a LEDGER_DTYPE structured array
+
+        """
+        ledger_file = Path(ledger_file)
+        if ledger_file in TransactionLedger.open_ledgers:
+            TransactionLedger.open_ledgers[ledger_file].flush()
+
+        record_count = TransactionLedger.get_record_count(ledger_file)
+        start = min(max(start, 0), record_count)
+        count = record_count - start if count is None else min(count, record_count - start)
+        if count <= 0:
+            return np.empty(0, dtype=LEDGER_DTYPE)
+        with open(ledger_file, "rb") as file:
+            if file.read(len(LEDGER_MAGIC)) != LEDGER_MAGIC:
+                print(f"{ledger_file} is not a transaction ledger")
+                raise AssertionError
+            return np.fromfile(file, dtype=LEDGER_DTYPE, count=count,
+                               offset=start * LEDGER_DTYPE.itemsize)
+
+    @staticmethod
+    def iter_records(ledger_file: Path, chunk_records: int = DEFAULT_CHUNK_RECORDS) -> Iterator[np.ndarray]:
+        """
+        Stream the records of a ledger file, a chunk of records at a time, so a long ledger doesn't have to fit in
+        memory at once.
+
+        :param ledger_file: (Path): The ledger file
+        :param chunk_records: (int): The number of records in each chunk
+        :return: (Iterator[np.ndarray]): The chunks of records, LEDGER_DTYPE structured arrays
+
+        """
+        start = 0
+        while True:
+            records = TransactionLedger.read_records(ledger_file, start=start, count=chunk_records)
+            if len(records) == 0:
+                return
+            yield records
+            start = start + len(records)
+
+    @staticmethod
+    def convert_text_file(text_file: Path, ledger_file: Path) -> int:
+        """
+        Convert a text transaction file from before the ledger into a ledger file. Lines that can't be read are skipped
+        and reported once at the end.
+
+        :param text_file: (Path): The text transaction file
+        :param ledger_file: (Path): The ledger file to write, replaced if it already exists
+        :return: (int): The number of transactions converted
+
+        """
+        ledger_file = Path(ledger_file)
+        if ledger_file in TransactionLedger.open_ledgers:
+            TransactionLedger.open_ledgers[ledger_file].close()
+        if ledger_file.is_file():
+            ledger_file.unlink()
+
+        ledger = TransactionLedger(ledger_file, DURABILITY_BUFFERED)
+        bad_lines = []
+        try:
+            with open(text_file, "r") as file:
+                for line_number, line in enumerate(file, start=1):
+                    line = line.strip()
+                    if not line:
+                        continue
+                    line_match = TEXT_LINE_PATTERN.match(line)
+                    try:
+                        timestamp = datetime.strptime(line_match.group(1), TEXT_DATE_FORMAT)
+                        account = line_match.group(2)
+                        body = line_match.group(3)
+                        cash_match = TEXT_CASH_PATTERN.match(body)
+                        stock_match = TEXT_STOCK_PATTERN.match(body)
+                        error_match = TEXT_ERROR_PATTERN.match(body)
+                        if cash_match:
+                            ledger.write(account, cash_match.group(1), dollar_amount=float(cash_match.group(2)),
+                                         cash_after=float(cash_match.group(3)), timestamp=timestamp)
+                        elif stock_match:
+                            ledger.write(account, stock_match.group(1), ticker=stock_match.group(3),
+                                         quantity=float(stock_match.group(2)), price=float(stock_match.group(4)),
+                                         dollar_amount=float(stock_match.group(5)),
+                                         cash_after=float(stock_match.group(6)), timestamp=timestamp)
+                        elif error_match:
+                            error_code = int(error_match.group(1))
+                            funds_match = TEXT_FUNDS_PATTERN.search(body)
+                            ledger.write(account, ERROR_TRANSACTION_TYPES.get(error_code),
+                                         cash_after=float(funds_match.group(1)) if funds_match else np.nan,
+                                         error_code=error_code, timestamp=timestamp)
+                        else:
+                            bad_lines.append(line_number)
+                    except (AttributeError, ValueError):
+                        bad_lines.append(line_number)
+        finally:
+            ledger.close()
+
+        if bad_lines:
+            print(f"Skipped {len(bad_lines)} lines of {text_file} that could not be read, first at line {bad_lines[0]}")
+        return ledger.next_transaction_id - 1
+
+
+atexit.register(TransactionLedger.close_all)
@@ -12,9 +12,11 @@ NOTE: May but into a helper/buildingblocks class later on, but for now the metho
 """
 
 import datetime
+import math
 import time
 import pause
 import socket
+import sqlite3
 from pathlib import Path
 
 # The hard coded computer name and directories. Can update later to use env variables but works for now
@@ -62,8 +64,19 @@ TRADE_OPENING_BUFFER_HIBERNATION_MIN = 30
 # Interval wait time constant
 DEFAULT_ALGORITHM_CYCLE_TIME_SECONDS = 60
 
+# Connection settings for the long-lived sqlite connections. WAL journaling lets readers keep reading while a writer
+# writes, and NORMAL synchronous only syncs at checkpoints instead of on every commit
+SQLITE_JOURNAL_MODE = "WAL"
+SQLITE_SYNCHRONOUS = "NORMAL"
+SQLITE_BUSY_TIMEOUT_SECONDS = 5.0
+
 DATABASE_PATH = ASTRO_HOME_PATH / 'databases' / 'developing_databases'
 OBSERVER_DATABASE_PATH = ASTRO_HOME_PATH / 'databases' / 'observer_databases'
+DOWNLOADED_DATABASE_PATH = ASTRO_HOME_PATH / 'databases' / 'downloaded_databases'
+PRICE_BOARD_PATH = OBSERVER_DATABASE_PATH / 'price_board.mmap'
+TICK_SOCKET_PATH = OBSERVER_DATABASE_PATH / 'ticks.sock'
+TICK_STORE_PATH = ASTRO_HOME_PATH / 'databases' / 'tick_databases'
+RETRO_DATABASE_PATH = ASTRO_HOME_PATH / 'databases' / 'retro_databases'
 LOGBASE_PATH = ASTRO_HOME_PATH / 'logs' / 'maintenance_logs'
 ACCOUNT_LOG_PATH = ASTRO_HOME_PATH / 'logs' / 'account_logs'
 PROGRAM_PATH = ASTRO_HOME_PATH / 'programs'
@@ -290,6 +303,86 @@ def trade_hours_and_wait_helper_advanced(interval_seconds: int = DEFAULT_ALGORIT
         return 2
 
 
+class IntervalScheduler:
+    """
+    Keeps a loop running on a fixed period, by waiting until absolute deadlines instead of sleeping a fixed time after
+    the work is done. Sleeping a fixed time makes the real period the interval plus however long the work took, so it
+    drifts more as the work grows.
+
+    Deadlines are aligned to wall clock boundaries of the interval (every 10 seconds on :00, :10, :20..., every 60
+    seconds on the minute), so loops with the same interval tick at the same times. If the work runs past the next
+    deadline, the overrun is reported and the missed deadlines are skipped instead of running back to back to catch up.
+
+    """
+    def __init__(self, interval_seconds: float, name: str = "loop"):
+        self.interval_seconds = interval_seconds
+        self.name = name
+        self.next_deadline = None
+        self.overrun_count = 0
+        self.skipped_ticks = 0
+
+    def get_aligned_deadline(self, now: float) -> float:
+        """
+        Get the first interval boundary after the given time.
+
+        :param now: (float): The time in epoch seconds
+        :return: (float): The next boundary in epoch seconds
+
+        """
+        return (math.floor(now / self.interval_seconds) + 1) * self.interval_seconds
+
+    def reset(self):
+        """
+        Forget the current deadline, so the next wait lines up with the next boundary without reporting an overrun.
+        Should be called after the loop has been paused, like outside trade hours.
+
+        """
+        self.next_deadline = None
+
+    def seconds_until_next_deadline(self) -> float:
+        """
+        Get the time left until the next deadline, moving on to the following deadline once the current one has
+        passed.
+
+        :return: (float): Seconds until the next deadline
+
+        """
+        now = time.time()
+        if self.next_deadline is None:
+            self.next_deadline = self.get_aligned_deadline(now)
+        elif now >= self.next_deadline:
+            missed_ticks = int((now - self.next_deadline) // self.interval_seconds)
+            if missed_ticks > 0:
+                self.overrun_count += 1
+                self.skipped_ticks += missed_ticks
+                print(f"{self.name} overran by {now - self.next_deadline:.2f} seconds, skipping {missed_ticks} tick(s)")
+            self.next_deadline += (missed_ticks + 1) * self.interval_seconds
+
+        return self.next_deadline - now
+
+    def wait(self):
+        """
+        Sleep until the next deadline.
+
+        """
+        time.sleep(max(self.seconds_until_next_deadline(), 0.0))
+
+
+def open_database_connection(file_name: Path) -> sqlite3.Connection:
+    """
+    Open a sqlite connection with the WAL journal, synchronous, and busy timeout settings used for long-lived
+    connections.
+
+    :param file_name: (Path): Filename and path of the database to connect to
+    :return: (sqlite3.Connection): The configured connection
+
+    """
+    conn = sqlite3.connect(file_name, timeout=SQLITE_BUSY_TIMEOUT_SECONDS)
+    conn.execute(f"PRAGMA journal_mode={SQLITE_JOURNAL_MODE}")
+    conn.execute(f"PRAGMA synchronous={SQLITE_SYNCHRONOUS}")
+    return conn
+
+
 def write_to_log(log_file: Path, message: str = "", overwrite: bool = True):
     """
     Use to write specific contents to a custom log file
@@ -5,12 +5,20 @@ Date: July 9th, 2023
 Background observer pattern program for exection.
 
 """
-import time
 import argparse
-from libraries.helper_functions import is_trade_hours, pause_until_trade_hours_start
+from libraries.helper_functions import is_trade_hours, pause_until_trade_hours_start, PRICE_BOARD_PATH, \
+    TICK_SOCKET_PATH, IntervalScheduler
 from libraries.ObserverPattern import ObserverPattern
+from libraries.PriceBoard import PriceBoard, DEFAULT_SLOT_COUNT
+from libraries.TickPublisher import TickPublisher
+from libraries.TickStore import TickStore
 
-WAIT_INTERVAL_SECONDS = 10
+# Time between observer passes. The passes start on the wall clock boundaries of the interval no matter how long the
+# fetch takes
+WAIT_INTERVAL_SECONDS = 20
+
+# Max time in seconds observed ticks can be held before they are committed. At 0, every pass is committed on its own
+MAX_WRITE_LATENCY_SECONDS = 0
 
 
 # need to make this dynamic
@@ -37,21 +45,29 @@ def main(args):
             print(line.rstrip())
             stock_list.append(line.rstrip())
 
-    observer_pattern = ObserverPattern()
-
-    # Create the observer pattern for the stocks in the list_of_stocks.txt file
-    for stock in stock_list:
-        observer_pattern.add_stock(stock)
+    # The observer holds its database connections, price board, and tick socket open, use them as a context so they
+    # are closed on shutdown. The board has a slot for every stock in the list
+    slot_count = max(DEFAULT_SLOT_COUNT, len(stock_list))
+    with PriceBoard(PRICE_BOARD_PATH, writer=True, slot_count=slot_count) as price_board, \
+            TickPublisher(TICK_SOCKET_PATH) as tick_publisher, \
+            ObserverPattern(price_board=price_board, tick_publisher=tick_publisher, tick_store=TickStore(),
+                            max_write_latency_seconds=MAX_WRITE_LATENCY_SECONDS) as observer_pattern:
+        # Create the observer pattern for the stocks in the list_of_stocks.txt file
+        for stock in stock_list:
+            observer_pattern.add_stock(stock)
 
-    # Main loop
-    while True:
-        if is_trade_hours():
-            observer_pattern.observer_all_stocks()
-            time.sleep(WAIT_INTERVAL_SECONDS)
-        else:
-            pause_until_trade_hours_start()
+        scheduler = IntervalScheduler(WAIT_INTERVAL_SECONDS, "observer")
 
-        time.sleep(WAIT_INTERVAL_SECONDS)
+        # Main loop
+        while True:
+            if is_trade_hours():
+                observer_pattern.observer_all_stocks()
+                scheduler.wait()
+            else:
+                # Close the connections while waiting so the databases aren't held open overnight
+                observer_pattern.close_all_connections()
+                pause_until_trade_hours_start()
+                scheduler.reset()
 
 
 args = arg_parser()
@@ -9,17 +9,20 @@ specific inputs.
 
 """
 import os
-import time
 import argparse
 
 
-from libraries.helper_functions import ACCOUNT_LOG_PATH, is_trade_hours, pause_until_trade_hours_start
+from libraries.helper_functions import ACCOUNT_LOG_PATH, TICK_SOCKET_PATH, is_trade_hours, \
+    pause_until_trade_hours_start, IntervalScheduler
 from libraries.AccountLibrary import AccountLibrary
 from libraries.StockFactory import StockFactory
+from libraries.StockSubClasses import StockRetro
+from libraries.TickPublisher import TickSubscriber
+from libraries.PriceArrayLibrary import wall_time_to_epoch
 from algorithms import rise_and_fall_transactions
 
 
-# Time to wait between updates in seconds
+# Max time to wait between updates in seconds, if the observer doesn't push a new tick before then
 WAIT_TIME_SECONDS = 60
 
 # The starting amount in dollars
@@ -39,6 +42,10 @@ def arg_parser():
     parser.add_argument("ticker", type=str, help="The desired stock ticker as string")
     parser.add_argument("loss_threshold", type=float, help="Threshold (int 0-100) percentage to sell at loss")
     parser.add_argument("gain_threshold", type=float, help="Threshold (int 0-100) percentage to buy at gain")
+    parser.add_argument("--retro", action="store_true",
+                        help="Run against the recorded stock values as fast as possible instead of the live market")
+    parser.add_argument("--retro_start", type=str, default=None,
+                        help="Date to start the retro run at in YYYY-MM-DD format, defaults to the first recorded value")
 
     # NOTE, may want this argument optional and if not produced,then goto default location
     # parser.add_argument("account_path", type=str, help="The Path location of the account directory")
@@ -54,10 +61,17 @@ def main(args):
     # start color
     os.system('color')
 
-    account_path = ACCOUNT_LOG_PATH / ('account_program_04_' + args.ticker)
-
     # load or create the account
-    stock_factory = StockFactory("observer")
+    if args.retro:
+        # Retro runs get their own account so they never touch the live account
+        account_path = ACCOUNT_LOG_PATH / ('account_program_04_retro_' + args.ticker)
+        stock_factory = StockFactory("retro")
+        if args.retro_start is not None:
+            StockRetro.seek(args.ticker, wall_time_to_epoch(args.retro_start, "%Y-%m-%d"))
+    else:
+        account_path = ACCOUNT_LOG_PATH / ('account_program_04_' + args.ticker)
+        # Board stocks read the observer's prices from memory, and fall back to the observer database if needed
+        stock_factory = StockFactory("board")
     account_one = AccountLibrary(account_number=args.account_number,
                                  account_path=account_path,
                                  stock_factory=stock_factory)
@@ -84,9 +98,18 @@ def main(args):
 
     account_one.print_account()
 
+    # Subscribe to the observer's ticks so the algorithm runs as soon as a new price is written
+    tick_subscriber = TickSubscriber(TICK_SOCKET_PATH)
+    # If no tick comes, fall back to updating on the wall clock boundaries of WAIT_TIME_SECONDS
+    scheduler = IntervalScheduler(WAIT_TIME_SECONDS, f"program_04 {args.ticker}")
+
     # Main loop!
     while True:
-        if is_trade_hours():
+        # Retro runs don't follow the trade hours, every loop is the next recorded value
+        if args.retro or is_trade_hours():
+            # Retro runs move to the next recorded value first, once for the whole update
+            if args.retro:
+                StockRetro.advance(args.ticker)
             # Update all the stock peaks, prices, recent prices, and trends
             account_one.update_stock_values_all()
             # check if still have quantity of stock:
@@ -101,12 +124,22 @@ def main(args):
             else:
                 print("In stock quantity")
                 rise_and_fall_transactions.buy_if_rise(account_one, stock, args.gain_threshold, stock.new_low)
-            # Wait for next update
-            print(f"Waiting for {WAIT_TIME_SECONDS} seconds")
-            time.sleep(WAIT_TIME_SECONDS)
+
+            if args.retro:
+                if StockRetro.is_finished(args.ticker):
+                    account_one.write_account_to_file(end_of_day_save=True)
+                    account_one.print_account()
+                    break
+                continue
+
+            # Wait for the observer to push the next tick, or until the next WAIT_TIME_SECONDS boundary if no tick comes
+            timeout = scheduler.seconds_until_next_deadline()
+            print(f"Waiting up to {timeout:.1f} seconds for the next tick")
+            tick_subscriber.wait_for_tick(args.ticker, timeout=timeout)
         else:
             account_one.write_account_to_file(end_of_day_save=True)
             pause_until_trade_hours_start()
+            scheduler.reset()
 
 
 args = arg_parser()
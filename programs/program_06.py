@@ -0,0 +1,149 @@
+"""
+Author: Joel Yuhas
+Date: October 17th, 2026
+
+Algorithm 06
+
+Runs the "rise and fall transaction" algorithms of program_04 for every stock and every account setting in one
+trading engine, instead of a program_04 process for each account of each stock. The price of each stock is gotten once
+per update and shared by all of its accounts, and the accounts that traded are saved together.
+
+The accounts are the same accounts program_04 uses, so either program can pick up where the other left off.
+
+"""
+import os
+import argparse
+import multiprocessing
+from pathlib import Path
+
+from libraries.helper_functions import ACCOUNT_LOG_PATH, BIN_PATH, TICK_SOCKET_PATH, is_trade_hours, \
+    pause_until_trade_hours_start, IntervalScheduler
+from libraries.AccountLibrary import AccountLibrary
+from libraries.StockFactory import StockFactory
+from libraries.TickPublisher import TickSubscriber
+from libraries.TradingEngine import TradingEngine
+from algorithms import rise_and_fall_transactions
+
+
+# Max time to wait between updates in seconds, if the observer doesn't push a new tick before then
+WAIT_TIME_SECONDS = 60
+
+# The starting amount in dollars
+STARTING_AMOUNT_DOLLARS = 10000
+
+# The (account_number, loss_threshold, gain_threshold) of the accounts run for every stock
+ACCOUNT_SETTINGS = [(1, 1.0, 1.0), (2, 2.0, 2.0), (505, 0.5, 0.5), (5, 5.0, 5.0)]
+
+
+def arg_parser():
+    """
+    Get following information so the program can run
+    - list of stocks to trade
+    - number of processes to split the stocks across
+
+    """
+    parser = argparse.ArgumentParser()
+    parser.add_argument("stocks_path", type=str, nargs="?", default=str(BIN_PATH / "list_of_stocks.txt"),
+                        help="Path to the file with one stock ticker per line")
+    parser.add_argument("--processes", type=int, default=1,
+                        help="Number of processes to split the stocks across, each running its own engine")
+    return parser.parse_args()
+
+
+def load_account(account_number: int, ticker: str, stock_factory: StockFactory) -> AccountLibrary:
+    """
+    Load the program_04 account of the ticker, or create it and deposit STARTING_AMOUNT_DOLLARS if it doesn't exist.
+    If the account has money, all of it is used to buy the ticker before the engine starts, the same as program_04.
+
+    :param account_number: (int): The identification number of the account
+    :param ticker: (str): The ticker of the stock the account trades
+    :param stock_factory: (StockFactory): The stock factory shared by the accounts of the engine
+    :return: (AccountLibrary): The account, holding the ticker's stock
+
+    """
+    account = AccountLibrary(account_number=account_number,
+                             account_path=ACCOUNT_LOG_PATH / ('account_program_04_' + ticker),
+                             stock_factory=stock_factory)
+    if account.create_new_account():
+        account.deposit_money(STARTING_AMOUNT_DOLLARS)
+        account.write_account_to_file()
+    else:
+        account.load_from_file()
+
+    if account.money > 0:
+        print(f"Buying {ticker} at the initialization of algorithm_06 for account {account_number}")
+        account.buy(ticker=ticker, dollar_amount=float(account.money))
+
+    # Check that stock exist. If it does not exist and there is no money then there is an issue with the account
+    if not account.get_stock(ticker):
+        print(f"Stock {ticker} does not exist in account {account_number}! Either not enough money or no desired stock")
+        raise RuntimeError
+
+    return account
+
+
+def run_engine(tickers: list[str]):
+    """
+    Run the trading engine for the accounts of the tickers until the process is stopped.
+
+    :param tickers: (list[str]): The tickers to trade
+
+    """
+    # Board stocks read the observer's prices from memory, and fall back to the observer database if needed
+    stock_factory = StockFactory("board")
+    engine = TradingEngine(stock_factory)
+    for ticker in tickers:
+        for account_number, loss_threshold, gain_threshold in ACCOUNT_SETTINGS:
+            account = load_account(account_number, ticker, stock_factory)
+            engine.add_account(account, ticker,
+                               rise_and_fall_transactions.rise_and_fall_strategy(loss_threshold, gain_threshold))
+    print(f"Trading engine running {len(engine.accounts)} accounts on {len(tickers)} stocks")
+
+    # Subscribe to the observer's ticks so the engine runs once as soon as an update of its stocks is written
+    tick_subscriber = TickSubscriber(TICK_SOCKET_PATH)
+    # If no tick comes, fall back to updating on the wall clock boundaries of WAIT_TIME_SECONDS
+    scheduler = IntervalScheduler(WAIT_TIME_SECONDS, f"program_06 {' '.join(tickers)}")
+
+    # Main loop!
+    while True:
+        if is_trade_hours():
+            engine.run_cycle()
+
+            # Wait for the observer to push the next update, or until the next WAIT_TIME_SECONDS boundary if none comes
+            timeout = scheduler.seconds_until_next_deadline()
+            print(f"Waiting up to {timeout:.1f} seconds for the next update")
+            tick_subscriber.wait_for_ticks(tickers, timeout=timeout)
+        else:
+            engine.save_accounts(end_of_day_save=True)
+            pause_until_trade_hours_start()
+            scheduler.reset()
+
+
+def main(args):
+    """
+    Read the stocks to trade and run the trading engine for them, split across args.processes processes.
+
+    :param args: (argparse.Namespace): The program arguments
+
+    """
+    # start color
+    os.system('color')
+
+    with open(Path(args.stocks_path), 'r') as file:
+        tickers = [line.strip() for line in file if line.strip()]
+
+    shards = TradingEngine.split_tickers(tickers, args.processes)
+    if len(shards) == 1:
+        run_engine(shards[0])
+        return
+
+    processes = [multiprocessing.Process(target=run_engine, args=(shard,)) for shard in shards]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+
+
+if __name__ == "__main__":
+    args = arg_parser()
+    main(args)
@@ -0,0 +1,67 @@
+"""
+Author: Joel Yuhas
+Date: October 17th, 2026
+
+Local stand-ins for the market data the offline tests use, so no yfinance calls are made.
+
+    - StandInProvider, a market data provider with set prices that counts its calls
+    - make_stand_in_price_fetcher, a stand-in for the observer's batched yfinance fetch with set prices
+
+"""
+from typing import Callable
+
+import pandas as pd
+
+from libraries.MarketDataProvider import MarketDataProvider
+
+
+class StandInProvider(MarketDataProvider):
+    """
+    Local stand-in for the market data provider. Tickers in prices get their set price, every other ticker gets price.
+    If price_step is set, price moves by it every time it is gotten, so each price is different from the last.
+
+    """
+    def __init__(self, price: float = 100.0, prices: dict[str, float] = None, price_step: float = 0.0):
+        self.price = price
+        self.prices = dict(prices or {})
+        self.price_step = price_step
+        self.single_calls = 0
+        self.bulk_calls = 0
+
+    def get_price(self, ticker: str) -> float:
+        """
+        Get the stand-in price of the ticker, without counting it as a call.
+
+        :param ticker: (str): The ticker of the stock
+        :return: (float): The price
+
+        """
+        if ticker in self.prices:
+            return self.prices[ticker]
+        self.price = self.price + self.price_step
+        return self.price
+
+    def get_current_price(self, ticker: str) -> float:
+        self.single_calls += 1
+        return self.get_price(ticker)
+
+    def get_current_prices(self, tickers: list[str]) -> dict[str, float]:
+        self.bulk_calls += 1
+        return {ticker: self.get_price(ticker) for ticker in tickers}
+
+    def get_daily_history(self, ticker: str) -> pd.DataFrame:
+        return pd.DataFrame()
+
+
+def make_stand_in_price_fetcher(prices: dict[str, float]) -> Callable[[list[str]], dict[str, float]]:
+    """
+    Make a local stand-in for the observer's batched yfinance fetch. Leaves out any ticker it doesn't have a price for.
+
+    :param prices: (dict[str, float]): The set price of each ticker
+    :return: (Callable): The price fetcher, called with the tickers and returning their prices by ticker
+
+    """
+    def stand_in_price_fetcher(stock_tickers: list[str]) -> dict[str, float]:
+        return {ticker: prices[ticker] for ticker in stock_tickers if ticker in prices}
+
+    return stand_in_price_fetcher
@@ -0,0 +1,123 @@
+"""
+Author: Joel Yuhas
+Date: October 17th, 2026
+
+Offline test for AccountJournal. Trades in an account with saves between the end of day saves and checks the account
+recovered from the snapshot and journal matches the account, that a save only appends the changes, and that a partly
+written journal record or a crash in the middle of a checkpoint doesn't lose the saves before it.
+
+"""
+import contextlib
+import io
+import tempfile
+from pathlib import Path
+
+from libraries import AccountJournal as account_journal
+from libraries.AccountLibrary import AccountLibrary
+from libraries.MarketDataProvider import get_market_data_provider, set_market_data_provider
+from libraries.StockFactory import StockFactory
+from libraries import helper_functions
+from programs.tests.stand_in_market_data import StandInProvider
+
+TICKERS = ["JOURNAL_A", "JOURNAL_B"]
+
+
+def load_account(account_path: Path) -> AccountLibrary:
+    """
+    Load account 1 from the account path.
+
+    """
+    with contextlib.redirect_stdout(io.StringIO()):
+        account = AccountLibrary(account_number=1, account_path=account_path, stock_factory=StockFactory("direct"))
+        account.load_from_file()
+    return account
+
+
+def main():
+    previous_provider = get_market_data_provider()
+    provider = StandInProvider(prices={ticker: 100.0 for ticker in TICKERS})
+    set_market_data_provider(provider)
+    try:
+        with tempfile.TemporaryDirectory() as temp_directory:
+            temp_path = Path(temp_directory)
+            with contextlib.redirect_stdout(io.StringIO()):
+                account = AccountLibrary(account_number=1, account_path=temp_path,
+                                         stock_factory=StockFactory("direct"))
+                account.deposit_money(10000)
+                account.write_account_to_file()
+                account.buy(ticker=TICKERS[0], dollar_amount=2000)
+                account.buy(ticker=TICKERS[1], dollar_amount=3000)
+                account.write_account_to_file(end_of_day_save=True)
+            journal = account.account_journal
+
+            print("Checking the end of day save folds the journal into the snapshot")
+            helper_functions.evaluator_helper(journal.snapshot_file.is_file())
+            helper_functions.evaluator_helper(journal.journal_file.stat().st_size == 0)
+            helper_functions.evaluator_helper(load_account(temp_path).account_to_dict() == account.account_to_dict())
+
+            print("Checking a save only appends the changes")
+            csv_size = account.account_file.stat().st_size
+            with contextlib.redirect_stdout(io.StringIO()):
+                for price in (101.0, 102.5, 99.0):
+                    provider.prices[TICKERS[0]] = price
+                    account.update_stock_values_all()
+                    account.write_account_to_file()
+                account.sell(ticker=TICKERS[1], stock_amount=account.get_stock(TICKERS[1]).quantity)
+                account.write_account_to_file()
+            journal_size = journal.journal_file.stat().st_size
+            helper_functions.evaluator_helper(0 < journal_size < 4 * len(str(account.account_to_dict())))
+            helper_functions.evaluator_helper(account.account_file.stat().st_size == csv_size)
+            account.write_account_to_file()
+            helper_functions.evaluator_helper(journal.journal_file.stat().st_size == journal_size)
+            helper_functions.evaluator_helper(load_account(temp_path).account_to_dict() == account.account_to_dict())
+
+            print("Checking a partly written journal record is dropped")
+            saved_dict = account.account_to_dict()
+            account.money = 1.0
+            account.write_account_to_file()
+            with open(journal.journal_file, "r+b") as file:
+                file.truncate(journal.journal_file.stat().st_size - 3)
+            torn_size = journal.journal_file.stat().st_size
+            reader = load_account(temp_path)
+            helper_functions.evaluator_helper(reader.account_to_dict() == saved_dict)
+            # Loading only reads the journal, the partly written record is left for the next save to cut off
+            helper_functions.evaluator_helper(reader.account_journal.journal_handle is None)
+            helper_functions.evaluator_helper(journal.journal_file.stat().st_size == torn_size)
+            journal.close()
+            with contextlib.redirect_stdout(io.StringIO()):
+                reader.deposit_money(5)
+                reader.write_account_to_file()
+            helper_functions.evaluator_helper(load_account(temp_path).account_to_dict() == reader.account_to_dict())
+            reader.account_journal.close()
+
+            print("Checking a crash between the snapshot and clearing the journal")
+            account = load_account(temp_path)
+            with contextlib.redirect_stdout(io.StringIO()):
+                account.deposit_money(500)
+                account.write_account_to_file()
+            journal = account.account_journal
+            journal_bytes = journal.journal_file.read_bytes()
+            journal.checkpoint()
+            journal.journal_file.write_bytes(journal_bytes)
+            helper_functions.evaluator_helper(load_account(temp_path).account_to_dict() == account.account_to_dict())
+
+            print("Checking the journal is folded into a snapshot after enough records")
+            previous_interval = account_journal.SNAPSHOT_RECORD_INTERVAL
+            account_journal.SNAPSHOT_RECORD_INTERVAL = 5
+            try:
+                with contextlib.redirect_stdout(io.StringIO()):
+                    for save in range(account_journal.SNAPSHOT_RECORD_INTERVAL):
+                        account.deposit_money(1)
+                        account.write_account_to_file()
+                helper_functions.evaluator_helper(journal.record_count == 0)
+                helper_functions.evaluator_helper(journal.journal_file.stat().st_size == 0)
+            finally:
+                account_journal.SNAPSHOT_RECORD_INTERVAL = previous_interval
+            journal.close()
+            helper_functions.evaluator_helper(load_account(temp_path).account_to_dict() == account.account_to_dict())
+    finally:
+        set_market_data_provider(previous_provider)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Author: Joel Yuhas
+Date: October 17th, 2026
+
+Offline test for loading an account from the end of its account file, for accounts without an account journal. Saves
+an account many times and checks the account loaded from the file matches the last save, including when the last save
+was only partly written and when the last save is bigger than the block read from the end of the file.
+
+"""
+import contextlib
+import csv
+import io
+import json
+import tempfile
+from pathlib import Path
+
+from libraries import AccountLibrary as account_library
+from libraries.AccountLibrary import AccountLibrary
+from libraries.StockFactory import StockFactory
+from libraries import helper_functions
+
+SAVES = 200
+
+
+def load_account(account_path: Path) -> AccountLibrary:
+    """
+    Load account 1 from the account path.
+
+    """
+    with contextlib.redirect_stdout(io.StringIO()):
+        account = AccountLibrary(account_number=1, account_path=account_path, stock_factory=StockFactory("direct"))
+        account.load_from_file()
+    return account
+
+
+def main():
+    with tempfile.TemporaryDirectory() as temp_directory:
+        temp_path = Path(temp_directory)
+        with contextlib.redirect_stdout(io.StringIO()):
+            account = AccountLibrary(account_number=1, account_path=temp_path, stock_factory=StockFactory("direct"))
+            for save in range(SAVES):
+                account.deposit_money(1)
+                account.write_account_to_file(end_of_day_save=True)
+            account.account_journal.close()
+        # Accounts from before the account journal only have the account file to load from
+        account.account_journal.journal_file.unlink()
+        account.account_journal.snapshot_file.unlink()
+
+        with open(account.account_file, "r") as csvfile:
+            rows = list(csv.DictReader(csvfile))
+
+        print("Checking the account loads from the last save")
+        helper_functions.evaluator_helper(load_account(temp_path).account_to_dict() ==
+                                          json.loads(rows[-1]["account_dict"]))
+        helper_functions.evaluator_helper(load_account(temp_path).money == SAVES)
+
+        print("Checking a partly written last save is skipped")
+        with open(account.account_file, "a") as csvfile:
+            csvfile.write(rows[-1]["date"] + ',"{""account_number"": 1, ""mon')
+        helper_functions.evaluator_helper(load_account(temp_path).money == SAVES)
+
+        print("Checking a save bigger than the block read from the end of the file")
+        previous_block_size = account_library.TAIL_READ_BLOCK_SIZE
+        account_library.TAIL_READ_BLOCK_SIZE = 16
+        try:
+            helper_functions.evaluator_helper(load_account(temp_path).money == SAVES)
+        finally:
+            account_library.TAIL_READ_BLOCK_SIZE = previous_block_size
+
+        print("Checking an account file with no complete save")
+        with open(account.account_file, "w") as csvfile:
+            csvfile.write(",".join(account_library.ACCOUNT_FIELDNAMES) + "\n")
+        try:
+            load_account(temp_path)
+            helper_functions.evaluator_helper(False)
+        except AssertionError:
+            helper_functions.evaluator_helper(True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Author: Joel Yuhas
+Date: October 17th, 2026
+
+Offline test for the bulk price refresh of AccountLibrary.update_stock_values_all. Checks an account of direct stocks
+gets all its prices with one provider call per refresh, using a local stand-in provider, and checks the tick store
+gets the newest tick of many stocks with one query.
+
+"""
+import contextlib
+import io
+import tempfile
+from pathlib import Path
+
+from libraries.AccountLibrary import AccountLibrary
+from libraries.MarketDataProvider import get_market_data_provider, set_market_data_provider
+from libraries.StockFactory import StockFactory
+from libraries.TickStore import TickStore
+from libraries import helper_functions
+from programs.tests.stand_in_market_data import StandInProvider
+
+TICKERS = ["BULK_A", "BULK_B", "BULK_C", "BULK_D"]
+
+
+def main():
+    previous_provider = get_market_data_provider()
+    provider = StandInProvider(prices={ticker: 100.0 + number for number, ticker in enumerate(TICKERS)})
+    set_market_data_provider(provider)
+    try:
+        with tempfile.TemporaryDirectory() as temp_directory:
+            temp_path = Path(temp_directory)
+            with contextlib.redirect_stdout(io.StringIO()):
+                account = AccountLibrary(account_number=1, account_path=temp_path / "account",
+                                         stock_factory=StockFactory("direct"))
+                account.deposit_money(10000)
+                for ticker in TICKERS:
+                    account.buy(ticker=ticker, dollar_amount=1000)
+
+            print("Checking a refresh gets every price with one provider call")
+            provider.single_calls = 0
+            provider.bulk_calls = 0
+            provider.prices = {ticker: price * 1.1 for ticker, price in provider.prices.items()}
+            account.update_stock_values_all()
+            helper_functions.evaluator_helper(provider.bulk_calls == 1 and provider.single_calls == 0)
+            helper_functions.evaluator_helper(all(account.get_stock(ticker).last_price == provider.prices[ticker]
+                                                  for ticker in TICKERS))
+            helper_functions.evaluator_helper(all(account.get_stock(ticker).trend == "UP" for ticker in TICKERS))
+
+            print("Checking the tick store gets the newest tick of every stock at once")
+            with TickStore(temp_path / "ticks") as tick_store:
+                tick_store.write_ticks([(ticker, f"2024-01-02 09:3{minute}:00", 100.0 + minute)
+                                        for ticker in TICKERS[:3] for minute in range(5)])
+                tick_store.write_ticks([(TICKERS[0], "2023-12-29 15:59:00", 90.0),
+                                        (TICKERS[3], "2023-12-29 15:59:00", 95.0)])
+                latest_ticks = tick_store.get_latest_ticks(TICKERS + ["BULK_MISSING"])
+                helper_functions.evaluator_helper(latest_ticks[TICKERS[0]] == ("2024-01-02 09:34:00", 104.0))
+                helper_functions.evaluator_helper(latest_ticks[TICKERS[3]] == ("2023-12-29 15:59:00", 95.0))
+                helper_functions.evaluator_helper("BULK_MISSING" not in latest_ticks)
+                helper_functions.evaluator_helper(all(latest_ticks[ticker] == tick_store.get_latest_tick(ticker)
+                                                      for ticker in TICKERS))
+    finally:
+        set_market_data_provider(previous_provider)
+
+
+if __name__ == "__main__":
+    main()
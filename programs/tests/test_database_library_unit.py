@@ -7,6 +7,8 @@ Basic database library testing for manual use.
 
 
 import datetime
+import tempfile
+from pathlib import Path
 
 from unittest.mock import MagicMock
 from libraries.DatabaseLibrary import DatabaseLibrary
@@ -80,7 +82,17 @@ def test_exection():
 
 def main():
     print("Starting Tests!")
-    test_write_to_database_iterator()
+    # Write the test databases and logs to a temporary directory instead of the real ones
+    database_path, logbase_path = helper_functions.DATABASE_PATH, helper_functions.LOGBASE_PATH
+    with tempfile.TemporaryDirectory() as temp_directory:
+        helper_functions.DATABASE_PATH = Path(temp_directory) / "developing_databases"
+        helper_functions.LOGBASE_PATH = Path(temp_directory) / "maintenance_logs"
+        helper_functions.DATABASE_PATH.mkdir()
+        helper_functions.LOGBASE_PATH.mkdir()
+        try:
+            test_write_to_database_iterator()
+        finally:
+            helper_functions.DATABASE_PATH, helper_functions.LOGBASE_PATH = database_path, logbase_path
 
 
 main()
\ No newline at end of file
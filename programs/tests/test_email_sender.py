@@ -5,26 +5,36 @@ Quick prototyping project for sending emails, will look into this more later and
 """
 
 
+import shutil
+import tempfile
+from pathlib import Path
+
 from libraries.StockFactory import StockFactory
 from libraries.EmailSenderLibrary import EmailSenderLibrary
 from libraries.helper_functions import ACCOUNT_LOG_PATH
 from datetime import datetime
 
 
-# Initialize the EmailSenderLibrary
-account_paths = [ACCOUNT_LOG_PATH / "account_program_04_TQQQ", ACCOUNT_LOG_PATH / "account_program_04_QQQ"]
-#account_paths = [ACCOUNT_LOG_PATH / "account_test"]
-stock_factory = StockFactory("direct")
-current_date = datetime.now().strftime("%Y,%m,%d")
-email_sender = EmailSenderLibrary(account_paths=account_paths,
-                                  stock_factory=stock_factory)
+with tempfile.TemporaryDirectory() as temp_directory:
+    # Report on copies of the accounts, so the plots and any loading don't write to the real accounts
+    account_paths = []
+    for account_name in ["account_program_04_TQQQ", "account_program_04_QQQ"]:
+        account_paths.append(Path(temp_directory) / account_name)
+        shutil.copytree(ACCOUNT_LOG_PATH / account_name, account_paths[-1])
+    #account_paths = [ACCOUNT_LOG_PATH / "account_test"]
+
+    # Initialize the EmailSenderLibrary
+    stock_factory = StockFactory("direct")
+    current_date = datetime.now().strftime("%Y,%m,%d")
+    email_sender = EmailSenderLibrary(account_paths=account_paths,
+                                      stock_factory=stock_factory)
 
-# Debugging portion
-stock_factory = StockFactory("direct")
+    # Debugging portion
+    stock_factory = StockFactory("direct")
 
-output = email_sender.string_aggregate_accounts()
-plots = email_sender.generate_plot_attachments()
-email_sender.send_email(f"{current_date} stocks",
-                                output,
-                                plots)
-print(output)
+    output = email_sender.string_aggregate_accounts()
+    plots = email_sender.generate_plot_attachments()
+    email_sender.send_email(f"{current_date} stocks",
+                                    output,
+                                    plots)
+    print(output)
@@ -0,0 +1,106 @@
+"""
+Author: Joel Yuhas
+Date: October 17th, 2026
+
+Offline test for EndOfDayIndex. Writes several days of account saves, with end of day saves and saves during the day,
+and checks the end of day lookups of the account match the saves, the index only reads the new rows when it syncs,
+and it is rebuilt when the account file is rewritten.
+
+"""
+import contextlib
+import csv
+import io
+import json
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from libraries.AccountLibrary import AccountLibrary, ACCOUNT_FIELDNAMES
+from libraries.EndOfDayIndex import EndOfDayIndex
+from libraries.StockFactory import StockFactory
+from libraries import helper_functions
+
+DAYS = 5
+
+
+def write_rows(account_file: Path, rows: list[tuple[datetime, float, bool]]):
+    """
+    Append account saves to the account file.
+
+    """
+    with open(account_file, "a", newline="") as csvfile:
+        writer = csv.DictWriter(csvfile, fieldnames=ACCOUNT_FIELDNAMES)
+        for saved_at, total_value, end_of_day_save in rows:
+            writer.writerow({ACCOUNT_FIELDNAMES[0]: str(saved_at), ACCOUNT_FIELDNAMES[1]: json.dumps({}),
+                             ACCOUNT_FIELDNAMES[2]: str(total_value), ACCOUNT_FIELDNAMES[3]: str(end_of_day_save)})
+
+
+def main():
+    with tempfile.TemporaryDirectory() as temp_directory:
+        temp_path = Path(temp_directory)
+        with contextlib.redirect_stdout(io.StringIO()):
+            account = AccountLibrary(account_number=1, account_path=temp_path, stock_factory=StockFactory("direct"))
+
+        # Saves every hour of the day for the past days, the 4pm save being the end of day save
+        today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        rows = []
+        for day in range(DAYS, 0, -1):
+            for hour in range(9, 18):
+                rows.append((today - timedelta(days=day) + timedelta(hours=hour, minutes=1, microseconds=500),
+                             1000.0 + day * 10 + hour, hour == 16))
+        write_rows(account.account_file, rows)
+
+        print("Checking the end of day values looked up from the index")
+        # Every past day has an end of day save, so each one is a trading day back
+        end_of_day_values = [(round(total_value, 2), saved_at) for saved_at, total_value, end_of_day_save in rows
+                             if end_of_day_save]
+        helper_functions.evaluator_helper(all(account.get_previous_end_of_day_total_value(days_back=days_back) ==
+                                              end_of_day_values[-days_back] for days_back in range(1, DAYS + 1)))
+        helper_functions.evaluator_helper(account.get_previous_end_of_day_total_value(days_back=0) ==
+                                          end_of_day_values[-1])
+
+        index = account.end_of_day_index
+        helper_functions.evaluator_helper(index.get_value_trading_days_back(1) == (1000.0 + 10 + 16, rows[-2][0]))
+        helper_functions.evaluator_helper(index.get_value_trading_days_back(DAYS)[0] == 1000.0 + DAYS * 10 + 16)
+        helper_functions.evaluator_helper(index.get_value_trading_days_back(DAYS + 1) is None)
+
+        print("Checking the index only reads rows appended since the last sync")
+        indexed_size = index.get_indexed_size()
+        helper_functions.evaluator_helper(indexed_size == account.account_file.stat().st_size)
+        write_rows(account.account_file, [(today + timedelta(hours=10), 5.0, False)])
+        with open(account.account_file, "a") as csvfile:
+            csvfile.write(f"{today + timedelta(hours=16)},{{}},7.0,Tr")
+        index.sync()
+        helper_functions.evaluator_helper(index.get_indexed_size() > indexed_size)
+        helper_functions.evaluator_helper(index.get_indexed_size() < account.account_file.stat().st_size)
+        with open(account.account_file, "a") as csvfile:
+            csvfile.write("ue\n")
+        helper_functions.evaluator_helper(index.get_value_before(today + timedelta(hours=17)) ==
+                                          (7.0, today + timedelta(hours=16)))
+        helper_functions.evaluator_helper(index.get_indexed_size() == account.account_file.stat().st_size)
+
+        print("Checking an end of day save from the account is indexed")
+        with contextlib.redirect_stdout(io.StringIO()):
+            account.deposit_money(250)
+            account.write_account_to_file(end_of_day_save=True)
+        value, saved_at = index.get_value_before(datetime.now())
+        helper_functions.evaluator_helper(value == 250.0 and saved_at.date() == datetime.now().date())
+
+        print("Checking the index is rebuilt when the account file is rewritten")
+        with open(account.account_file, "w") as csvfile:
+            csvfile.write(",".join(ACCOUNT_FIELDNAMES) + "\n")
+        write_rows(account.account_file, rows[:9])
+        helper_functions.evaluator_helper(index.get_value_before(datetime.now()) ==
+                                          (1000.0 + DAYS * 10 + 16, rows[7][0]))
+
+        print("Checking an existing account file gets its index the first time it is used")
+        index.close()
+        index.index_file.unlink()
+        new_index = EndOfDayIndex(account.account_file)
+        helper_functions.evaluator_helper(new_index.get_value_trading_days_back(1) ==
+                                          (1000.0 + DAYS * 10 + 16, rows[7][0]))
+        new_index.close()
+
+
+if __name__ == "__main__":
+    main()
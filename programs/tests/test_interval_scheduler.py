@@ -0,0 +1,48 @@
+"""
+Author: Joel Yuhas
+Date: October 17th, 2026
+
+Test for the IntervalScheduler, checks the deadlines stay on the interval boundaries and that overruns skip the missed
+deadlines.
+
+"""
+import time
+
+from libraries import helper_functions
+
+INTERVAL_SECONDS = 0.1
+
+
+def is_on_boundary(timestamp: float) -> bool:
+    offset = timestamp % INTERVAL_SECONDS
+    return min(offset, INTERVAL_SECONDS - offset) < 0.02
+
+
+def main():
+    scheduler = helper_functions.IntervalScheduler(INTERVAL_SECONDS, "test")
+
+    print("Checking waits land on the interval boundaries")
+    wake_times = []
+    for _ in range(5):
+        # Work that takes part of the interval should not push the next wake back
+        time.sleep(INTERVAL_SECONDS / 3)
+        scheduler.wait()
+        wake_times.append(time.time())
+    helper_functions.evaluator_helper(all(is_on_boundary(wake_time) for wake_time in wake_times))
+    helper_functions.evaluator_helper(scheduler.overrun_count == 0)
+
+    print("Checking an overrun skips the missed deadlines")
+    time.sleep(INTERVAL_SECONDS * 2.5)
+    scheduler.wait()
+    helper_functions.evaluator_helper(is_on_boundary(time.time()))
+    helper_functions.evaluator_helper(scheduler.overrun_count == 1 and scheduler.skipped_ticks >= 2)
+
+    print("Checking a reset does not report an overrun")
+    time.sleep(INTERVAL_SECONDS * 3)
+    scheduler.reset()
+    scheduler.wait()
+    helper_functions.evaluator_helper(scheduler.overrun_count == 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Author: Joel Yuhas
+Date: October 17th, 2026
+
+Offline test for the ReplayProvider. Records a few values to temporary interval files and observer databases, then
+steps a manual replay clock through them and runs the observer on the replayed values.
+
+"""
+import datetime
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+
+from libraries.MarketDataProvider import MarketDataError, ReplayClock, ReplayProvider, set_market_data_provider
+from libraries.ObserverPattern import ObserverPattern
+from libraries.StockSubClasses import StockDirect
+from libraries import helper_functions
+
+
+def main():
+    with tempfile.TemporaryDirectory() as temp_directory:
+        database_path = Path(temp_directory)
+        with open(database_path / "QQQ_2024_01_interval.txt", "w") as file:
+            file.write("2024-01-02-09:30:00,400.000\n")
+            file.write("2024-01-02-09:35:00,ERROR-1\n")
+            file.write("2024-01-02-09:40:00,402.000\n")
+
+        ObserverPattern.create_db(database_path / "stocks_QQQ_2024_01.db")
+        conn = sqlite3.connect(database_path / "stocks_QQQ_2024_01.db")
+        with conn:
+            conn.execute("INSERT INTO stocks VALUES (?,?,?)", ("2024-01-02 09:45:00", "QQQ", 399.0))
+        conn.close()
+
+        provider = ReplayProvider(ReplayClock(manual=True), database_path=database_path,
+                                  observer_database_path=database_path)
+
+        print("Checking the replay starts at the first recorded value")
+        helper_functions.evaluator_helper(provider.get_current_price("QQQ") == 400.0)
+        helper_functions.evaluator_helper(provider.get_current_price("NOTREAL_TEST") is None)
+
+        print("Checking error lines are skipped and both sources are merged")
+        helper_functions.evaluator_helper(provider.advance_to_next_value())
+        helper_functions.evaluator_helper(provider.get_current_price("QQQ") == 402.0)
+        helper_functions.evaluator_helper(provider.advance_to_next_value())
+        helper_functions.evaluator_helper(provider.get_current_prices(["QQQ", "NOTREAL_TEST"]) == {"QQQ": 399.0})
+        helper_functions.evaluator_helper(not provider.advance_to_next_value())
+
+        print("Checking the daily history covers the replay day so far")
+        daily = provider.get_daily_history("QQQ")
+        helper_functions.evaluator_helper(list(daily.iloc[0][["Open", "High", "Low", "Close"]]) ==
+                                          [400.0, 402.0, 399.0, 399.0])
+
+        print("Checking the observer can run on the replayed values")
+        set_market_data_provider(provider)
+        try:
+            observer_pattern = ObserverPattern()
+            observer_pattern.stock_dict["QQQ"] = database_path / "stocks_QQQ_2024_01.db"
+            helper_functions.evaluator_helper(observer_pattern.observer_all_stocks() == {"QQQ": 399.0})
+            observer_pattern.close_all_connections()
+
+            print("Checking a stock with no price fails explicitly")
+            try:
+                StockDirect.get_current_price("NOTREAL_TEST")
+                helper_functions.evaluator_helper(False)
+            except MarketDataError:
+                helper_functions.evaluator_helper(True)
+            quotes = StockDirect.get_current_prices(["QQQ", "NOTREAL_TEST"])
+            helper_functions.evaluator_helper(list(quotes) == ["QQQ"] and quotes["QQQ"].price == 399.0)
+            observer_pattern = ObserverPattern(batch_fetch=False)
+            observer_pattern.stock_dict["QQQ"] = database_path / "stocks_QQQ_2024_01.db"
+            observer_pattern.stock_dict["NOTREAL_TEST"] = database_path / "stocks_NOTREAL_TEST_2024_01.db"
+            helper_functions.evaluator_helper(observer_pattern.observer_all_stocks() == {"QQQ": 399.0})
+            observer_pattern.close_all_connections()
+        finally:
+            set_market_data_provider(None)
+
+        print("Checking an accelerated clock moves faster than real time")
+        start_time = datetime.datetime(2024, 1, 2, 9, 30).timestamp()
+        clock = ReplayClock(start_time=start_time, speed=1000.0)
+        time.sleep(0.01)
+        helper_functions.evaluator_helper(clock.now() >= start_time + 10)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Author: Joel Yuhas
+Date: October 17th, 2026
+
+Offline test for the batched fetch mode of the ObserverPattern. Uses a local stand-in price fetcher and temporary
+database files so no yfinance calls are made.
+
+"""
+import contextlib
+import io
+import sqlite3
+import tempfile
+from pathlib import Path
+
+from libraries.ObserverPattern import ObserverPattern
+from libraries.PriceBoard import PriceBoard
+from libraries import helper_functions
+from programs.tests.stand_in_market_data import make_stand_in_price_fetcher
+
+STAND_IN_PRICES = {"QQQ": 400.5, "TQQQ": 50.25, "VOO": 420.75}
+stand_in_price_fetcher = make_stand_in_price_fetcher(STAND_IN_PRICES)
+
+
+class RecordingTickPublisher:
+    """
+    Local stand-in for the tick publisher that keeps the tickers it was asked to publish.
+
+    """
+    def __init__(self):
+        self.published = []
+
+    def publish(self, ticker: str, price: float, timestamp: float):
+        self.published.append(ticker)
+
+
+def main():
+    with tempfile.TemporaryDirectory() as temp_directory:
+        observer_pattern = ObserverPattern(price_fetcher=stand_in_price_fetcher)
+
+        # Link the stocks to temporary databases instead of the observer database directory
+        for ticker in list(STAND_IN_PRICES) + ["NOTREAL_TEST"]:
+            database_file = Path(temp_directory) / f"stocks_{ticker}.db"
+            ObserverPattern.create_db(database_file)
+            observer_pattern.stock_dict[ticker] = database_file
+
+        print("Observing all stocks with the stand-in fetcher")
+        prices = observer_pattern.observer_all_stocks()
+        helper_functions.evaluator_helper(prices == STAND_IN_PRICES)
+
+        # Every written tick should share the same timestamp, and the unknown ticker should have no rows
+        timestamps = set()
+        for ticker, database_file in observer_pattern.stock_dict.items():
+            conn = sqlite3.connect(database_file)
+            rows = conn.execute("SELECT timestamp, price FROM stocks").fetchall()
+            conn.close()
+            if ticker in STAND_IN_PRICES:
+                helper_functions.evaluator_helper(len(rows) == 1 and rows[0][1] == STAND_IN_PRICES[ticker])
+                timestamps.add(rows[0][0])
+            else:
+                helper_functions.evaluator_helper(len(rows) == 0)
+
+        print("Checking shared timestamp")
+        helper_functions.evaluator_helper(len(timestamps) == 1)
+
+        # Closing the connections should let the next pass reopen them cleanly
+        print("Checking connections reopen after closing")
+        observer_pattern.close_all_connections()
+        observer_pattern.observer_all_stocks()
+        conn = sqlite3.connect(observer_pattern.stock_dict["QQQ"])
+        helper_functions.evaluator_helper(conn.execute("SELECT COUNT(*) FROM stocks").fetchone()[0] == 2)
+        helper_functions.evaluator_helper(conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal")
+        conn.close()
+        observer_pattern.close_all_connections()
+
+        # With a max write latency, passes should be held in the buffer and committed together on shutdown
+        print("Checking buffered passes are committed on shutdown")
+        with ObserverPattern(price_fetcher=stand_in_price_fetcher, max_write_latency_seconds=60) as buffered_observer:
+            buffered_observer.stock_dict = dict(observer_pattern.stock_dict)
+            buffered_observer.observer_all_stocks()
+            buffered_observer.observer_all_stocks()
+            helper_functions.evaluator_helper(len(buffered_observer.write_buffer) == 2 * len(STAND_IN_PRICES))
+        conn = sqlite3.connect(observer_pattern.stock_dict["QQQ"])
+        helper_functions.evaluator_helper(conn.execute("SELECT COUNT(*) FROM stocks").fetchone()[0] == 4)
+        conn.close()
+
+        # A board with fewer slots than stocks can't take every tick, the rest should still be written and pushed
+        print("Checking ticks the price board can't hold are still written and pushed")
+        tick_publisher = RecordingTickPublisher()
+        with PriceBoard(Path(temp_directory) / "price_board.mmap", writer=True, slot_count=2) as price_board, \
+                ObserverPattern(price_fetcher=stand_in_price_fetcher, price_board=price_board,
+                                tick_publisher=tick_publisher) as board_observer:
+            board_observer.stock_dict = dict(observer_pattern.stock_dict)
+            with contextlib.redirect_stdout(io.StringIO()) as output:
+                board_observer.observer_all_stocks()
+            helper_functions.evaluator_helper(output.getvalue().count("Issue publishing") == 1)
+            helper_functions.evaluator_helper(sorted(tick_publisher.published) == sorted(STAND_IN_PRICES))
+            helper_functions.evaluator_helper(sum(price_board.read(ticker) is not None
+                                                  for ticker in STAND_IN_PRICES) == 2)
+        for ticker in STAND_IN_PRICES:
+            conn = sqlite3.connect(observer_pattern.stock_dict[ticker])
+            helper_functions.evaluator_helper(conn.execute("SELECT COUNT(*) FROM stocks").fetchone()[0] == 5)
+            conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Author: Joel Yuhas
+Date: October 17th, 2026
+
+Offline test for the monthly partition rollover of the ObserverPattern. Uses a local stand-in price fetcher and a
+temporary observer database directory so no yfinance calls are made.
+
+"""
+import datetime
+import sqlite3
+import tempfile
+from pathlib import Path
+
+from libraries.ObserverPattern import ObserverPattern
+from libraries.ObserverPartitionManager import ObserverPartitionManager
+from libraries.StockSubClasses import StockObserver
+from libraries import helper_functions
+from programs.tests.stand_in_market_data import make_stand_in_price_fetcher
+
+STAND_IN_PRICES = {"QQQ": 400.5, "TQQQ": 50.25}
+stand_in_price_fetcher = make_stand_in_price_fetcher(STAND_IN_PRICES)
+
+
+def main():
+    print("Checking partition keys")
+    helper_functions.evaluator_helper(ObserverPartitionManager.get_next_partition_key("2026_12") == "2027_01")
+    helper_functions.evaluator_helper(ObserverPartitionManager.get_previous_partition_key("2027_01") == "2026_12")
+    helper_functions.evaluator_helper(ObserverPartitionManager.get_next_partition_key("2026_09") == "2026_10")
+
+    with tempfile.TemporaryDirectory() as temp_directory:
+        partition_manager = ObserverPartitionManager(Path(temp_directory))
+        with ObserverPattern(price_fetcher=stand_in_price_fetcher, partition_manager=partition_manager) as observer:
+            for ticker in STAND_IN_PRICES:
+                observer.add_stock(ticker)
+            observer.observer_all_stocks()
+            current_partition = partition_manager.current_partition
+
+            # Pretend the observer has been running since near the end of the month before
+            previous_partition = partition_manager.get_previous_partition_key(current_partition)
+            partition_manager.current_partition = previous_partition
+            previous_month_end = partition_manager.get_partition_start(current_partition) - datetime.timedelta(hours=1)
+            for ticker in STAND_IN_PRICES:
+                observer.stock_dict[ticker] = observer.setup_observe_stock(ticker, previous_month_end)
+
+            print("Checking next month is created ahead of the rollover")
+            observer.roll_over_partitions(previous_month_end)
+            helper_functions.evaluator_helper(partition_manager.current_partition == previous_partition)
+            next_file = partition_manager.get_partition_file("QQQ", current_partition)
+            helper_functions.evaluator_helper(next_file in observer.connections)
+
+            print("Checking the writer rolls over at the boundary")
+            previous_file = observer.stock_dict["QQQ"]
+            observer.roll_over_partitions(previous_month_end + datetime.timedelta(hours=2))
+            helper_functions.evaluator_helper(partition_manager.current_partition == current_partition)
+            helper_functions.evaluator_helper(observer.stock_dict["QQQ"] == next_file)
+            helper_functions.evaluator_helper(previous_file not in observer.connections)
+
+        print("Checking readers fall back to the previous month")
+        conn = sqlite3.connect(previous_file)
+        with conn:
+            conn.execute("INSERT INTO stocks VALUES (?,?,?)", ("2000-01-01 00:00:00", "VOO", 420.75))
+            conn.execute("INSERT INTO latest VALUES (?,?,?)", ("VOO", "2000-01-01 00:00:00", 420.75))
+        conn.close()
+        voo_file = partition_manager.get_partition_file("VOO", previous_partition)
+        previous_file.rename(voo_file)
+        ObserverPattern.create_db(partition_manager.get_partition_file("VOO", current_partition))
+        helper_functions.evaluator_helper(len(partition_manager.get_readable_partition_files("VOO")) == 2)
+
+        reader_partition_manager = StockObserver.partition_manager
+        reader_store_path = StockObserver.tick_store.store_path
+        StockObserver.partition_manager = partition_manager
+        StockObserver.tick_store.store_path = Path(temp_directory)
+        try:
+            helper_functions.evaluator_helper(StockObserver.get_current_price("VOO") == 420.75)
+
+            print("Checking an old tick is checked against the monthly database")
+            StockObserver.tick_store.write_ticks([("VOO", "1999-12-31 15:59:00", 410.0)])
+            helper_functions.evaluator_helper(StockObserver.get_current_price("VOO") == 420.75)
+            quote = StockObserver.get_current_prices(["VOO"])["VOO"]
+            helper_functions.evaluator_helper(quote.price == 420.75)
+
+            print("Checking observer quotes keep the observer's timestamp and are as old as it")
+            helper_functions.evaluator_helper(quote.timestamp == datetime.datetime(2000, 1, 1).timestamp())
+            helper_functions.evaluator_helper(quote.is_stale())
+            StockObserver.tick_store.write_ticks([("VOO", "2000-01-01 00:01:00", 421.0)])
+            helper_functions.evaluator_helper(StockObserver.get_current_price("VOO") == 421.0)
+            now_timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            StockObserver.tick_store.write_ticks([("VOO", now_timestamp, 422.5)])
+            quote = StockObserver.get_current_prices(["VOO"])["VOO"]
+            helper_functions.evaluator_helper(quote.price == 422.5 and not quote.is_stale())
+        finally:
+            StockObserver.partition_manager = reader_partition_manager
+            StockObserver.tick_store.close_all_connections()
+            StockObserver.tick_store.store_path = reader_store_path
+
+        print("Checking range lookups cover every partition")
+        range_files = partition_manager.get_partition_files_for_range("VOO", previous_month_end - datetime.timedelta(
+            days=40), datetime.datetime.now())
+        helper_functions.evaluator_helper(range_files == [voo_file, partition_manager.get_partition_file(
+            "VOO", current_partition)])
+
+
+if __name__ == "__main__":
+    main()
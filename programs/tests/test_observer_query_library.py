@@ -0,0 +1,76 @@
+"""
+Author: Joel Yuhas
+Date: October 17th, 2026
+
+Offline test for the ObserverQueryLibrary. Creates monthly observer databases in a temporary directory, then checks
+ranges inside one month and across months, the price at a time, and that a one day range uses the timestamp index.
+
+"""
+import datetime
+import sqlite3
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+from libraries.ObserverPattern import ObserverPattern
+from libraries.ObserverPartitionManager import ObserverPartitionManager
+from libraries.ObserverQueryLibrary import ObserverQueryLibrary
+from libraries import helper_functions
+
+RECORDED_TICKS = {
+    "2023_11": [("2023-11-30 15:59:00", 100.0), ("2023-11-30 16:00:00", 101.0)],
+    "2023_12": [("2023-12-04 09:30:00", 102.0), ("2023-12-05 09:30:00", 103.0), ("2023-12-05 09:31:00", 104.0),
+                ("2023-12-06 09:30:00", 105.0)],
+    "2024_01": [("2024-01-02 09:30:00", 106.0)],
+}
+
+
+def main():
+    with tempfile.TemporaryDirectory() as temp_directory:
+        partition_manager = ObserverPartitionManager(Path(temp_directory))
+        for partition_key, ticks in RECORDED_TICKS.items():
+            conn = sqlite3.connect(partition_manager.get_partition_file("QQQ", partition_key))
+            ObserverPattern.create_schema(conn)
+            with conn:
+                conn.executemany("INSERT INTO stocks VALUES (?,?,?)",
+                                 [(timestamp, "QQQ", price) for timestamp, price in ticks])
+                conn.execute("INSERT INTO stocks VALUES (?,?,?)", (ticks[0][0], "OTHER", 1.0))
+            conn.close()
+
+        with ObserverQueryLibrary(partition_manager) as query_library:
+            print("Checking a one day range")
+            timestamps, prices = query_library.get_ticks("QQQ", datetime.datetime(2023, 12, 5),
+                                                         datetime.datetime(2023, 12, 6))
+            helper_functions.evaluator_helper(prices.tolist() == [103.0, 104.0])
+            helper_functions.evaluator_helper(timestamps[0] == np.datetime64("2023-12-05T09:30:00"))
+
+            print("Checking a range across months")
+            timestamps, prices = query_library.get_ticks("QQQ", datetime.datetime(2023, 11, 30, 16),
+                                                         datetime.datetime(2024, 2, 1))
+            helper_functions.evaluator_helper(prices.tolist() == [101.0, 102.0, 103.0, 104.0, 105.0, 106.0])
+            helper_functions.evaluator_helper(bool(np.all(np.diff(timestamps.astype(np.int64)) > 0)))
+
+            print("Checking a range with no ticks")
+            timestamps, prices = query_library.get_ticks("QQQ", datetime.datetime(2025, 1, 1),
+                                                         datetime.datetime(2025, 2, 1))
+            helper_functions.evaluator_helper(len(timestamps) == 0 and len(prices) == 0)
+
+            print("Checking the price at a time, including from the previous month")
+            helper_functions.evaluator_helper(
+                query_library.get_price_at("QQQ", datetime.datetime(2023, 12, 5, 9, 30, 30)) == 103.0)
+            helper_functions.evaluator_helper(
+                query_library.get_price_at("QQQ", datetime.datetime(2024, 1, 1, 12)) == 105.0)
+            helper_functions.evaluator_helper(query_library.get_price_at("QQQ", datetime.datetime(2023, 11, 1)) is None)
+
+            print("Checking a one day range uses the timestamp index")
+            schema_names = query_library.attach_databases([partition_manager.get_partition_file("QQQ", "2023_12")])
+            plan = query_library.conn.execute(
+                f"EXPLAIN QUERY PLAN SELECT timestamp, price FROM {schema_names[0]}.stocks WHERE timestamp >= ? "
+                f"AND timestamp < ? AND stock_ticker = ?", ("2023-12-05", "2023-12-06", "QQQ")).fetchall()
+            query_library.detach_databases(schema_names)
+            helper_functions.evaluator_helper(any("idx_stocks_timestamp" in row[-1] for row in plan))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Author: Joel Yuhas
+Date: October 17th, 2026
+
+Offline test for PortfolioArrays. Runs several accounts of retro stocks through the same updates, buys, and sells both
+one AccountLibrary at a time and all at once with PortfolioArrays, and checks every stock value and account value
+matches. Also checks the stocks and transactions no longer carry an attribute dictionary.
+
+"""
+import contextlib
+import io
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+from libraries.AccountLibrary import AccountLibrary
+from libraries.PortfolioArrays import PortfolioArrays, STOCK_VALUE_FIELDS
+from libraries.PriceArrayLibrary import PriceArrayLibrary
+from libraries.StockFactory import StockFactory
+from libraries.StockSubClasses import StockRetro
+from libraries import helper_functions
+
+RECORDED_PRICES = {
+    "PORTFOLIO_A": [100.0, 102.0, 104.0, 101.0, 99.0, 100.0, 103.0, 105.0, 102.0, 106.0],
+    "PORTFOLIO_B": [50.0, 49.0, 48.5, 49.5, 51.0, 52.0, 51.5, 50.0, 50.5, 53.0],
+}
+ACCOUNT_COUNT = 4
+# Update number, account id, action, ticker, and dollar amount for buys or fraction of the quantity for sells
+TRADES = [(2, 0, "SELL", "PORTFOLIO_A", 1.0), (3, 1, "BUY", "PORTFOLIO_B", 500.0), (5, 0, "BUY", "PORTFOLIO_A", 600.0),
+          (6, 2, "SELL", "PORTFOLIO_B", 0.5), (7, 3, "BUY", "PORTFOLIO_A", 250.0)]
+
+
+def values_match(accounts: list, portfolio: PortfolioArrays) -> bool:
+    """
+    Check every stock value of every account matches the portfolio arrays.
+
+    """
+    for account_id, account in enumerate(accounts):
+        if account.money != portfolio.money[account_id]:
+            return False
+        for ticker, stock in account.stocks.items():
+            ticker_id = portfolio.get_ticker_id(ticker)
+            for field in STOCK_VALUE_FIELDS:
+                value = getattr(stock, field)
+                array_value = float(getattr(portfolio, field)[account_id, ticker_id])
+                if not (value == array_value or (value is None and np.isnan(array_value))):
+                    print(f"Account {account_id} {ticker} {field}: {value} != {array_value}")
+                    return False
+    return True
+
+
+def main():
+    with tempfile.TemporaryDirectory() as temp_directory:
+        temp_path = Path(temp_directory)
+        for ticker, prices in RECORDED_PRICES.items():
+            with open(temp_path / f"{ticker}_interval.txt", "w") as file:
+                for minute, price in enumerate(prices):
+                    file.write(f"2024-01-02-09:{30 + minute}:00,{price:.3f}\n")
+        StockRetro.price_array_library = PriceArrayLibrary(array_path=temp_path, database_path=temp_path,
+                                                           observer_database_path=temp_path,
+                                                           downloaded_database_path=temp_path)
+
+        accounts = []
+        with contextlib.redirect_stdout(io.StringIO()):
+            for account_id in range(ACCOUNT_COUNT):
+                account = AccountLibrary(account_number=account_id, account_path=temp_path / f"account_{account_id}",
+                                         stock_factory=StockFactory("retro"))
+                account.deposit_money(1000 * (account_id + 1))
+                account.buy(ticker="PORTFOLIO_A", dollar_amount=400.0)
+                if account_id % 2 == 0:
+                    account.buy(ticker="PORTFOLIO_B", dollar_amount=300.0)
+                accounts.append(account)
+
+        print("Checking slot based stocks and transactions")
+        helper_functions.evaluator_helper(not hasattr(accounts[0].get_stock("PORTFOLIO_A"), "__dict__"))
+        helper_functions.evaluator_helper(not hasattr(accounts[0].transactions[0], "__dict__"))
+        helper_functions.evaluator_helper(not hasattr(accounts[0].transactions[0], "account"))
+
+        print("Checking the arrays match the accounts through every update and trade")
+        portfolio = PortfolioArrays.from_accounts(accounts)
+        helper_functions.evaluator_helper(values_match(accounts, portfolio))
+
+        all_match = True
+        for update in range(1, len(RECORDED_PRICES["PORTFOLIO_A"])):
+            for ticker in RECORDED_PRICES:
+                StockRetro.advance(ticker)
+            with contextlib.redirect_stdout(io.StringIO()):
+                for account in accounts:
+                    account.update_stock_values_all()
+            portfolio.update_stock_values_all(portfolio.get_price_array(
+                {ticker: prices[update] for ticker, prices in RECORDED_PRICES.items()}))
+
+            for trade_update, account_id, action, ticker, amount in TRADES:
+                if trade_update != update:
+                    continue
+                price = RECORDED_PRICES[ticker][update]
+                with contextlib.redirect_stdout(io.StringIO()):
+                    if action == "BUY":
+                        accounts[account_id].buy(ticker=ticker, dollar_amount=amount)
+                        portfolio.buy([account_id], ticker, amount, price)
+                    else:
+                        stock_amount = accounts[account_id].get_stock(ticker).quantity * amount
+                        accounts[account_id].sell(ticker=ticker, stock_amount=stock_amount)
+                        portfolio.sell([account_id], ticker, stock_amount, price)
+
+            all_match = all_match and values_match(accounts, portfolio)
+            all_match = all_match and np.allclose(portfolio.get_account_values(),
+                                                  [account.get_account_value() for account in accounts],
+                                                  rtol=1e-12)
+        helper_functions.evaluator_helper(all_match)
+
+        print("Checking the values can be written back to the accounts")
+        portfolio.sell(np.arange(ACCOUNT_COUNT), "PORTFOLIO_A", portfolio.quantity[:, 0],
+                       RECORDED_PRICES["PORTFOLIO_A"][-1])
+        portfolio.write_to_accounts(accounts)
+        helper_functions.evaluator_helper(values_match(accounts, portfolio))
+        helper_functions.evaluator_helper(all(account.get_stock("PORTFOLIO_A").quantity == 0 for account in accounts))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Author: Joel Yuhas
+Date: October 17th, 2026
+
+Offline test for PriceArrayLibrary. Converts temporary interval, daily, and downloaded daily files with some bad lines
+into the columnar arrays, then checks the memory mapped arrays, the date index, and the date range offsets.
+
+"""
+import contextlib
+import io
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+from libraries.PriceArrayLibrary import PriceArrayLibrary, wall_time_to_epoch
+from libraries import helper_functions
+
+
+def main():
+    with tempfile.TemporaryDirectory() as temp_directory:
+        temp_path = Path(temp_directory)
+        with open(temp_path / "ARRAY_TEST_interval.txt", "w") as file:
+            file.write("2024-01-02-09:30:00,100.000\n")
+            file.write("2024-01-02-09:35:00,ERROR-1\n")
+            file.write("2024-01-02-09:40:00,101.000\n")
+            file.write("2024-01-03-09:30:00,102.000\n")
+        with open(temp_path / "ARRAY_TEST_2024_01_interval.txt", "w") as file:
+            file.write("2024-01-04-09:30:00,103.000\n")
+            file.write("2024-01-04-09:35:00,104.000\n")
+        with open(temp_path / "array_test.us.txt", "w") as file:
+            file.write("Date,Open,High,Low,Close,Volume,OpenInt\n")
+            file.write("2024-01-02,99.0,101.0,98.0,100.5,1000,0\n")
+            file.write("2024-01-03,100.5,103.0,100.0,102.5,2000,0\n")
+        with open(temp_path / "ARRAY_TEST_daily.txt", "w") as file:
+            file.write("2024-01-03,100.0,103.5,100.0,102.0,2500\n")
+            file.write("2024-01-04,ERROR-1\n")
+
+        price_array_library = PriceArrayLibrary(array_path=temp_path / "arrays", database_path=temp_path,
+                                                observer_database_path=temp_path,
+                                                downloaded_database_path=temp_path)
+
+        print("Checking the conversion reports the bad lines once")
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            price_array_library.build_ticker("ARRAY_TEST")
+        helper_functions.evaluator_helper(output.getvalue().count("Skipped 1 bad lines") == 2)
+
+        print("Checking the interval arrays are memory mapped and sorted")
+        timestamps, prices = price_array_library.load_ticker("ARRAY_TEST")
+        helper_functions.evaluator_helper(isinstance(prices, np.memmap))
+        helper_functions.evaluator_helper(timestamps.dtype == np.int64 and prices.dtype == np.float64)
+        helper_functions.evaluator_helper(list(prices) == [100.0, 101.0, 102.0, 103.0, 104.0])
+        helper_functions.evaluator_helper(bool(np.all(np.diff(timestamps) > 0)))
+
+        print("Checking the date index")
+        date_index = price_array_library.load_date_index("ARRAY_TEST")
+        helper_functions.evaluator_helper(date_index[:, 1].tolist() == [0, 2, 3])
+        helper_functions.evaluator_helper(date_index[0, 0] == wall_time_to_epoch("2024-01-02", "%Y-%m-%d"))
+        start, end = price_array_library.get_date_range_offsets("ARRAY_TEST", "2024-01-03", "2024-01-04")
+        helper_functions.evaluator_helper(list(prices[start:end]) == [102.0])
+        start, end = price_array_library.get_date_range_offsets("ARRAY_TEST", start_date="2024-01-03")
+        helper_functions.evaluator_helper(list(prices[start:end]) == [102.0, 103.0, 104.0])
+        start, end = price_array_library.get_date_range_offsets("ARRAY_TEST", start_date="2024-02-01")
+        helper_functions.evaluator_helper(start == end == len(prices))
+
+        print("Checking the daily arrays, with the recorded daily file taking priority")
+        daily_timestamps, daily_ohlcv = price_array_library.load_daily("ARRAY_TEST")
+        helper_functions.evaluator_helper(len(daily_timestamps) == 2)
+        helper_functions.evaluator_helper(daily_ohlcv[0].tolist() == [99.0, 101.0, 98.0, 100.5, 1000.0])
+        helper_functions.evaluator_helper(daily_ohlcv[1].tolist() == [100.0, 103.5, 100.0, 102.0, 2500.0])
+
+
+if __name__ == "__main__":
+    main()
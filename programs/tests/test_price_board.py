@@ -0,0 +1,86 @@
+"""
+Author: Joel Yuhas
+Date: October 17th, 2026
+
+Test the shared memory price board between a writer and a reader in a separate process.
+
+"""
+import multiprocessing
+import tempfile
+import time
+from pathlib import Path
+
+from libraries.PriceBoard import PriceBoard, MAX_TICKER_BYTES
+from libraries import helper_functions
+
+PUBLISH_COUNT = 20000
+
+
+def reader_process(board_file: Path, result_queue: multiprocessing.Queue):
+    """
+    Read the board as fast as possible while the writer publishes, checking every read is consistent.
+
+    """
+    board = PriceBoard(board_file)
+    consistent = True
+    last_sequence = 0
+    while last_sequence < PUBLISH_COUNT:
+        value = board.read("QQQ")
+        if value is None:
+            continue
+        price, timestamp, sequence = value
+        # The writer always publishes the price as the sequence number, so a torn read would not match
+        if price != float(sequence) or timestamp != float(sequence) or sequence < last_sequence:
+            consistent = False
+        last_sequence = sequence
+    board.close()
+    result_queue.put(consistent)
+
+
+def main():
+    with tempfile.TemporaryDirectory() as temp_directory:
+        board_file = Path(temp_directory) / "price_board.mmap"
+
+        with PriceBoard(board_file, writer=True) as writer_board:
+            print("Reading a ticker that hasn't been published")
+            helper_functions.evaluator_helper(PriceBoard(board_file).read("QQQ") is None)
+
+            result_queue = multiprocessing.Queue()
+            reader = multiprocessing.Process(target=reader_process, args=(board_file, result_queue))
+            reader.start()
+
+            for sequence in range(1, PUBLISH_COUNT + 1):
+                writer_board.publish("QQQ", float(sequence), float(sequence))
+                writer_board.publish("TQQQ", 50.0, time.time())
+
+            print("Checking the reader only saw consistent values")
+            helper_functions.evaluator_helper(result_queue.get(timeout=30))
+            reader.join()
+
+            print("Checking the final values")
+            reader_board = PriceBoard(board_file)
+            helper_functions.evaluator_helper(reader_board.read("QQQ") == (float(PUBLISH_COUNT), float(PUBLISH_COUNT),
+                                                                           PUBLISH_COUNT))
+            helper_functions.evaluator_helper(reader_board.read("TQQQ")[0] == 50.0)
+            reader_board.close()
+
+        # A new writer should keep the slots from the previous run
+        print("Reopening the board as a writer")
+        with PriceBoard(board_file, writer=True) as writer_board:
+            helper_functions.evaluator_helper(writer_board.read("QQQ")[2] == PUBLISH_COUNT)
+
+            print("Checking a ticker too long for a slot is refused instead of cut down")
+            long_ticker = "A" * (MAX_TICKER_BYTES + 1)
+            try:
+                writer_board.publish(long_ticker, 1.0, time.time())
+                refused = False
+            except ValueError:
+                refused = True
+            helper_functions.evaluator_helper(refused)
+            helper_functions.evaluator_helper(writer_board.read(long_ticker[:MAX_TICKER_BYTES]) is None)
+            writer_board.publish("A" * MAX_TICKER_BYTES, 2.0, time.time())
+            helper_functions.evaluator_helper(writer_board.read("A" * MAX_TICKER_BYTES)[0] == 2.0)
+
+
+if __name__ == "__main__":
+    main()
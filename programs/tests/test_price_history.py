@@ -0,0 +1,90 @@
+"""
+Author: Joel Yuhas
+Date: October 17th, 2026
+
+Offline test for PriceHistory. Checks the rolling indicators after every price against computing them from scratch
+over the window, then checks a retro stock warm starts its history from the recorded prices.
+
+"""
+import random
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+from libraries.PriceArrayLibrary import PriceArrayLibrary
+from libraries.PriceHistory import PriceHistory
+from libraries.StockFactory import StockFactory
+from libraries.StockSubClasses import StockRetro
+from libraries import helper_functions
+
+WINDOW_SIZE = 50
+EMA_SPAN = 10
+PRICE_COUNT = 1000
+
+
+def is_close(value: float, expected: float) -> bool:
+    return abs(value - expected) <= 1e-9 * max(1.0, abs(expected))
+
+
+def main():
+    generator = random.Random(17)
+    prices = [100.0]
+    for _ in range(PRICE_COUNT - 1):
+        prices.append(round(prices[-1] * (1 + generator.uniform(-0.01, 0.01)), 3))
+    volumes = [float(generator.randint(1, 1000)) for _ in prices]
+
+    print("Checking the indicators against computing them over the whole window")
+    price_history = PriceHistory(WINDOW_SIZE, EMA_SPAN)
+    helper_functions.evaluator_helper(price_history.get_sma() is None and price_history.get_vwap() is None)
+    alpha = 2 / (EMA_SPAN + 1)
+    ema = prices[0]
+    all_match = True
+    for tick, (price, volume) in enumerate(zip(prices, volumes)):
+        price_history.append(price, volume)
+        window = np.array(prices[max(tick + 1 - WINDOW_SIZE, 0):tick + 1])
+        window_volumes = np.array(volumes[max(tick + 1 - WINDOW_SIZE, 0):tick + 1])
+        ema = ema if tick == 0 else ema + alpha * (price - ema)
+        all_match = all_match and \
+            np.array_equal(price_history.get_prices(), window) and \
+            price_history.get_min() == window.min() and \
+            price_history.get_max() == window.max() and \
+            is_close(price_history.get_sma(), window.mean()) and \
+            is_close(price_history.get_stddev(), window.std()) and \
+            is_close(price_history.get_ema(), ema) and \
+            is_close(price_history.get_vwap(), np.dot(window, window_volumes) / window_volumes.sum())
+    helper_functions.evaluator_helper(all_match)
+    helper_functions.evaluator_helper(len(price_history) == WINDOW_SIZE)
+    helper_functions.evaluator_helper(price_history.get_last_price() == prices[-1])
+
+    print("Checking prices without a volume have no VWAP")
+    price_history = PriceHistory(WINDOW_SIZE)
+    price_history.extend(prices[:10])
+    helper_functions.evaluator_helper(price_history.get_vwap() is None)
+    helper_functions.evaluator_helper(price_history.get_stddev() >= 0)
+
+    print("Checking a retro stock warm starts its price history")
+    with tempfile.TemporaryDirectory() as temp_directory:
+        temp_path = Path(temp_directory)
+        with open(temp_path / "HISTORY_TEST_interval.txt", "w") as file:
+            for minute, price in enumerate(prices[:20]):
+                file.write(f"2024-01-02-10:{minute:02d}:00,{price:.3f}\n")
+
+        StockRetro.price_array_library = PriceArrayLibrary(array_path=temp_path, database_path=temp_path,
+                                                           observer_database_path=temp_path,
+                                                           downloaded_database_path=temp_path)
+        StockRetro.load_price_arrays("HISTORY_TEST")
+        StockRetro.cursors["HISTORY_TEST"] = 9
+        stock = StockFactory("retro").create_stock("HISTORY_TEST")
+        # The recorded prices aren't read until the price history is used
+        helper_functions.evaluator_helper(stock.warm_price_history is None)
+        helper_functions.evaluator_helper(stock.price_history.get_prices().tolist() == prices[:10])
+
+        StockRetro.advance("HISTORY_TEST")
+        stock.update_stock_values()
+        helper_functions.evaluator_helper(stock.price_history.get_prices().tolist() == prices[:11])
+        helper_functions.evaluator_helper(stock.price_history.get_max() == max(prices[:11]))
+
+
+if __name__ == "__main__":
+    main()
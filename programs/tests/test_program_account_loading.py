@@ -6,6 +6,9 @@ Test creating and loading accounts
 
 """
 import os
+import shutil
+import tempfile
+from pathlib import Path
 from libraries.AccountLibrary import AccountLibrary
 from libraries.StockFactory import StockFactory
 from libraries import helper_functions
@@ -14,21 +17,24 @@ from libraries import helper_functions
 def main():
     os.system('color')
 
-    account_path = helper_functions.ACCOUNT_LOG_PATH / "account_program_04_QQQ"
-    # stock_factory = StockFactory("observer")
-    stock_factory = StockFactory("direct")
-    account_one = AccountLibrary(account_number="1",
-                                 account_path=account_path,
-                                 stock_factory=stock_factory)
-
-
-    # POSITIVE TEST
-    # ------------------
-    print("BEGINNING TEST")
-    account_one.load_from_file()
-    account_one.print_account()
-    account_one.update_stock_values_all()
-    account_one.print_account()
+    with tempfile.TemporaryDirectory() as temp_directory:
+        # Load a copy of the account so the test doesn't write to the real one
+        account_path = Path(temp_directory) / "account_program_04_QQQ"
+        shutil.copytree(helper_functions.ACCOUNT_LOG_PATH / "account_program_04_QQQ", account_path)
+        # stock_factory = StockFactory("observer")
+        stock_factory = StockFactory("direct")
+        account_one = AccountLibrary(account_number="1",
+                                     account_path=account_path,
+                                     stock_factory=stock_factory)
+
+
+        # POSITIVE TEST
+        # ------------------
+        print("BEGINNING TEST")
+        account_one.load_from_file()
+        account_one.print_account()
+        account_one.update_stock_values_all()
+        account_one.print_account()
 
 
 main()
@@ -0,0 +1,134 @@
+"""
+Author: Joel Yuhas
+Date: October 17th, 2026
+
+Offline test for filling orders at quotes. Checks a buy or sell right after an update fills at the price of the update
+without getting the price again, using a local stand-in provider that counts its calls, and that a stale quote is
+gotten again. Also checks board and retro stocks keep the sequence number of their price source in their quotes.
+
+"""
+import contextlib
+import io
+import tempfile
+import time
+from pathlib import Path
+
+from libraries.AccountLibrary import AccountLibrary
+from libraries.MarketDataProvider import get_market_data_provider, set_market_data_provider
+from libraries.PriceArrayLibrary import PriceArrayLibrary
+from libraries.PriceBoard import PriceBoard
+from libraries.Quote import Quote
+from libraries.StockFactory import StockFactory
+from libraries.StockSubClasses import StockBoard, StockRetro
+from libraries import helper_functions
+from programs.tests.stand_in_market_data import StandInProvider
+
+TICKER = "QUOTE"
+
+
+def main():
+    previous_provider = get_market_data_provider()
+    provider = StandInProvider(price=40.0)
+    set_market_data_provider(provider)
+    try:
+        with tempfile.TemporaryDirectory() as temp_directory:
+            temp_path = Path(temp_directory)
+            with contextlib.redirect_stdout(io.StringIO()):
+                account = AccountLibrary(account_number=1, account_path=temp_path / "account",
+                                         stock_factory=StockFactory("direct"))
+                account.deposit_money(1000)
+
+            print("Checking a new stock is bought at the price it was created with")
+            provider.single_calls = 0
+            with contextlib.redirect_stdout(io.StringIO()):
+                account.buy(ticker=TICKER, dollar_amount=400)
+            helper_functions.evaluator_helper(provider.single_calls == 1)
+            helper_functions.evaluator_helper(account.transactions[-1].stock_price == 40.0)
+
+            print("Checking an order after an update fills at the update's quote")
+            provider.price = 42.0
+            account.update_stock_values_all()
+            provider.price = 45.0
+            provider.single_calls = 0
+            with contextlib.redirect_stdout(io.StringIO()):
+                account.sell(ticker=TICKER, stock_amount=5)
+                account.buy(ticker=TICKER, dollar_amount=42)
+            helper_functions.evaluator_helper(provider.single_calls == 0 and provider.bulk_calls == 1)
+            helper_functions.evaluator_helper([transaction.stock_price for transaction in
+                                               list(account.transactions.recent)[-2:]] == [42.0, 42.0])
+
+            print("Checking a stale quote is gotten again")
+            account.max_quote_age = -1.0
+            with contextlib.redirect_stdout(io.StringIO()):
+                account.sell(ticker=TICKER, stock_amount=1)
+            helper_functions.evaluator_helper(provider.single_calls == 1)
+            helper_functions.evaluator_helper(account.transactions[-1].stock_price == 45.0)
+
+            print("Checking an order fills at a given quote")
+            account.max_quote_age = 60.0
+            with contextlib.redirect_stdout(io.StringIO()):
+                account.sell(ticker=TICKER, stock_amount=1, quote=Quote(TICKER, 50.0, sequence=7))
+            helper_functions.evaluator_helper(provider.single_calls == 1)
+            helper_functions.evaluator_helper(account.transactions[-1].stock_price == 50.0)
+            with contextlib.redirect_stdout(io.StringIO()):
+                account.sell(ticker=TICKER, stock_amount=1, quote=Quote("OTHER", 60.0))
+            # A quote of another ticker can't be filled at, the price is gotten again
+            helper_functions.evaluator_helper(provider.single_calls == 2)
+            helper_functions.evaluator_helper(account.transactions[-1].stock_price == 45.0)
+
+            print("Checking board quotes keep the board's timestamp and sequence number")
+            previous_board = StockBoard.price_board
+            with PriceBoard(temp_path / "price_board.mmap", writer=True) as board:
+                StockBoard.price_board = board
+                try:
+                    board.publish(TICKER, 30.0, 1700000000.0)
+                    board.publish(TICKER, 31.0, 1700000060.0)
+                    quote = StockBoard.get_current_quote(TICKER)
+                    helper_functions.evaluator_helper((quote.price, quote.timestamp, quote.sequence) ==
+                                                      (31.0, 1700000060.0, 2))
+                    # The board last updated the price long ago, so the quote is already too old to fill at
+                    helper_functions.evaluator_helper(quote.is_stale())
+
+                    print("Checking the quotes of a bulk update keep the board's timestamp and sequence number")
+                    published_at = time.time()
+                    board.publish(TICKER, 32.0, published_at)
+                    with contextlib.redirect_stdout(io.StringIO()):
+                        board_account = AccountLibrary(account_number=3, account_path=temp_path / "board",
+                                                       stock_factory=StockFactory("board"))
+                        board_account.deposit_money(100)
+                        board_account.buy(ticker=TICKER, dollar_amount=32)
+                    board_account.update_stock_values_all(StockFactory("board").get_current_prices([TICKER]))
+                    quote = board_account.get_stock(TICKER).last_quote
+                    helper_functions.evaluator_helper((quote.price, quote.timestamp, quote.sequence) ==
+                                                      (32.0, published_at, 3))
+                    helper_functions.evaluator_helper(not quote.is_stale())
+                finally:
+                    StockBoard.price_board = previous_board
+
+            print("Checking retro quotes are the recorded value at the cursor")
+            with open(temp_path / f"{TICKER}_interval.txt", "w") as file:
+                for minute, price in enumerate([10.0, 11.0, 12.0, 13.0]):
+                    file.write(f"2024-01-02-09:{30 + minute}:00,{price:.3f}\n")
+            StockRetro.price_array_library = PriceArrayLibrary(array_path=temp_path, database_path=temp_path,
+                                                               observer_database_path=temp_path,
+                                                               downloaded_database_path=temp_path)
+            StockRetro.cursors[TICKER] = 0
+            with contextlib.redirect_stdout(io.StringIO()):
+                retro_account = AccountLibrary(account_number=2, account_path=temp_path / "retro",
+                                               stock_factory=StockFactory("retro"))
+                retro_account.deposit_money(100)
+                retro_account.buy(ticker=TICKER, dollar_amount=50)
+                for _ in range(2):
+                    StockRetro.advance(TICKER)
+                    retro_account.update_stock_values_all()
+                retro_account.sell(ticker=TICKER, stock_amount=1)
+            stock = retro_account.get_stock(TICKER)
+            helper_functions.evaluator_helper(stock.last_quote.sequence == StockRetro.cursors[TICKER] == 2)
+            helper_functions.evaluator_helper(stock.last_quote.timestamp == StockRetro.get_current_timestamp(TICKER))
+            helper_functions.evaluator_helper(retro_account.transactions[-1].stock_price == 12.0)
+    finally:
+        set_market_data_provider(previous_provider)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Author: Joel Yuhas
+Date: October 17th, 2026
+
+Checks the numpy batch backtest of the rise and fall algorithm against running the same prices one update at a time
+through AccountLibrary, StockRetro, and rise_and_fall_transactions, the same way program_04 does. The fills and the
+account value after every update must match exactly.
+
+Runs against the recorded QQQ, TQQQ, and VOO values in the repository's databases directory.
+
+"""
+import contextlib
+import io
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from libraries.AccountLibrary import AccountLibrary
+from libraries.PriceArrayLibrary import PriceArrayLibrary
+from libraries.StockFactory import StockFactory
+from libraries.StockSubClasses import StockRetro
+from libraries import helper_functions
+from algorithms import rise_and_fall_transactions
+from algorithms.rise_and_fall_backtest import run_backtest, BUY, SELL, STARTING_AMOUNT_DOLLARS
+
+REPOSITORY_DATABASE_PATH = Path(__file__).resolve().parents[2] / 'databases'
+
+TICKERS = ["QQQ", "TQQQ", "VOO"]
+THRESHOLDS = [(0.5, 0.5), (1, 1), (2, 1)]
+
+# Max number of prices per ticker to run one update at a time, the batch backtest itself has no problem with all of them
+MAX_PRICES = 20000
+
+
+def run_one_at_a_time(ticker: str, loss_threshold: float, gain_threshold: float, account_path: Path) -> tuple:
+    """
+    Run the rise and fall algorithm through the account one price at a time.
+
+    :return: (tuple): The fill indexes, fill sides, fill prices, and account value after every update
+
+    """
+    StockRetro.cursors[ticker] = 0
+    fill_indexes, fill_sides, fill_prices = [], [], []
+    equity = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        account = AccountLibrary(account_number=1, account_path=account_path, stock_factory=StockFactory("retro"))
+        account.deposit_money(10000)
+        account.buy(ticker=ticker, dollar_amount=float(account.money))
+        equity.append(account.get_account_value())
+
+        while not StockRetro.is_finished(ticker):
+            transaction_count = len(account.transactions)
+            StockRetro.advance(ticker)
+            account.update_stock_values_all()
+            stock = account.get_stock(ticker)
+            if stock.quantity > 0:
+                rise_and_fall_transactions.sell_if_fall(account, stock, loss_threshold, stock.new_high)
+            else:
+                rise_and_fall_transactions.buy_if_rise(account, stock, gain_threshold, stock.new_low)
+            equity.append(account.get_account_value())
+            if len(account.transactions) > transaction_count:
+                fill_indexes.append(StockRetro.cursors[ticker])
+
+    for transaction in account.transactions:
+        if transaction.type in ("BUY", "SELL"):
+            fill_sides.append(BUY if transaction.type == "BUY" else SELL)
+            fill_prices.append(transaction.stock_price)
+
+    return [0] + fill_indexes, fill_sides, fill_prices, np.array(equity)
+
+
+def main():
+    with tempfile.TemporaryDirectory() as temp_directory:
+        temp_path = Path(temp_directory)
+        StockRetro.price_array_library = PriceArrayLibrary(
+            array_path=temp_path, database_path=REPOSITORY_DATABASE_PATH / 'developing_databases',
+            observer_database_path=REPOSITORY_DATABASE_PATH / 'observer_databases')
+
+        for ticker in TICKERS:
+            timestamps, prices = StockRetro.load_price_arrays(ticker)
+            # Limit the one at a time run by only giving StockRetro the first MAX_PRICES
+            prices = prices[:MAX_PRICES]
+            StockRetro.price_arrays[ticker] = (timestamps[:MAX_PRICES], prices)
+
+            for loss_threshold, gain_threshold in THRESHOLDS:
+                print(f"Checking {ticker} over {len(prices)} prices, loss {loss_threshold} gain {gain_threshold}")
+                batch_start = time.perf_counter()
+                result = run_backtest(prices, loss_threshold, gain_threshold)
+                batch_time = time.perf_counter() - batch_start
+
+                account_path = temp_path / f"account_{ticker}_{loss_threshold}_{gain_threshold}"
+                one_at_a_time_start = time.perf_counter()
+                fill_indexes, fill_sides, fill_prices, equity = run_one_at_a_time(ticker, loss_threshold,
+                                                                                  gain_threshold, account_path)
+                one_at_a_time_time = time.perf_counter() - one_at_a_time_start
+                print(f"{len(fill_indexes)} fills, batch {batch_time:.4f}s, one at a time {one_at_a_time_time:.2f}s")
+
+                helper_functions.evaluator_helper(result.fill_indexes.tolist() == fill_indexes)
+                helper_functions.evaluator_helper(result.fill_sides.tolist() == fill_sides)
+                helper_functions.evaluator_helper(result.fill_prices.tolist() == fill_prices)
+                helper_functions.evaluator_helper(np.array_equal(result.equity, equity))
+
+    print("Checking a run over no prices keeps the starting value")
+    result = run_backtest(np.array([]), 1.0, 1.0)
+    helper_functions.evaluator_helper(len(result.fill_indexes) == 0 and len(result.equity) == 0)
+    helper_functions.evaluator_helper(result.get_stats() == {'final_value': float(STARTING_AMOUNT_DOLLARS),
+                                                             'total_return': 0.0, 'max_drawdown': 0.0,
+                                                             'buy_count': 0, 'sell_count': 0})
+
+
+if __name__ == "__main__":
+    main()
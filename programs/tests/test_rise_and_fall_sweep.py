@@ -0,0 +1,105 @@
+"""
+Author: Joel Yuhas
+Date: October 17th, 2026
+
+Offline test for the rise and fall sweep. Builds the arrays of a short synthetic price walk from a temporary interval
+file, runs the threshold grid over it on one worker, and checks the saved results and the best run match running
+run_backtest directly.
+
+"""
+import argparse
+import contextlib
+import datetime
+import io
+import sqlite3
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+from libraries.PriceArrayLibrary import PriceArrayLibrary
+from libraries import helper_functions
+from algorithms.rise_and_fall_backtest import run_backtest
+from programs.utils import rise_and_fall_sweep
+
+TICKER = "SWEEP_TEST"
+LOSS_THRESHOLDS = [0.5, 1.0, 2.0]
+GAIN_THRESHOLDS = [0.5, 1.0, 2.0]
+
+# Days of synthetic prices, each with PRICES_PER_DAY prices five minutes apart from the open
+DAYS = ["2024-01-02", "2024-01-03", "2024-01-04"]
+PRICES_PER_DAY = 78
+
+
+def write_synthetic_prices(database_path: Path) -> np.ndarray:
+    """
+    Write a seeded random walk of prices as the interval file of TICKER.
+
+    :param database_path: (Path): Directory to write the interval file to
+    :return: (np.ndarray): The prices written, oldest first
+
+    """
+    generator = np.random.default_rng(17)
+    prices = np.round(100 * np.exp(np.cumsum(generator.normal(0, 0.004, len(DAYS) * PRICES_PER_DAY))), 3)
+    with open(database_path / f"{TICKER}_interval.txt", "w") as file:
+        for day_number, day in enumerate(DAYS):
+            market_open = datetime.datetime.strptime(day, "%Y-%m-%d") + datetime.timedelta(hours=9, minutes=30)
+            for offset in range(PRICES_PER_DAY):
+                timestamp = market_open + datetime.timedelta(minutes=5 * offset)
+                price = prices[day_number * PRICES_PER_DAY + offset]
+                file.write(f"{timestamp.strftime('%Y-%m-%d-%H:%M:%S')},{price:.3f}\n")
+    return prices
+
+
+def main():
+    with tempfile.TemporaryDirectory() as temp_directory:
+        temp_path = Path(temp_directory)
+        prices = write_synthetic_prices(temp_path)
+        with contextlib.redirect_stdout(io.StringIO()):
+            PriceArrayLibrary(array_path=temp_path / "arrays", database_path=temp_path,
+                              observer_database_path=temp_path,
+                              downloaded_database_path=temp_path).build_ticker(TICKER)
+
+        args = argparse.Namespace(tickers=[TICKER], loss_thresholds=LOSS_THRESHOLDS, gain_thresholds=GAIN_THRESHOLDS,
+                                  random_count=0, loss_range=[0.1, 5], gain_range=[0.1, 5], seed=None,
+                                  date_ranges=[":", "2024-01-03:2024-01-04", "2030-01-01:"], workers=1,
+                                  array_path=str(temp_path / "arrays"), results_file=str(temp_path / "results.db"))
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            rise_and_fall_sweep.main(args)
+
+        conn = sqlite3.connect(temp_path / "results.db")
+        rows = conn.execute("SELECT start_date, end_date, loss_threshold, gain_threshold, price_count, final_value, "
+                            "total_return, max_drawdown, buy_count, sell_count FROM sweep_results").fetchall()
+        conn.close()
+
+        print("Checking every threshold pair is saved for the date ranges with prices")
+        helper_functions.evaluator_helper(len(rows) == 2 * len(LOSS_THRESHOLDS) * len(GAIN_THRESHOLDS))
+        helper_functions.evaluator_helper(f"No {TICKER} prices between 2030-01-01 and " in output.getvalue())
+
+        print("Checking the saved results match running the backtest directly")
+        expected = {}
+        date_range_prices = {("", ""): prices, ("2024-01-03", "2024-01-04"): prices[PRICES_PER_DAY:2 * PRICES_PER_DAY]}
+        for (start_date, end_date), range_prices in date_range_prices.items():
+            for loss_threshold in LOSS_THRESHOLDS:
+                for gain_threshold in GAIN_THRESHOLDS:
+                    stats = run_backtest(range_prices, loss_threshold, gain_threshold).get_stats()
+                    expected[(start_date, end_date, loss_threshold, gain_threshold)] = \
+                        (len(range_prices), stats['final_value'], stats['total_return'], stats['max_drawdown'],
+                         stats['buy_count'], stats['sell_count'])
+        helper_functions.evaluator_helper({row[:4]: row[4:] for row in rows} == expected)
+
+        print("Checking the best run over all the prices matches the direct backtest")
+        best_row = max((row for row in rows if row[:2] == ("", "")), key=lambda row: (row[6], -row[7]))
+        best_thresholds = max(((loss_threshold, gain_threshold) for loss_threshold in LOSS_THRESHOLDS
+                               for gain_threshold in GAIN_THRESHOLDS),
+                              key=lambda thresholds: (expected[("", "") + thresholds][2],
+                                                      -expected[("", "") + thresholds][3]))
+        helper_functions.evaluator_helper(best_row[2:4] == best_thresholds)
+        best_result = run_backtest(prices, *best_thresholds)
+        helper_functions.evaluator_helper(best_row[5] == best_result.get_final_value())
+        helper_functions.evaluator_helper(best_row[8] > 1)
+
+
+if __name__ == "__main__":
+    main()
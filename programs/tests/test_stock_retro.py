@@ -0,0 +1,85 @@
+"""
+Author: Joel Yuhas
+Date: October 17th, 2026
+
+Offline test for StockRetro. Builds price arrays from a temporary interval file, then runs an account with retro stocks
+through the rise and fall algorithm the same way program_04 does.
+
+"""
+import tempfile
+from pathlib import Path
+
+from libraries.AccountLibrary import AccountLibrary
+from libraries.PriceArrayLibrary import PriceArrayLibrary, wall_time_to_epoch, epoch_to_wall_time
+from libraries.StockFactory import StockFactory
+from libraries.StockSubClasses import StockRetro
+from libraries import helper_functions
+from algorithms import rise_and_fall_transactions
+
+RECORDED_PRICES = [100.0, 102.0, 104.0, 101.0, 99.0, 100.0, 103.0, 105.0, 102.0, 106.0]
+
+
+def main():
+    with tempfile.TemporaryDirectory() as temp_directory:
+        temp_path = Path(temp_directory)
+        with open(temp_path / "RETRO_TEST_2024_01_interval.txt", "w") as file:
+            for minute, price in enumerate(RECORDED_PRICES):
+                file.write(f"2024-01-02-09:{30 + minute}:00,{price:.3f}\n")
+                if minute == 3:
+                    file.write(f"2024-01-02-09:{30 + minute}:30,ERROR-1\n")
+
+        StockRetro.price_array_library = PriceArrayLibrary(array_path=temp_path, database_path=temp_path,
+                                                           observer_database_path=temp_path)
+
+        print("Checking the arrays are built and memory mapped")
+        timestamps, prices = StockRetro.load_price_arrays("RETRO_TEST")
+        helper_functions.evaluator_helper(list(prices) == RECORDED_PRICES)
+        helper_functions.evaluator_helper(str(epoch_to_wall_time(timestamps[0])) == "2024-01-02 09:30:00")
+        helper_functions.evaluator_helper(timestamps[0] == wall_time_to_epoch("2024-01-02-09:30:00",
+                                                                              "%Y-%m-%d-%H:%M:%S"))
+
+        print("Running an account against the recorded values")
+        account = AccountLibrary(account_number=1, account_path=temp_path / "account",
+                                 stock_factory=StockFactory("retro"))
+        account.deposit_money(1000)
+        account.buy(ticker="RETRO_TEST", dollar_amount=account.money)
+        updates = 0
+        while True:
+            StockRetro.advance("RETRO_TEST")
+            account.update_stock_values_all()
+            updates += 1
+            stock = account.get_stock("RETRO_TEST")
+            if stock.quantity > 0:
+                rise_and_fall_transactions.sell_if_fall(account, stock, 2, stock.new_high)
+            else:
+                rise_and_fall_transactions.buy_if_rise(account, stock, 2, stock.new_low)
+            if StockRetro.is_finished("RETRO_TEST"):
+                break
+
+        helper_functions.evaluator_helper(updates == len(RECORDED_PRICES) - 1)
+        helper_functions.evaluator_helper(account.get_stock("RETRO_TEST").last_price == RECORDED_PRICES[-1])
+        # Bought at 100, sold at 101 after the fall from 104, bought at 103 after the rise from 99, sold at 102 after the
+        # fall from 105, and bought at 106 after the rise from 102
+        helper_functions.evaluator_helper(round(account.get_account_value(), 6) ==
+                                          round(1000 / 100 * 101 / 103 * 102 / 106 * 106, 6))
+
+        print("Checking every stock of a ticker sees the same value in an update")
+        StockRetro.cursors["RETRO_TEST"] = 0
+        other_account = AccountLibrary(account_number=2, account_path=temp_path / "account",
+                                       stock_factory=StockFactory("retro"))
+        other_account.deposit_money(1000)
+        other_account.buy(ticker="RETRO_TEST", dollar_amount=other_account.money)
+        StockRetro.advance("RETRO_TEST")
+        account.update_stock_values_all()
+        other_account.update_stock_values_all()
+        helper_functions.evaluator_helper(StockRetro.cursors["RETRO_TEST"] == 1)
+        helper_functions.evaluator_helper(account.get_stock("RETRO_TEST").last_price ==
+                                          other_account.get_stock("RETRO_TEST").last_price == RECORDED_PRICES[1])
+
+        print("Checking seek moves the cursor to the start time")
+        StockRetro.seek("RETRO_TEST", wall_time_to_epoch("2024-01-02-09:35:00", "%Y-%m-%d-%H:%M:%S"))
+        helper_functions.evaluator_helper(StockRetro.get_current_price("RETRO_TEST") == RECORDED_PRICES[5])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Author: Joel Yuhas
+Date: October 17th, 2026
+
+Test pushing ticks from a TickPublisher to a TickSubscriber over the local socket, including the fallback when no
+publisher is running.
+
+"""
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from libraries.TickPublisher import TickPublisher, TickSubscriber
+from libraries import helper_functions
+
+
+def main():
+    with tempfile.TemporaryDirectory() as temp_directory:
+        socket_file = Path(temp_directory) / "ticks.sock"
+
+        # No publisher running, the subscriber should wait out the timeout and return nothing
+        print("Waiting with no publisher")
+        subscriber = TickSubscriber(socket_file)
+        start_time = time.monotonic()
+        helper_functions.evaluator_helper(subscriber.wait_for_tick("QQQ", timeout=0.2) is None)
+        helper_functions.evaluator_helper(time.monotonic() - start_time >= 0.2)
+
+        with TickPublisher(socket_file) as publisher:
+            helper_functions.evaluator_helper(subscriber.connect())
+
+            # Publish from another thread after a short delay, the subscriber should wake up right away
+            print("Waiting on a pushed tick")
+            timer = threading.Timer(0.1, publisher.publish, args=("QQQ", 400.5, time.time()))
+            timer.start()
+            start_time = time.monotonic()
+            tick = subscriber.wait_for_tick("QQQ", timeout=5)
+            helper_functions.evaluator_helper(tick is not None and tick["price"] == 400.5)
+            helper_functions.evaluator_helper(time.monotonic() - start_time < 1)
+            timer.join()
+
+            # Ticks for other stocks are skipped, and only the newest tick for the stock is returned
+            print("Checking only the newest matching tick is returned")
+            publisher.publish("TQQQ", 50.0, time.time())
+            publisher.publish("QQQ", 401.0, time.time())
+            publisher.publish("QQQ", 402.0, time.time())
+            time.sleep(0.1)
+            tick = subscriber.wait_for_tick("QQQ", timeout=1)
+            helper_functions.evaluator_helper(tick["price"] == 402.0)
+            helper_functions.evaluator_helper(subscriber.wait_for_tick("QQQ", timeout=0.1) is None)
+
+            # An update of many tickers wakes a subscriber waiting on all of them once
+            print("Checking the ticks of one update are taken together")
+            publisher.publish("QQQ", 403.0, time.time())
+            publisher.publish("SPY", 500.0, time.time())
+            timer = threading.Timer(0.1, publisher.publish, args=("TQQQ", 51.0, time.time()))
+            timer.start()
+            start_time = time.monotonic()
+            ticks = subscriber.wait_for_ticks(["QQQ", "TQQQ"], timeout=5)
+            helper_functions.evaluator_helper({ticker: tick["price"] for ticker, tick in ticks.items()} ==
+                                              {"QQQ": 403.0, "TQQQ": 51.0})
+            helper_functions.evaluator_helper(time.monotonic() - start_time < 1)
+            timer.join()
+            publisher.publish("QQQ", 404.0, time.time())
+            start_time = time.monotonic()
+            ticks = subscriber.wait_for_ticks(["QQQ", "TQQQ"], timeout=5, settle_seconds=0.2)
+            helper_functions.evaluator_helper(list(ticks) == ["QQQ"] and time.monotonic() - start_time < 1)
+            helper_functions.evaluator_helper(subscriber.wait_for_ticks(["QQQ", "TQQQ"], timeout=0.1) == {})
+
+            # Waiting on any ticker returns the newest tick sent
+            print("Checking the newest tick of any ticker is returned")
+            publisher.publish("QQQ", 405.0, time.time())
+            publisher.publish("SPY", 501.0, time.time())
+            time.sleep(0.1)
+            tick = subscriber.wait_for_tick(timeout=1)
+            helper_functions.evaluator_helper(tick["ticker"] == "SPY" and tick["price"] == 501.0)
+
+        # The publisher shut down, the subscriber should drop the connection and wait out the timeout
+        print("Waiting after the publisher closed")
+        helper_functions.evaluator_helper(subscriber.wait_for_tick("QQQ", timeout=0.2) is None)
+        subscriber.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""
+Author: Joel Yuhas
+Date: October 17th, 2026
+
+Offline test for TradingEngine. Runs the rise and fall strategy for several accounts on two stocks in one engine, using a
+local stand-in provider that counts its calls, and checks the prices are gotten once per cycle for all the accounts,
+the accounts trade the same as when each one is run on its own, and only the accounts that traded are saved.
+
+"""
+import contextlib
+import io
+import tempfile
+from pathlib import Path
+
+from algorithms import rise_and_fall_transactions
+from libraries.AccountJournal import AccountJournal
+from libraries.AccountLibrary import AccountLibrary
+from libraries.MarketDataProvider import get_market_data_provider, set_market_data_provider
+from libraries.StockFactory import StockFactory
+from libraries.TradingEngine import TradingEngine
+from libraries.TransactionLedger import TransactionLedger
+from libraries import helper_functions
+from programs.tests.stand_in_market_data import StandInProvider
+
+# Prices of each stock for every cycle, rising and falling enough to trade at the thresholds below
+PRICE_PATHS = {"RISE": [100, 104, 99, 95, 101, 108, 103, 97, 102, 110],
+               "FALL": [50, 48, 51, 53, 49, 46, 50, 54, 52, 47]}
+THRESHOLDS = [0.5, 2.0, 5.0, 20.0]
+
+
+def get_cycle_prices(cycle: int) -> dict[str, float]:
+    return {ticker: float(prices[cycle]) for ticker, prices in PRICE_PATHS.items()}
+
+
+def make_account(account_number: int, account_path: Path, ticker: str) -> AccountLibrary:
+    account = AccountLibrary(account_number=account_number, account_path=account_path,
+                             stock_factory=StockFactory("direct"))
+    account.deposit_money(1000)
+    account.buy(ticker=ticker, dollar_amount=account.money)
+    return account
+
+
+def get_trades(account: AccountLibrary) -> list[tuple]:
+    return [(transaction.type, transaction.ticker, transaction.stock_price) for transaction in account.transactions]
+
+
+def main():
+    previous_provider = get_market_data_provider()
+    provider = StandInProvider(prices=get_cycle_prices(0))
+    set_market_data_provider(provider)
+    try:
+        with tempfile.TemporaryDirectory() as temp_directory:
+            temp_path = Path(temp_directory)
+            engine = TradingEngine(StockFactory("direct"))
+            engine_accounts = []
+            with contextlib.redirect_stdout(io.StringIO()):
+                for ticker in PRICE_PATHS:
+                    for account_number, threshold in enumerate(THRESHOLDS):
+                        account = make_account(account_number, temp_path / "engine" / ticker, ticker)
+                        engine.add_account(account, ticker,
+                                           rise_and_fall_transactions.rise_and_fall_strategy(threshold, threshold))
+                        engine_accounts.append((account, ticker, threshold))
+
+                provider.single_calls = 0
+                provider.bulk_calls = 0
+                saved_cycles = []
+                left_unsaved = []
+                for cycle in range(len(PRICE_PATHS["RISE"])):
+                    provider.prices = get_cycle_prices(cycle)
+                    journal_sizes = [account.account_journal.journal_file.stat().st_size
+                                     if account.account_journal.journal_file.exists() else 0
+                                     for account, _, _ in engine_accounts]
+                    engine.run_cycle()
+                    saved_cycles.append([account.account_journal.journal_file.stat().st_size != size
+                                         for (account, _, _), size in zip(engine_accounts, journal_sizes)])
+                    left_unsaved.append(len(engine.unsaved_accounts))
+
+            print("Checking the prices are gotten once per cycle for all the accounts")
+            helper_functions.evaluator_helper(provider.bulk_calls == len(PRICE_PATHS["RISE"]))
+            helper_functions.evaluator_helper(provider.single_calls == 0)
+            helper_functions.evaluator_helper(sorted(engine.get_tickers()) == sorted(PRICE_PATHS))
+            helper_functions.evaluator_helper(len(engine.accounts) == len(PRICE_PATHS) * len(THRESHOLDS))
+
+            print("Checking the engine trades the same as each account run on its own")
+            separate_trades = []
+            with contextlib.redirect_stdout(io.StringIO()):
+                for account_number, (_, ticker, threshold) in enumerate(engine_accounts):
+                    provider.prices = get_cycle_prices(0)
+                    account = make_account(account_number, temp_path / "separate" / str(account_number), ticker)
+                    for cycle in range(len(PRICE_PATHS["RISE"])):
+                        provider.prices = get_cycle_prices(cycle)
+                        account.update_stock_values_all()
+                        stock = account.get_stock(ticker)
+                        if stock.quantity > 0:
+                            rise_and_fall_transactions.sell_if_fall(account, stock, threshold, stock.new_high)
+                        else:
+                            rise_and_fall_transactions.buy_if_rise(account, stock, threshold, stock.new_low)
+                    separate_trades.append((get_trades(account), account.money))
+            engine_trades = [(get_trades(account), account.money) for account, _, _ in engine_accounts]
+            helper_functions.evaluator_helper(engine_trades == separate_trades)
+            # Some accounts traded during the cycles and some didn't
+            trade_counts = [len(trades) for trades, _ in engine_trades]
+            helper_functions.evaluator_helper(max(trade_counts) > 2 and min(trade_counts) == 2)
+
+            print("Checking only the accounts that traded are saved each cycle")
+            # An account that never traded in the cycles was never saved by them
+            helper_functions.evaluator_helper(all(not any(saved[index] for saved in saved_cycles)
+                                                  for index, count in enumerate(trade_counts) if count == 2))
+            helper_functions.evaluator_helper(sum(any(saved) for saved in saved_cycles) > 0)
+            helper_functions.evaluator_helper(not any(left_unsaved))
+            with contextlib.redirect_stdout(io.StringIO()):
+                engine.save_accounts(end_of_day_save=True)
+            for account, ticker, _ in engine_accounts:
+                recovered = AccountJournal(account.account_parent_path, account.account_number).recover()
+                helper_functions.evaluator_helper(recovered is not None and
+                                                  recovered["money"] == account.money)
+            helper_functions.evaluator_helper(all(ledger.unsynced_records == 0 and not ledger.buffer
+                                                  for ledger in TransactionLedger.open_ledgers.values()))
+
+            print("Checking an error in one account doesn't stop the others")
+            def failing_strategy(account: AccountLibrary, stock) -> bool:
+                raise AssertionError
+
+            with contextlib.redirect_stdout(io.StringIO()):
+                failing_account = make_account(len(THRESHOLDS), temp_path / "engine" / "RISE", "RISE")
+            failing_engine = TradingEngine(StockFactory("direct"))
+            failing_engine.add_account(failing_account, "RISE", failing_strategy)
+            counted_calls = []
+            failing_engine.add_account(engine_accounts[0][0], "RISE",
+                                       lambda account, stock: counted_calls.append(stock.last_price) or False)
+            with contextlib.redirect_stdout(io.StringIO()) as output:
+                failing_engine.run_cycle()
+            helper_functions.evaluator_helper(counted_calls == [provider.prices["RISE"]])
+            helper_functions.evaluator_helper("Issue running the strategy of account" in output.getvalue())
+            helper_functions.evaluator_helper(not failing_engine.unsaved_accounts)
+
+            print("Checking the tickers split into shards")
+            helper_functions.evaluator_helper(TradingEngine.split_tickers(["A", "B", "C", "D", "E"], 2) ==
+                                              [["A", "C", "E"], ["B", "D"]])
+            helper_functions.evaluator_helper(TradingEngine.split_tickers(["A"], 4) == [["A"]])
+            TransactionLedger.close_all()
+    finally:
+        set_market_data_provider(previous_provider)
+
+
+if __name__ == "__main__":
+    main()
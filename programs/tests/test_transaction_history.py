@@ -0,0 +1,116 @@
+"""
+Author: Joel Yuhas
+Date: October 17th, 2026
+
+Offline test for TransactionHistory. Makes many transactions in an account with a small ring of recent transactions and
+checks only the recent ones stay in memory, while the whole history can still be counted, indexed, and gone through a
+page at a time from the transaction ledger.
+
+"""
+import contextlib
+import io
+import tempfile
+from pathlib import Path
+
+from libraries.AccountLibrary import AccountLibrary
+from libraries.MarketDataProvider import get_market_data_provider, set_market_data_provider
+from libraries.StockFactory import StockFactory
+from libraries.TransactionHistory import TransactionHistory
+from libraries.TransactionLedger import TransactionLedger
+from libraries import helper_functions
+from programs.tests.stand_in_market_data import StandInProvider
+
+MAX_RECENT = 5
+ROUNDS = 20
+
+
+def main():
+    previous_provider = get_market_data_provider()
+    set_market_data_provider(StandInProvider(price=20.0, price_step=0.25))
+    try:
+        with tempfile.TemporaryDirectory() as temp_directory:
+            temp_path = Path(temp_directory)
+            made = []
+            with contextlib.redirect_stdout(io.StringIO()):
+                account = AccountLibrary(account_number=7, account_path=temp_path,
+                                         stock_factory=StockFactory("direct"))
+                account.transactions = TransactionHistory(account.transaction_file, account.account_file,
+                                                          max_recent=MAX_RECENT)
+                account.deposit_money(1000)
+                made.append(("DEPOSIT", None, None))
+                for round_number in range(ROUNDS):
+                    account.buy(ticker="HISTORY", dollar_amount=account.money)
+                    made.append(("BUY", "HISTORY", account.transactions[-1].stock_price))
+                    account.sell(ticker="HISTORY", stock_amount=account.get_stock("HISTORY").quantity)
+                    made.append(("SELL", "HISTORY", account.transactions[-1].stock_price))
+                    if round_number % 3 == 0:
+                        # Failed transactions in the middle of the ledger
+                        try:
+                            account.withdraw_money(account.money * 2)
+                        except AssertionError:
+                            pass
+                try:
+                    account.withdraw_money(account.money * 2)
+                except AssertionError:
+                    pass
+
+            print("Checking only the recent transactions are kept in memory")
+            helper_functions.evaluator_helper(len(account.transactions.recent) == MAX_RECENT)
+            helper_functions.evaluator_helper(len(account.transactions) == len(made))
+            # The failed withdraws are in the ledger but not the history
+            failed_count = len(range(0, ROUNDS, 3)) + 1
+            helper_functions.evaluator_helper(len(TransactionLedger.read_records(account.transaction_file)) ==
+                                              len(made) + failed_count)
+            helper_functions.evaluator_helper(len(account.transactions.failed_records) == failed_count)
+
+            print("Checking transactions are indexed across memory and the ledger")
+            helper_functions.evaluator_helper(account.transactions[-1] is account.transactions.recent[-1])
+            helper_functions.evaluator_helper(account.transactions[0].type == "DEPOSIT" and
+                                              account.transactions[0].dollar_amount == 1000)
+            helper_functions.evaluator_helper((account.transactions[3].type, account.transactions[3].stock_price) ==
+                                              made[3][0::2])
+            helper_functions.evaluator_helper([(transaction.type, transaction.ticker, transaction.stock_price)
+                                               for transaction in (account.transactions[index]
+                                                                   for index in range(len(made)))] == made)
+
+            print("Checking an old transaction is read without going through the ledger before it")
+            reads = []
+            read_records = TransactionLedger.read_records
+            TransactionLedger.read_records = staticmethod(lambda *args: reads.append(args[1:]) or read_records(*args))
+            try:
+                transaction = account.transactions[len(made) - MAX_RECENT - 1]
+            finally:
+                TransactionLedger.read_records = read_records
+            helper_functions.evaluator_helper(transaction.type == made[len(made) - MAX_RECENT - 1][0])
+            helper_functions.evaluator_helper(len(reads) == 1 and reads[0][1] == 1)
+            try:
+                account.transactions[len(made)]
+                helper_functions.evaluator_helper(False)
+            except IndexError:
+                helper_functions.evaluator_helper(True)
+
+            print("Checking the whole history goes through a page at a time")
+            pages = list(account.transactions.iter_pages(page_size=7))
+            helper_functions.evaluator_helper(all(len(page) == 7 for page in pages[:-1]))
+            helper_functions.evaluator_helper([(transaction.type, transaction.ticker, transaction.stock_price)
+                                               for page in pages for transaction in page] == made)
+            helper_functions.evaluator_helper([transaction.type for transaction in account.transactions] ==
+                                              [transaction_type for transaction_type, _, _ in made])
+            helper_functions.evaluator_helper(account.transactions.get_page(len(made) - 2, 7)[1].type == "SELL")
+
+            print("Checking a loaded account counts the history in its ledger")
+            with contextlib.redirect_stdout(io.StringIO()):
+                account.write_account_to_file()
+                loaded = AccountLibrary(account_number=7, account_path=temp_path,
+                                        stock_factory=StockFactory("direct"))
+                loaded.load_from_file()
+            helper_functions.evaluator_helper(len(loaded.transactions) == len(made))
+            helper_functions.evaluator_helper(len(loaded.transactions.recent) == 0)
+            helper_functions.evaluator_helper(loaded.transactions[-1].type == "SELL")
+            TransactionLedger.close_all()
+    finally:
+        set_market_data_provider(previous_provider)
+
+
+if __name__ == "__main__":
+    main()
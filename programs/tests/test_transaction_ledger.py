@@ -0,0 +1,112 @@
+"""
+Author: Joel Yuhas
+Date: October 17th, 2026
+
+Offline test for TransactionLedger. Makes transactions in an account and checks the ledger read back as arrays matches
+them, including a failed transaction, checks the durability levels and a partly written record, and converts a text
+transaction file into a ledger.
+
+"""
+import contextlib
+import io
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+from libraries.AccountLibrary import AccountLibrary
+from libraries.MarketDataProvider import get_market_data_provider, set_market_data_provider
+from libraries.StockFactory import StockFactory
+from libraries.TransactionLedger import (TransactionLedger, TRANSACTION_TYPES, DURABILITY_BUFFERED, DURABILITY_SYNC,
+                                         LEDGER_DTYPE)
+from libraries import helper_functions
+from programs.tests.stand_in_market_data import StandInProvider
+
+TEXT_TRANSACTIONS = """2023-07-09-23:28:16 account: 0.5 : DEPOSIT  -> 10000 total: 10000
+2023-07-09-23:28:16 account: 0.5 : BUY      -> 27.304500509626237 QQQ at $366.239990234375 total: $10000.0 balance: 0.0
+2023-07-10-10:01:00 account: 0.5 : ERROR#1: Not-enough-funds-to-withdraw: Funds 0.0 Request 50
+not a transaction line
+2023-07-14-15:01:18 account: 0.5 : SELL      -> 27.304500509626237 QQQ at $378.4389953613281 total: $10333.087741705825 balance: 10333.087741705825
+"""
+
+
+def main():
+    previous_provider = get_market_data_provider()
+    set_market_data_provider(StandInProvider(price=50.0))
+    try:
+        with tempfile.TemporaryDirectory() as temp_directory:
+            temp_path = Path(temp_directory)
+            with contextlib.redirect_stdout(io.StringIO()):
+                account = AccountLibrary(account_number=3, account_path=temp_path,
+                                         stock_factory=StockFactory("direct"))
+                account.deposit_money(1000)
+                account.buy(ticker="LEDGER", dollar_amount=400)
+                account.sell(ticker="LEDGER", stock_amount=2)
+                account.withdraw_money(100)
+                try:
+                    account.withdraw_money(10000)
+                except AssertionError:
+                    pass
+
+            print("Checking the ledger records match the transactions")
+            records = TransactionLedger.read_records(account.transaction_file)
+            helper_functions.evaluator_helper(records.dtype == LEDGER_DTYPE and len(records) == 5)
+            helper_functions.evaluator_helper(np.array_equal(records['transaction_id'], np.arange(1, 6)))
+            helper_functions.evaluator_helper(np.array_equal(records['type'], [TRANSACTION_TYPES[name] for name in
+                                                                               ("DEPOSIT", "BUY", "SELL", "WITHDRAW",
+                                                                                "WITHDRAW")]))
+            helper_functions.evaluator_helper(np.allclose(records['cash_after'], [1000, 600, 700, 600, 600]))
+            helper_functions.evaluator_helper(records['ticker'][1] == b"LEDGER" and records['quantity'][1] == 8.0
+                                              and records['price'][1] == 50.0 and np.isnan(records['price'][0]))
+            helper_functions.evaluator_helper(np.array_equal(records['error_code'], [0, 0, 0, 0, 1]))
+            helper_functions.evaluator_helper(np.all(records['account'] == b"3"))
+
+            print("Checking the ledger streams back in chunks")
+            chunks = list(TransactionLedger.iter_records(account.transaction_file, chunk_records=2))
+            helper_functions.evaluator_helper([len(chunk) for chunk in chunks] == [2, 2, 1])
+            helper_functions.evaluator_helper(np.concatenate(chunks).tobytes() == records.tobytes())
+
+            print("Checking the durability levels")
+            buffered_file = temp_path / "buffered.ledger"
+            buffered = TransactionLedger.get_ledger(buffered_file, DURABILITY_BUFFERED)
+            buffered.write(1, "DEPOSIT", dollar_amount=5.0, cash_after=5.0)
+            helper_functions.evaluator_helper(TransactionLedger.get_record_count(buffered_file) == 0)
+            helper_functions.evaluator_helper(len(TransactionLedger.read_records(buffered_file)) == 1)
+            sync_file = temp_path / "sync.ledger"
+            synced = TransactionLedger.get_ledger(sync_file, DURABILITY_SYNC)
+            synced.write(1, "DEPOSIT", dollar_amount=5.0, cash_after=5.0)
+            helper_functions.evaluator_helper(TransactionLedger.get_record_count(sync_file) == 1)
+            helper_functions.evaluator_helper(synced.unsynced_records == 0)
+
+            print("Checking a partly written record is cut off")
+            synced.close()
+            with open(sync_file, "ab") as file:
+                file.write(b"\x02\x00\x00")
+            with contextlib.redirect_stdout(io.StringIO()):
+                reopened = TransactionLedger.get_ledger(sync_file)
+            helper_functions.evaluator_helper(reopened.write(1, "WITHDRAW", dollar_amount=1.0, cash_after=4.0) == 2)
+            helper_functions.evaluator_helper(np.allclose(TransactionLedger.read_records(sync_file)['cash_after'],
+                                                          [5.0, 4.0]))
+
+            print("Checking a text transaction file converts to a ledger")
+            text_file = temp_path / "transaction_0.5.txt"
+            text_file.write_text(TEXT_TRANSACTIONS)
+            with contextlib.redirect_stdout(io.StringIO()) as output:
+                converted = TransactionLedger.convert_text_file(text_file, text_file.with_suffix(".ledger"))
+            helper_functions.evaluator_helper(converted == 4 and "Skipped 1 lines" in output.getvalue())
+            converted_records = TransactionLedger.read_records(text_file.with_suffix(".ledger"))
+            helper_functions.evaluator_helper(np.array_equal(converted_records['type'], [TRANSACTION_TYPES[name]
+                                                                                         for name in ("DEPOSIT", "BUY",
+                                                                                                      "WITHDRAW",
+                                                                                                      "SELL")]))
+            helper_functions.evaluator_helper(np.array_equal(converted_records['error_code'], [0, 0, 1, 0]))
+            helper_functions.evaluator_helper(converted_records['price'][3] == 378.4389953613281 and
+                                              converted_records['cash_after'][3] == 10333.087741705825)
+            helper_functions.evaluator_helper(np.all(converted_records['account'] == b"0.5"))
+            TransactionLedger.close_all()
+    finally:
+        set_market_data_provider(previous_provider)
+
+
+if __name__ == "__main__":
+    main()
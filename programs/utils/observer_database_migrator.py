@@ -0,0 +1,36 @@
+"""
+Author: Joel Yuhas
+Date: October 17th, 2026
+
+Utility to upgrade all the existing observer databases to the current schema, adding the timestamp index and the
+latest price table. Safe to run multiple times, already upgraded databases are left as is.
+
+"""
+import argparse
+from pathlib import Path
+
+from libraries.ObserverPattern import ObserverPattern
+from libraries.helper_functions import OBSERVER_DATABASE_PATH
+
+
+def arg_parser():
+    """
+    Get following information so the program can run
+    - directory of the observer databases to upgrade
+
+    """
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--database_path", type=str, default=str(OBSERVER_DATABASE_PATH),
+                        help="Directory with the stocks_*_YYYY_MM.db observer databases")
+
+    return parser.parse_args()
+
+
+def main(args):
+    for database_file in sorted(Path(args.database_path).glob("stocks_*.db")):
+        print(f"Upgrading {database_file.name}")
+        ObserverPattern.migrate_db(database_file)
+
+
+args = arg_parser()
+main(args)
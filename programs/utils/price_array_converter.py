@@ -0,0 +1,89 @@
+"""
+Author: Joel Yuhas
+Date: October 17th, 2026
+
+Utility to convert the recorded text databases (the developing_databases interval and daily files, the observer
+databases, and the downloaded_databases daily files) into the PriceArrayLibrary columnar arrays. After converting, the
+arrays are loaded back as memory maps and the load time is printed.
+
+Tickers are found from the interval and daily file names if none are given. Bad lines are reported once per file while
+converting.
+
+Example:
+    python price_array_converter.py
+    python price_array_converter.py --tickers QQQ --database_path ../../databases/developing_databases
+
+"""
+import argparse
+import time
+from pathlib import Path
+
+from libraries.PriceArrayLibrary import PriceArrayLibrary
+from libraries.helper_functions import (DATABASE_PATH, DOWNLOADED_DATABASE_PATH, OBSERVER_DATABASE_PATH,
+                                        RETRO_DATABASE_PATH)
+
+
+def arg_parser():
+    """
+    Get following information so the program can run
+    - tickers to convert, all found tickers if not given
+    - directories of the recorded text databases
+    - directory to save the arrays to
+
+    """
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tickers", type=str, nargs="+", default=None, help="Tickers to convert")
+    parser.add_argument("--database_path", type=str, default=str(DATABASE_PATH),
+                        help="Directory with the {ticker}_interval.txt and {ticker}_daily.txt files")
+    parser.add_argument("--observer_database_path", type=str, default=str(OBSERVER_DATABASE_PATH),
+                        help="Directory with the stocks_{ticker}_YYYY_MM.db observer databases")
+    parser.add_argument("--downloaded_database_path", type=str, default=str(DOWNLOADED_DATABASE_PATH),
+                        help="Directory with the {ticker}.us.txt downloaded daily files")
+    parser.add_argument("--array_path", type=str, default=str(RETRO_DATABASE_PATH),
+                        help="Directory to save the arrays to")
+
+    return parser.parse_args()
+
+
+def find_tickers(database_path: Path, downloaded_database_path: Path) -> list[str]:
+    """
+    Find the tickers that have recorded interval or daily files.
+
+    :param database_path: (Path): Directory with the interval and daily files
+    :param downloaded_database_path: (Path): Directory with the downloaded daily files
+    :return: (list[str]): The tickers, sorted
+
+    """
+    tickers = set()
+    for file_name in database_path.glob("*.txt"):
+        if file_name.stem.endswith("_interval") or file_name.stem.endswith("_daily"):
+            tickers.add(file_name.stem.split("_")[0])
+    for file_name in downloaded_database_path.glob("*.us.txt"):
+        tickers.add(file_name.name.split(".")[0].upper())
+
+    return sorted(tickers)
+
+
+def main(args):
+    price_array_library = PriceArrayLibrary(array_path=Path(args.array_path),
+                                            database_path=Path(args.database_path),
+                                            observer_database_path=Path(args.observer_database_path),
+                                            downloaded_database_path=Path(args.downloaded_database_path))
+    tickers = args.tickers or find_tickers(Path(args.database_path), Path(args.downloaded_database_path))
+
+    for ticker in tickers:
+        convert_start = time.perf_counter()
+        price_array_library.build_ticker(ticker)
+        convert_time = time.perf_counter() - convert_start
+
+        load_start = time.perf_counter()
+        timestamps, prices = price_array_library.load_ticker(ticker)
+        daily_timestamps, daily_ohlcv = price_array_library.load_daily(ticker)
+        date_index = price_array_library.load_date_index(ticker)
+        load_time = time.perf_counter() - load_start
+        print(f"{ticker}: converted in {convert_time:.2f}s, loaded {len(prices)} values, {len(date_index)} days, and "
+              f"{len(daily_ohlcv)} daily values in {load_time * 1000:.2f}ms")
+
+
+args = arg_parser()
+main(args)
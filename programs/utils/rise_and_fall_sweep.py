@@ -0,0 +1,190 @@
+"""
+Author: Joel Yuhas
+Date: October 17th, 2026
+
+Utility to find which loss and gain thresholds work best for the rise and fall algorithm, by running the batch backtest
+over every combination of thresholds, tickers, and date ranges against the recorded stock values.
+
+The thresholds are either a grid of the given values, or a random search of --random_count pairs within the given
+ranges. The backtests are spread over a process pool with one worker per core. The recorded values are built into the
+PriceArrayLibrary arrays once up front, and every worker memory maps the same read only arrays, so the data is shared
+through the page cache instead of copied to each worker.
+
+Results are saved to a sqlite results table as they come in, and the best runs are printed at the end sorted by return
+and then drawdown.
+
+Example:
+    python rise_and_fall_sweep.py --tickers QQQ TQQQ --loss_thresholds 0.5 1 2 5 --gain_thresholds 0.5 1 2 5
+    python rise_and_fall_sweep.py --tickers QQQ --random_count 5000 --loss_range 0.1 5 --gain_range 0.1 5 \
+        --date_ranges 2023-07-01:2024-01-01 2024-01-01:2024-07-01
+
+"""
+import argparse
+import itertools
+import os
+import random
+import sqlite3
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+from libraries.helper_functions import RETRO_DATABASE_PATH
+from libraries.PriceArrayLibrary import PriceArrayLibrary, wall_time_to_epoch
+from algorithms.rise_and_fall_backtest import run_backtest
+
+RESULTS_SCHEMA = '''CREATE TABLE IF NOT EXISTS sweep_results (
+                        sweep_id text, ticker text, start_date text, end_date text, loss_threshold real,
+                        gain_threshold real, price_count integer, final_value real, total_return real,
+                        max_drawdown real, buy_count integer, sell_count integer)'''
+
+# Number of results saved in each commit to the results table
+RESULTS_COMMIT_SIZE = 500
+
+# Number of best runs printed at the end of the sweep
+TOP_RESULT_COUNT = 20
+
+# Price arrays memory mapped by the worker process, keyed by ticker
+_worker_price_arrays = {}
+_worker_price_array_library = None
+
+
+def arg_parser():
+    """
+    Get following information so the program can run
+    - tickers to run against
+    - thresholds as a grid, or ranges for a random search
+    - date ranges to run against
+    - number of worker processes and where to save the results
+
+    """
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tickers", type=str, nargs="+", required=True, help="Tickers to run against")
+    parser.add_argument("--loss_thresholds", type=float, nargs="+", default=[0.5, 1, 2, 5],
+                        help="Grid of loss thresholds (0-100) percentage to sell at loss")
+    parser.add_argument("--gain_thresholds", type=float, nargs="+", default=[0.5, 1, 2, 5],
+                        help="Grid of gain thresholds (0-100) percentage to buy at gain")
+    parser.add_argument("--random_count", type=int, default=0,
+                        help="If set, run this many random threshold pairs from the ranges instead of the grid")
+    parser.add_argument("--loss_range", type=float, nargs=2, default=[0.1, 5], help="Min and max random loss threshold")
+    parser.add_argument("--gain_range", type=float, nargs=2, default=[0.1, 5], help="Min and max random gain threshold")
+    parser.add_argument("--seed", type=int, default=None, help="Seed of the random search")
+    parser.add_argument("--date_ranges", type=str, nargs="+", default=[":"],
+                        help="Date ranges as YYYY-MM-DD:YYYY-MM-DD, either side can be left empty for no limit")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Number of worker processes")
+    parser.add_argument("--array_path", type=str, default=str(RETRO_DATABASE_PATH),
+                        help="Directory of the PriceArrayLibrary arrays")
+    parser.add_argument("--results_file", type=str, default=str(RETRO_DATABASE_PATH / "sweep_results.db"),
+                        help="Sqlite database the results are saved to")
+
+    return parser.parse_args()
+
+
+def get_threshold_pairs(args) -> list[tuple[float, float]]:
+    """
+    Get the (loss_threshold, gain_threshold) pairs to run, either the full grid or a random search.
+
+    :param args: The parsed arguments
+    :return: (list[tuple[float, float]]): The threshold pairs
+
+    """
+    if args.random_count > 0:
+        generator = random.Random(args.seed)
+        return [(round(generator.uniform(*args.loss_range), 3), round(generator.uniform(*args.gain_range), 3))
+                for _ in range(args.random_count)]
+
+    return list(itertools.product(args.loss_thresholds, args.gain_thresholds))
+
+
+def initialize_worker(array_path: str):
+    """
+    Set up the worker process with its own PriceArrayLibrary. The arrays are mapped on first use.
+
+    :param array_path: (str): Directory of the PriceArrayLibrary arrays
+
+    """
+    global _worker_price_array_library
+    _worker_price_array_library = PriceArrayLibrary(array_path=Path(array_path))
+
+
+def run_job(job: tuple) -> tuple:
+    """
+    Run one backtest in the worker process.
+
+    :param job: (tuple): The ticker, start date, end date, loss threshold, and gain threshold
+    :return: (tuple): The job followed by the number of prices ran against and the run's stats, None for the stats if
+                      there were no prices in the date range
+
+    """
+    ticker, start_date, end_date, loss_threshold, gain_threshold = job
+    if ticker not in _worker_price_arrays:
+        _worker_price_arrays[ticker] = _worker_price_array_library.load_ticker(ticker)
+    timestamps, prices = _worker_price_arrays[ticker]
+
+    start_index = 0 if not start_date else int(np.searchsorted(timestamps, wall_time_to_epoch(start_date, "%Y-%m-%d")))
+    end_index = len(timestamps) if not end_date else \
+        int(np.searchsorted(timestamps, wall_time_to_epoch(end_date, "%Y-%m-%d")))
+    if end_index - start_index < 1:
+        return job + (0, None)
+
+    result = run_backtest(prices[start_index:end_index], loss_threshold, gain_threshold)
+    return job + (end_index - start_index, result.get_stats())
+
+
+def main(args):
+    date_ranges = [tuple(date_range.split(":")) for date_range in args.date_ranges]
+    jobs = [(ticker, start_date, end_date, loss_threshold, gain_threshold)
+            for ticker in args.tickers
+            for start_date, end_date in date_ranges
+            for loss_threshold, gain_threshold in get_threshold_pairs(args)]
+
+    # Build any missing arrays before starting the workers so they only ever read them
+    price_array_library = PriceArrayLibrary(array_path=Path(args.array_path))
+    for ticker in args.tickers:
+        price_array_library.load_ticker(ticker)
+
+    results_file = Path(args.results_file)
+    results_file.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(results_file)
+    conn.execute(RESULTS_SCHEMA)
+    sweep_id = time.strftime("%Y-%m-%d-%H:%M:%S")
+
+    print(f"Running {len(jobs)} backtests on {args.workers} workers, sweep {sweep_id}")
+    start_time = time.perf_counter()
+    # Hand the jobs out in chunks so the workers aren't waiting on the pool for every short backtest
+    chunk_size = max(1, len(jobs) // (args.workers * 8))
+    pending_rows = []
+    with ProcessPoolExecutor(max_workers=args.workers, initializer=initialize_worker,
+                             initargs=(args.array_path,)) as executor:
+        for ticker, start_date, end_date, loss_threshold, gain_threshold, price_count, stats in \
+                executor.map(run_job, jobs, chunksize=chunk_size):
+            if stats is None:
+                print(f"No {ticker} prices between {start_date} and {end_date}, skipping")
+                continue
+            pending_rows.append((sweep_id, ticker, start_date, end_date, loss_threshold, gain_threshold, price_count,
+                                 stats['final_value'], stats['total_return'], stats['max_drawdown'],
+                                 stats['buy_count'], stats['sell_count']))
+            if len(pending_rows) >= RESULTS_COMMIT_SIZE:
+                with conn:
+                    conn.executemany("INSERT INTO sweep_results VALUES (?,?,?,?,?,?,?,?,?,?,?,?)", pending_rows)
+                pending_rows = []
+
+    with conn:
+        conn.executemany("INSERT INTO sweep_results VALUES (?,?,?,?,?,?,?,?,?,?,?,?)", pending_rows)
+
+    elapsed = time.perf_counter() - start_time
+    print(f"Finished {len(jobs)} backtests in {elapsed:.2f} seconds, results saved to {results_file}")
+
+    print("ticker, start, end, loss, gain, final value, return %, max drawdown %, buys, sells")
+    for row in conn.execute("SELECT ticker, start_date, end_date, loss_threshold, gain_threshold, final_value, "
+                            "total_return, max_drawdown, buy_count, sell_count FROM sweep_results "
+                            "WHERE sweep_id = ? ORDER BY total_return DESC, max_drawdown ASC LIMIT ?",
+                            (sweep_id, TOP_RESULT_COUNT)):
+        print(f"{row[0]}, {row[1] or '-'}, {row[2] or '-'}, {row[3]}, {row[4]}, {row[5]:.2f}, {row[6]:.2f}, "
+              f"{row[7]:.2f}, {row[8]}, {row[9]}")
+    conn.close()
+
+
+if __name__ == "__main__":
+    main(arg_parser())
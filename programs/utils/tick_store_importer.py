@@ -0,0 +1,40 @@
+"""
+Author: Joel Yuhas
+Date: October 17th, 2026
+
+Utility to import the existing monthly observer databases (stocks_{ticker}_{YYYY_MM}.db) into the yearly tick store.
+Ticks already in the store are replaced, so it is safe to run more than once.
+
+"""
+import argparse
+from pathlib import Path
+
+from libraries.TickStore import TickStore
+from libraries.helper_functions import OBSERVER_DATABASE_PATH, TICK_STORE_PATH
+
+
+def arg_parser():
+    """
+    Get following information so the program can run
+    - directory of the observer databases to import
+    - directory of the tick store to import into
+
+    """
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--database_path", type=str, default=str(OBSERVER_DATABASE_PATH),
+                        help="Directory with the stocks_*_YYYY_MM.db observer databases")
+    parser.add_argument("--store_path", type=str, default=str(TICK_STORE_PATH),
+                        help="Directory of the tick store")
+
+    return parser.parse_args()
+
+
+def main(args):
+    with TickStore(Path(args.store_path)) as tick_store:
+        for database_file in sorted(Path(args.database_path).glob("stocks_*.db")):
+            tick_count = tick_store.import_observer_database(database_file)
+            print(f"Imported {tick_count} ticks from {database_file.name}")
+
+
+args = arg_parser()
+main(args)
@@ -0,0 +1,59 @@
+"""
+Author: Joel Yuhas
+Date: October 17th, 2026
+
+Utility to convert the text transaction files of the accounts, transaction_{N}.txt, into transaction ledgers,
+transaction_{N}.ledger, next to them. After converting, each ledger is read back and the number of transactions of each
+type is printed.
+
+Ledgers that already have transactions are skipped unless --overwrite is given, so the transactions made since the
+account started using its ledger are not replaced.
+
+Example:
+    python transaction_ledger_converter.py
+    python transaction_ledger_converter.py --account_log_path ../../logs/account_logs --overwrite
+
+"""
+import argparse
+from pathlib import Path
+
+import numpy as np
+
+from libraries.TransactionLedger import TransactionLedger, TRANSACTION_TYPE_NAMES
+from libraries.helper_functions import ACCOUNT_LOG_PATH
+
+
+def arg_parser():
+    """
+    Get following information so the program can run
+    - directory with the account directories
+    - if ledgers that already have transactions should be replaced
+
+    """
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--account_log_path", type=str, default=str(ACCOUNT_LOG_PATH),
+                        help="Directory with the account directories of transaction_{N}.txt files")
+    parser.add_argument("--overwrite", action="store_true",
+                        help="Replace ledgers that already have transactions")
+
+    return parser.parse_args()
+
+
+def main(args):
+    for text_file in sorted(Path(args.account_log_path).glob("*/transaction_*.txt")):
+        ledger_file = text_file.with_suffix(".ledger")
+        if TransactionLedger.get_record_count(ledger_file) > 0 and not args.overwrite:
+            print(f"{ledger_file} already has transactions, skipping")
+            continue
+
+        transaction_count = TransactionLedger.convert_text_file(text_file, ledger_file)
+        records = TransactionLedger.read_records(ledger_file)
+        types, counts = np.unique(records['type'], return_counts=True)
+        type_counts = ", ".join(f"{TRANSACTION_TYPE_NAMES.get(int(code), 'ERROR')}: {count}"
+                                for code, count in zip(types, counts))
+        errors = int(np.count_nonzero(records['error_code']))
+        print(f"{text_file}: converted {transaction_count} transactions ({type_counts}), {errors} errors")
+
+
+args = arg_parser()
+main(args)